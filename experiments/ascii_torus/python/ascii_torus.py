@@ -1,18 +1,24 @@
 import argparse
 import sys
 import time
-import math
 import csv
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
-from mcik.experiments.ascii_torus import Params, estimate_ascii_quality, suggest_step
-
-RAMP = " .:-=+*#%@"
+from mcik.experiments.ascii_torus import (Params, build_ramp, estimate_ascii_quality, evaluate_score, render_frame,
+                                         suggest_step)
+from mcik.experiments.ascii_torus.bench import BENCH_CI_COLUMNS, BENCH_MODES, bench, format_bench
+from mcik.experiments.ascii_torus.framelog import FrameLog, format_summary, write_summary
+from mcik.experiments.ascii_torus.metrics import estimate_ascii_similarity
+from mcik.experiments.ascii_torus.present import FramePresenter
+from mcik.experiments.ascii_torus.renderer import render_codes
+from mcik.experiments.ascii_torus.scoring import frame_score
+from mcik.experiments.ascii_torus.controller import CONTROLLERS, EvalMemo, make_planner, run_plan
+from mcik.experiments.ascii_torus.schedule import SCHEDULES, make_scheduler
 
 
 def parse_args():
     p = argparse.ArgumentParser()
-    p.add_argument("--mode", choices=["interactive", "batch", "synergy"], default="interactive")
+    p.add_argument("--mode", choices=["interactive", "batch", "synergy", "converge", "bench"], default="interactive")
     p.add_argument("--target-fps", type=int, default=30)
     p.add_argument("--frames", type=int, default=300)
     p.add_argument("--resolution-scale", type=float, default=1.0)
@@ -20,99 +26,44 @@ def parse_args():
     p.add_argument("--gamma", type=float, default=1.0)
     p.add_argument("--normal-smooth", type=float, default=0.0)
     p.add_argument("--ramp-size", type=int, default=10)
-    p.add_argument("--controller", choices=["off", "K", "KH"], default="off")
+    p.add_argument("--controller", choices=["off", *CONTROLLERS], default="off")
     p.add_argument("--ctrl-interval", type=int, default=10)
+    p.add_argument("--ctrl-budget", type=int, default=None, help="KH: max renders per controller step")
+    p.add_argument("--ctrl-workers", type=int, default=0, help="threads for concurrent candidate evaluation (0 = serial)")
+    p.add_argument("--isolate-timing", action="store_true", help="time candidates with per-thread CPU time")
+    p.add_argument("--ctrl-schedule", choices=list(SCHEDULES), default="sync",
+                   help="sync: whole step in one frame; amortized: one probe per frame in the slack; background: worker thread")
     p.add_argument("--w-fps", type=float, default=0.5)
     p.add_argument("--w-quality", type=float, default=0.5)
-    p.add_argument("--log-csv", type=str, default="")
-    return p.parse_args()
+    p.add_argument("--log-csv", type=str, default="", help="batch frame log (.csv, or .npz for a compressed columnar file)")
+    p.add_argument("--log-block", type=int, default=1024, help="frames buffered per log write")
+    p.add_argument("--log-sim", type=int, default=0,
+                   help="batch/bench: similarity to a 4-spp reference render every N frames (0 = off, others log NaN); "
+                        "the extra render costs time and renderer cache space")
+    p.add_argument("--present", choices=["diff", "full"], default="diff",
+                   help="diff: redraw only changed cells in one write per frame; full: clear and redraw")
+    p.add_argument("--bench-renders", type=int, default=120, help="converge mode: render budget per controller")
+    p.add_argument("--bench-modes", type=str, default=",".join(BENCH_MODES),
+                   help="bench mode: comma-separated controllers to compare")
+    p.add_argument("--bench-runs", type=int, default=5, help="bench mode: repetitions per controller")
+    p.add_argument("--bench-warmup", type=int, default=10, help="bench mode: untimed frames before each run")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    if args.log_block < 1:
+        p.error("--log-block must be at least 1")
+    if args.log_sim < 0:
+        p.error("--log-sim must be non-negative")
+    if args.mode == "bench" and (args.frames < 1 or args.bench_runs < 1):
+        p.error("bench mode needs --frames and --bench-runs of at least 1")
+    return args
 
 
-def clear():
-    sys.stdout.write("\x1b[2J\x1b[H")
+def present_full(hud, buf, w, h) -> int:
+    """Clear-and-redraw output, kept for comparison with the diff presenter (--present full)."""
+    out = "\x1b[2J\x1b[H" + hud + "\n" + "".join("".join(buf[y * w:(y + 1) * w]) + "\n" for y in range(h))
+    sys.stdout.write(out)
     sys.stdout.flush()
-
-
-def build_ramp(size: int) -> str:
-    if size <= 1:
-        return RAMP[0]
-    if size == len(RAMP):
-        return RAMP
-    out = []
-    for i in range(size):
-        t = i / (size - 1)
-        idx = t * (len(RAMP) - 1)
-        i0 = int(idx)
-        i1 = min(len(RAMP) - 1, i0 + 1)
-        c = RAMP[i0] if (idx - i0) < 0.5 else RAMP[i1]
-        out.append(c)
-    return "".join(out)
-
-
-def render_frame(w: int, h: int, A: float, B: float, gamma: float, ramp: str) -> List[str]:
-    buf = [" "] * (w * h)
-    zbuf = [0.0] * (w * h)
-    R = 1.0
-    r = 0.5
-    cosA, sinA = math.cos(A), math.sin(A)
-    cosB, sinB = math.cos(B), math.sin(B)
-    lx, ly, lz = 0.0, 1.0, -1.0
-    K1, K2 = 20.0, 5.0
-
-    th = 0.0
-    while th < 2 * math.pi:
-        costh, sinth = math.cos(th), math.sin(th)
-        ph = 0.0
-        while ph < 2 * math.pi:
-            cosph, sinph = math.cos(ph), math.sin(ph)
-            cx = (R + r * costh) * cosph
-            cy = (R + r * costh) * sinph
-            cz = r * sinth
-            x = cx * cosB - cy * sinB
-            y = cx * sinB + cy * cosB
-            z = cz
-            y2 = y * cosA - z * sinA
-            z2 = y * sinA + z * cosA
-            ooz = 1.0 / (z2 + K2)
-            xp = int(w / 2 + K1 * ooz * x)
-            yp = int(h / 2 + K1 * ooz * y2 * 0.5)
-            nx, ny, nz = costh * cosph, costh * sinph, sinth
-            nx_rz = nx * cosB - ny * sinB
-            ny_rz = nx * sinB + ny * cosB
-            nz_rz = nz
-            nny = ny_rz * cosA - nz_rz * sinA
-            nnz = ny_rz * sinA + nz_rz * cosA
-            nnx = nx_rz
-            L = max(0.0, nnx * lx + nny * ly + nnz * lz)
-            shade = L ** (1.0 / gamma if gamma > 0 else 1.0)
-            idx = min(len(ramp) - 1, max(0, int(shade * (len(ramp) - 1))))
-            if 0 <= xp < w and 0 <= yp < h:
-                off = yp * w + xp
-                if ooz > zbuf[off]:
-                    zbuf[off] = ooz
-                    buf[off] = ramp[idx]
-            ph += 0.02
-        th += 0.07
-    return buf
-
-
-def draw(buf, w, h):
-    for y in range(h):
-        sys.stdout.write("".join(buf[y * w:(y + 1) * w]) + "\n")
-    sys.stdout.flush()
-
-
-def evaluate_score(p: Params, A: float, B: float, base_w: int, base_h: int, target_fps: int, w_fps: float, w_quality: float) -> float:
-    w = max(10, int(base_w * p.resolution_scale))
-    h = max(10, int(base_h * p.resolution_scale))
-    ramp = build_ramp(p.ramp_size)
-    t0 = time.time()
-    buf = render_frame(w, h, A, B, p.gamma, ramp)
-    elapsed_ms = (time.time() - t0) * 1000.0
-    fps = 1000.0 / elapsed_ms if elapsed_ms > 0 else 0.0
-    q = estimate_ascii_quality(buf, w, h)
-    fps_norm = min(fps / max(1, target_fps), 1.0)
-    return w_fps * fps_norm + w_quality * q
+    return len(out.encode("utf-8"))
 
 
 def synergy_demo(args):
@@ -122,8 +73,11 @@ def synergy_demo(args):
     def ev(pp: Params) -> float:
         return evaluate_score(pp, A, B, base_w, base_h, args.target_fps, args.w_fps, args.w_quality)
     s0 = ev(p)
-    pk, _ = suggest_step(p, ev, False)
-    pkh, _ = suggest_step(p, ev, True)
+    executor = ThreadPoolExecutor(args.ctrl_workers) if args.ctrl_workers > 0 else None
+    pk, _ = suggest_step(p, ev, False, executor, args.isolate_timing)
+    pkh, _ = suggest_step(p, ev, True, executor, args.isolate_timing)
+    if executor is not None:
+        executor.shutdown()
     sk = ev(pk)
     skh = ev(pkh)
     print("Synergy demo (fixed scene)")
@@ -132,11 +86,72 @@ def synergy_demo(args):
     print(f"K+H    score:{skh:.3f}  d:{skh - s0:.3f}  params:[scale={pkh.resolution_scale}, spp={pkh.samples_per_pixel}, gamma={pkh.gamma}, ramp={pkh.ramp_size}]")
 
 
+def convergence_demo(args):
+    """Score of each controller's params against the renders it has spent, on a fixed scene."""
+    base_w, base_h = 80, 24
+    A, B = 0.6, 0.4
+    start = Params(args.resolution_scale, args.samples_per_pixel, args.gamma, args.normal_smooth, args.ramp_size)
+    def ev(pp: Params) -> float:
+        return evaluate_score(pp, A, B, base_w, base_h, args.target_fps, args.w_fps, args.w_quality)
+    rows = []
+    for name in CONTROLLERS:
+        planner = make_planner(name, seed=args.seed, eval_budget=args.ctrl_budget)
+        renders = 0
+        def counted(pp: Params) -> float:
+            nonlocal renders
+            renders += 1
+            return ev(pp)
+        observe = getattr(planner, "observe", None)
+        p = start
+        step = 0
+        rows.append([name, step, renders, ev(p)])
+        # Surrogate steps can cost no renders, so the step count is capped too
+        while renders < args.bench_renders and step < args.bench_renders:
+            memo = EvalMemo(counted)
+            p, _ = run_plan(planner(p, memo), memo)
+            step += 1
+            s = ev(p)
+            rows.append([name, step, renders, s])
+            if observe is not None:
+                observe(p, s)  # what the frame loop reports after applying p
+    if args.log_csv:
+        with open(args.log_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["controller", "step", "renders", "score"])
+            writer.writerows(rows)
+    budgets = [args.bench_renders // 4, args.bench_renders // 2, args.bench_renders]
+    print(f"Convergence (fixed scene, best score within N renders, start:{rows[0][3]:.3f})")
+    print("controller  " + "  ".join(f"N={n:<5d}" for n in budgets) + "  steps")
+    for name in CONTROLLERS:
+        mine = [r for r in rows if r[0] == name]
+        best = [max(r[3] for r in mine if r[2] <= n) for n in budgets]
+        print(f"{name:<10s}  " + "  ".join(f"{b:<7.3f}" for b in best) + f"  {mine[-1][1]}")
+
+
+def bench_demo(args):
+    """Headless benchmark: --bench-runs repetitions per controller on a fixed rotation schedule."""
+    start = Params(args.resolution_scale, args.samples_per_pixel, args.gamma, args.normal_smooth, args.ramp_size)
+    modes = [m for m in args.bench_modes.split(",") if m]
+    rows = bench(modes, start, args.frames, args.bench_runs, args.bench_warmup, args.seed,
+                 schedule=args.ctrl_schedule, ctrl_interval=args.ctrl_interval, eval_budget=args.ctrl_budget,
+                 target_fps=args.target_fps, w_fps=args.w_fps, w_quality=args.w_quality, sim_every=args.log_sim)
+    path = args.log_csv or f"test_data/ascii_torus/bench-{int(time.time()*1000)}.csv"
+    write_summary(rows, path, BENCH_CI_COLUMNS)
+    print(f"Benchmark ({args.frames} frames x {args.bench_runs} runs per mode, {args.bench_warmup} warm-up frames)")
+    print(format_bench(rows))
+
+
 def main():
     args = parse_args()
+    if args.mode == "bench":
+        bench_demo(args)
+        return
     if args.mode == "synergy":
         synergy_demo(args)
         return
+    if args.mode == "converge":
+        convergence_demo(args)
+        return
 
     base_w, base_h = 80, 24
     w = max(10, int(base_w * args.resolution_scale))
@@ -150,56 +165,97 @@ def main():
 
     # controller params
     pv = Params(args.resolution_scale, args.samples_per_pixel, args.gamma, args.normal_smooth, args.ramp_size)
+    executor = ThreadPoolExecutor(args.ctrl_workers) if args.ctrl_workers > 0 else None
+    ctrl = None
+    observe = None
+    if args.controller != "off":
+        planner = make_planner(args.controller, args.seed, args.ctrl_budget)
+        observe = getattr(planner, "observe", None)
+        ctrl = make_scheduler(args.ctrl_schedule, planner, executor, args.isolate_timing,
+                              max_wait=max(1, args.ctrl_interval))
+    target_ms = 1000.0 / max(1, args.target_fps)
 
-    # CSV logging
-    writer = None
-    fobj = None
+    # Frame log (batch): buffered in blocks so writing it stays out of the timed frames
+    log = None
     if args.mode == "batch":
-        path = args.log_csv or f"test_data/ascii_torus/log-{int(time.time()*1000)}.csv"
-        fobj = open(path, "w", newline="")
-        writer = csv.writer(fobj)
-        writer.writerow(["frame","ms","fps","quality","scale","spp","gamma","ramp","controller"])
+        log_path = args.log_csv or f"test_data/ascii_torus/log-{int(time.time()*1000)}.csv"
+        log = FrameLog(log_path, block=args.log_block)
+    ref_ramp = build_ramp(16)
 
+    prev_frame_ms = None
+    jitter_ms = 0.0
+    presenter = FramePresenter() if args.present == "diff" else None
+    out_bytes = 0
     for i in range(frames):
-        t0 = time.time()
-        clear()
-        buf = render_frame(w, h, A, B, args.gamma, ramp)
-        elapsed_ms = (time.time() - t0) * 1000.0
+        t0 = time.perf_counter()
+        buf = render_frame(w, h, A, B, args.gamma, ramp, args.samples_per_pixel, args.normal_smooth)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
         fps = 1000.0 / elapsed_ms if elapsed_ms > 0 else 0.0
         q = estimate_ascii_quality(buf, w, h)
-        sys.stdout.write(f"FPS:{int(round(fps))}  target:{args.target_fps}  quality:{q:.2f}  params:[scale={args.resolution_scale}, spp={args.samples_per_pixel}, gamma={args.gamma}, ramp={args.ramp_size}]  controller:{args.controller}\n")
-        draw(buf, w, h)
-
-        # Controller step
-        if args.controller != "off" and (i % max(1, args.ctrl_interval) == 0):
-            def ev(pp: Params) -> float:
-                return evaluate_score(pp, A, B, base_w, base_h, args.target_fps, args.w_fps, args.w_quality)
-            use_h = (args.controller == "KH")
-            nxt, _ = suggest_step(pv, ev, use_h)
-            pv = nxt
-            # apply
-            args.resolution_scale = pv.resolution_scale
-            args.samples_per_pixel = pv.samples_per_pixel
-            args.gamma = pv.gamma
-            args.normal_smooth = pv.normal_smooth
-            args.ramp_size = pv.ramp_size
-            ramp = build_ramp(args.ramp_size)
-            w = max(10, int(base_w * args.resolution_scale))
-            h = max(10, int(base_h * args.resolution_scale))
-
-        # Batch CSV
-        if writer is not None:
-            writer.writerow([i, elapsed_ms, fps, q, args.resolution_scale, args.samples_per_pixel, args.gamma, args.ramp_size, args.controller])
+        view = (w, h, A, B)
+        shown = (args.resolution_scale, args.samples_per_pixel, args.gamma, args.ramp_size)
+        shown_ns = args.normal_smooth
+        hud = f"FPS:{int(round(fps))}  target:{args.target_fps}  jitter:{jitter_ms:.1f}ms  out:{out_bytes}B  quality:{q:.2f}  params:[scale={args.resolution_scale}, spp={args.samples_per_pixel}, gamma={args.gamma}, ns={args.normal_smooth}, ramp={args.ramp_size}]  controller:{args.controller}/{args.ctrl_schedule}"
+        if presenter is not None:
+            out_bytes = presenter.present(buf, w, h, hud)
+        else:
+            out_bytes = present_full(hud, buf, w, h)
+        if observe is not None:
+            # Surrogate controllers learn from every rendered frame, not just their probes
+            observe(pv, frame_score(fps, q, args.target_fps, args.w_fps, args.w_quality))
+
+        # Controller: start a step every ctrl_interval frames (unless one is still running),
+        # give the scheduler this frame's slack, and apply finished steps as a whole.
+        if args.controller != "off":
+            if i % max(1, args.ctrl_interval) == 0 and not ctrl.busy:
+                def ev(pp: Params, A=A, B=B) -> float:
+                    return evaluate_score(pp, A, B, base_w, base_h, args.target_fps, args.w_fps, args.w_quality)
+                ctrl.start(pv, ev)
+            ctrl.tick((target_ms - (time.perf_counter() - t0) * 1000.0) / 1000.0)
+            nxt = ctrl.poll()
+            if nxt is not None:
+                pv = nxt
+                # apply
+                args.resolution_scale = pv.resolution_scale
+                args.samples_per_pixel = pv.samples_per_pixel
+                args.gamma = pv.gamma
+                args.normal_smooth = pv.normal_smooth
+                args.ramp_size = pv.ramp_size
+                ramp = build_ramp(args.ramp_size)
+                w = max(10, int(base_w * args.resolution_scale))
+                h = max(10, int(base_h * args.resolution_scale))
+
+        # Whole-frame time (render, draw and controller work) and its frame-to-frame jitter
+        frame_ms = (time.perf_counter() - t0) * 1000.0
+        jitter_ms = 0.0 if prev_frame_ms is None else abs(frame_ms - prev_frame_ms)
+        prev_frame_ms = frame_ms
+
+        # Batch log, after frame_ms is taken. Similarity (--log-sim) is against the same view
+        # rendered as the reference: 4 samples per pixel, no smoothing, ramp 16, gamma 1.
+        # It is a second render, so it is opt-in and sampled; other frames log NaN.
+        if log is not None:
+            sim = float("nan")
+            if args.log_sim and i % args.log_sim == 0:
+                sim = estimate_ascii_similarity(buf, render_codes(*view, 1.0, ref_ramp, 4), view[0], view[1])
+            log.append(i, elapsed_ms, fps, q, *shown, args.controller,
+                       frame_ms, jitter_ms, args.ctrl_schedule, out_bytes, sim, shown_ns)
 
         A += dA
         B += dB
         if args.mode == "interactive":
-            target_ms = 1000.0 / max(1, args.target_fps)
-            if elapsed_ms < target_ms:
-                time.sleep((target_ms - elapsed_ms) / 1000.0)
+            if frame_ms < target_ms:
+                time.sleep((target_ms - frame_ms) / 1000.0)
 
-    if fobj is not None:
-        fobj.close()
+    if ctrl is not None:
+        ctrl.close()
+    if log is not None:
+        log.close()
+        rows = log.summary()
+        print(format_summary(rows))
+        stem = log_path[:-4] if log_path.endswith((".csv", ".npz")) else log_path
+        write_summary(rows, stem + "-summary.csv")
+    if executor is not None:
+        executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress most TensorFlow logging
 import tensorflow as tf
 from typing import List
 
+from mcik.pcm import PCMEngine, PCMProperties, enthalpy_to_state, heat_flow_step_tf
+
 # Check GPU availability
 gpus = tf.config.list_physical_devices('GPU')
 if gpus:
@@ -16,15 +18,6 @@ if gpus:
 else:
     print("⚠️ No GPU detected. Running on CPU.")
 
-class PCMProperties:
-    def __init__(self, name: str, melting_point: float, latent_heat: float, specific_heat: float,
-                 thermal_conductivity: float, density: float):
-        self.name = name
-        self.melting_point = melting_point
-        self.latent_heat = latent_heat
-        self.specific_heat = specific_heat
-        self.thermal_conductivity = thermal_conductivity
-        self.density = density
 class PCMLattice:
     def __init__(self, pcm: PCMProperties, num_nodes: int, initial_temp: float):
         self.pcm = pcm
@@ -35,61 +28,28 @@ class PCMLattice:
         self.phase = tf.Variable([0.0] * num_nodes, dtype=tf.float32)  # 0: solid, 1: liquid
 
     def update_temperature_and_phase(self):
-        # Convert enthalpy to temperature and phase
-        mp = self.pcm.melting_point
-        lh = self.pcm.latent_heat
-        sh = self.pcm.specific_heat
-        
-        # Vectorized operations for better performance
-        h = self.enthalpy.numpy()
-        
-        # Calculate temperature and phase for all nodes at once
-        temp_values = []
-        phase_values = []
-        
-        for i in range(self.num_nodes):
-            if h[i] < sh * mp:
-                # Solid
-                temp_values.append(h[i] / sh)
-                phase_values.append(0.0)
-            elif h[i] < sh * mp + lh:
-                # Phase change
-                temp_values.append(mp)
-                phase_values.append((h[i] - sh * mp) / lh)
-            else:
-                # Liquid
-                temp_values.append((h[i] - lh) / sh)
-                phase_values.append(1.0)
-        
-        # Update all at once
-        self.temperature.assign(temp_values)
-        self.phase.assign(phase_values)
+        # Piecewise solid/mushy/liquid mapping over all nodes, on the enthalpy's device
+        temperature, phase = enthalpy_to_state(self.enthalpy, self.pcm)
+        self.temperature.assign(temperature)
+        self.phase.assign(phase)
 
     def apply_perturbation(self, node: int, delta_temp: float):
         # Add energy corresponding to delta_temp
         delta_h = self.pcm.specific_heat * delta_temp
-        
-        # Get current enthalpy values
-        current_enthalpy = self.enthalpy.numpy()
-        
-        # Update the specific node
-        current_enthalpy[node] += delta_h
-        
-        # Assign back to the variable
-        self.enthalpy.assign(current_enthalpy)
+        self.enthalpy.scatter_nd_add([[node]], [delta_h])
         self.update_temperature_and_phase()
 
 class MCIKKernel:
     def __init__(self, lattice: PCMLattice):
         self.lattice = lattice
+        # One engine per kernel, so its tf.function time loop and JVP are traced once per shape and reused
+        self.engine = PCMEngine(lattice.pcm, backend="tf")
 
     def heat_flow_step(self, enthalpy: tf.Tensor) -> tf.Tensor:
         # Heat flow using enthalpy (includes latent heat)
         alpha = self.lattice.pcm.thermal_conductivity
         beta = 0.5 * self.lattice.pcm.thermal_conductivity
-        enthalpy_padded = tf.concat([[enthalpy[0]], enthalpy, [enthalpy[-1]]], axis=0)
-        enthalpy_next = alpha * enthalpy + beta * (enthalpy_padded[:-2] + enthalpy_padded[2:])
-        return enthalpy_next
+        return heat_flow_step_tf(enthalpy, alpha, beta)
 
     def compute_jacobian(self) -> tf.Tensor:
         with tf.GradientTape() as tape:
@@ -98,6 +58,14 @@ class MCIKKernel:
         jacobian = tape.jacobian(enthalpy_next, self.lattice.enthalpy)
         return jacobian
 
+    def compute_jacobian_banded(self):
+        # Analytic (3, n) tridiagonal Jacobian: O(n) instead of n backprop passes
+        return self.engine.jacobian_banded(self.lattice.num_nodes)
+
+    def influence_columns(self, nodes, steps: int) -> tf.Tensor:
+        # K^(steps)[:, nodes] by forward-mode JVPs, one batched tangent column per node
+        return self.engine.influence_columns(self.lattice.num_nodes, nodes, steps)
+
 # ExperimentRunner remains similar, but uses enthalpy and phase logic
 
 def main():
@@ -139,7 +107,18 @@ def main():
     jacobian = kernel.compute_jacobian()
     print(f"Jacobian shape: {jacobian.shape}")
     print(f"Jacobian (first few elements): {jacobian[0, :5].numpy()}")
+    banded = kernel.compute_jacobian_banded()
+    print(f"Banded Jacobian shape: {banded.shape}")
+    print(f"Banded Jacobian diagonal: {banded[1]}")
+    print(f"K^(5) column for node 5: {kernel.influence_columns([5], steps=5)[:, 0].numpy()}")
     
+    # Test the compiled time loop (tf.function + tf.while_loop; pass jit_compile=True for XLA)
+    print("\nTesting compiled time loop...")
+    run = kernel.engine.run(lattice.enthalpy, steps=100, stride=10)
+    print(f"Temperature after 100 steps: {run.temperature.numpy()}")
+    print(f"History shape: {run.history.shape}")
+    print(f"Temporal integral of temperature (first few nodes): {run.integral[:5].numpy()}")
+
     print("\n✅ TensorFlow PCM simulation test completed successfully!")
 
 if __name__ == "__main__":
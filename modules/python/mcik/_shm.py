@@ -0,0 +1,31 @@
+"""Shared memory helpers for the process-pool paths (sweeps, parallel frame rendering)."""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def attach(name):
+    """Attaches to an existing block; the creating process stays responsible for unlinking it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: pool workers share the parent's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def shared_array(shape, dtype, fill=None):
+    """Creates a shared memory block and a numpy view over it."""
+    dtype = np.dtype(dtype)
+    nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    if fill is not None:
+        arr[...] = fill
+    return shm, arr
+
+
+def release(*blocks):
+    """Closes and unlinks blocks created with shared_array()."""
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
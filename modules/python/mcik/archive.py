@@ -0,0 +1,360 @@
+"""
+Chunked, compressed on-disk archive for McikLatticeSimulator runs.
+
+An archive is a directory laid out like a (much reduced) zarr v2 store:
+
+    run.mcik/
+        meta.json                     shape, dtype, chunk shape, compressor and run metadata
+        initial_state.npy             base state before pokes
+        initial_state_with_pokes.npy  actual t=0 state
+        cube/<i>.<j>[.<k>]            zlib-compressed C-order chunk of the data cube
+
+The cube keeps the simulator layout (*dimensions, time). Chunks tile every axis,
+so reading one frame or one site's time series only decompresses the chunks it
+touches. Archives can be grown along time with ArchiveWriter.append.
+"""
+
+import importlib
+import itertools
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+FORMAT_NAME = "mcik-archive"
+FORMAT_VERSION = 1
+_TARGET_CHUNK_BYTES = 1 << 21  # ~2 MB uncompressed
+
+
+def default_chunks(shape, dtype):
+    """Picks a chunk shape of roughly 2 MB: square-ish spatial tiles, time filling the rest."""
+    spatial = shape[:-1]
+    edge = 4096 if len(spatial) == 1 else 64
+    spatial_chunks = tuple(max(1, min(n, edge)) for n in spatial)
+    per_frame = int(np.prod(spatial_chunks)) * np.dtype(dtype).itemsize
+    time_chunk = max(1, _TARGET_CHUNK_BYTES // per_frame)
+    return spatial_chunks + (int(time_chunk),)
+
+
+def rule_identity(update_rule_func):
+    """Returns an importable 'module:qualname' reference for an update rule, unwrapping wrappers."""
+    func = getattr(update_rule_func, "update_rule_func", update_rule_func)
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+    if module == "__main__" or module is None or qualname is None or "<" in qualname:
+        return None
+    return f"{module}:{qualname}"
+
+
+def resolve_rule(identity):
+    """Imports the update rule named by rule_identity()."""
+    module, qualname = identity.split(":")
+    obj = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return repr(value)
+
+
+def _chunk_key(index):
+    return "cube/" + ".".join(str(i) for i in index)
+
+
+class ArchiveWriter:
+    """
+    Streams a data cube into an archive directory, appending along the time axis.
+
+    Frames are buffered until a full time chunk is available, then written as one
+    compressed file per spatial tile. flush() also writes the partially filled last
+    time chunk so the archive is readable at any point; it is rewritten as more
+    frames arrive.
+    """
+
+    def __init__(self, path, dimensions, dtype=np.float64, chunks=None, metadata=None,
+                 compression_level=4):
+        self.path = path
+        self.dimensions = tuple(dimensions)
+        self.dtype = np.dtype(dtype)
+        self.chunks = tuple(chunks) if chunks else default_chunks(self.dimensions + (1,), self.dtype)
+        if len(self.chunks) != len(self.dimensions) + 1:
+            raise ValueError(f"chunks {self.chunks} must have one entry per cube axis")
+        self.compression_level = compression_level
+        self.metadata = dict(metadata or {})
+        self.n_frames = 0
+        self._buffer = []  # Frames of the current, not yet complete, time chunk
+        os.makedirs(os.path.join(path, "cube"), exist_ok=True)
+
+    @classmethod
+    def reopen(cls, path):
+        """Reopens an existing archive for appending, reloading its partial last time chunk."""
+        archive = SimulationArchive(path)
+        meta = archive.metadata
+        writer = cls(path, archive.shape[:-1], archive.dtype, archive.chunks,
+                     metadata={k: v for k, v in meta.items() if k not in _LAYOUT_KEYS},
+                     compression_level=meta["compressor"]["level"])
+        ct = writer.chunks[-1]
+        full = (archive.shape[-1] // ct) * ct
+        writer.n_frames = full
+        if archive.shape[-1] > full:
+            tail = archive.cube[..., full:]
+            writer._buffer = [tail[..., i].copy() for i in range(tail.shape[-1])]
+        return writer
+
+    def append(self, frames):
+        """Appends frames of shape (*dimensions, n) or a single frame of shape dimensions."""
+        frames = np.asarray(frames, dtype=self.dtype)
+        if frames.shape == self.dimensions:
+            frames = frames[..., np.newaxis]
+        if frames.shape[:-1] != self.dimensions:
+            raise ValueError(f"frames shape {frames.shape} does not match dimensions {self.dimensions}")
+        ct = self.chunks[-1]
+        for i in range(frames.shape[-1]):
+            # Copied: asarray may return the caller's own (reused) frame buffer
+            self._buffer.append(frames[..., i].copy())
+            if len(self._buffer) == ct:
+                self._write_time_chunk()
+                self.n_frames += ct
+                self._buffer = []
+
+    def _write_time_chunk(self):
+        block = np.stack(self._buffer, axis=-1)
+        k = self.n_frames // self.chunks[-1]
+        spatial_ranges = [range(0, n, c) for n, c in zip(self.dimensions, self.chunks)]
+        for starts in itertools.product(*spatial_ranges):
+            sel = tuple(slice(s, s + c) for s, c in zip(starts, self.chunks)) + (slice(None),)
+            index = tuple(s // c for s, c in zip(starts, self.chunks)) + (k,)
+            data = np.ascontiguousarray(block[sel]).tobytes()
+            with open(os.path.join(self.path, _chunk_key(index)), "wb") as f:
+                f.write(zlib.compress(data, self.compression_level))
+
+    def flush(self):
+        """Writes any partial time chunk and the metadata file."""
+        if self._buffer:
+            self._write_time_chunk()
+        meta = dict(self.metadata)
+        meta.update({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "shape": list(self.dimensions) + [self.n_frames + len(self._buffer)],
+            "dtype": self.dtype.str,
+            "chunks": list(self.chunks),
+            "compressor": {"id": "zlib", "level": self.compression_level},
+        })
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2, default=_json_default)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_LAYOUT_KEYS = ("format", "version", "shape", "dtype", "chunks", "compressor")
+
+
+def simulation_metadata(sim):
+    """Collects the run description stored alongside the cube."""
+    return {
+        "dimensions": list(sim.dimensions),
+        "time_steps": sim.time_steps,
+        "update_rule": rule_identity(sim.update_rule_func),
+        "update_rule_name": getattr(sim.update_rule_func, "__name__", repr(sim.update_rule_func)),
+        "update_params": dict(sim.update_params),
+        "pokes": [[list(pos if isinstance(pos, tuple) else (pos,)), value] for pos, value in sim.pokes.items()],
+        "timing": dict(sim.timing),
+        "saved_at": time.time(),
+    }
+
+
+def save_simulation(sim, path, chunks=None, compression_level=4):
+    """
+    Writes a simulator's data cube, initial states and metadata to an archive directory.
+
+    Returns:
+        SimulationArchive: The archive reopened for lazy reading.
+    """
+    if sim.data_cube is None:
+        raise RuntimeError("Simulation data not available. Run run_simulation() first.")
+    cube = sim.data_cube
+    with ArchiveWriter(path, sim.dimensions, cube.dtype, chunks or default_chunks(cube.shape, cube.dtype),
+                       metadata=simulation_metadata(sim), compression_level=compression_level) as writer:
+        # Append one time chunk at a time to keep the temporary stack bounded
+        ct = writer.chunks[-1]
+        for t0 in range(0, cube.shape[-1], ct):
+            writer.append(cube[..., t0:t0 + ct])
+    for name in ("initial_state", "initial_state_with_pokes"):
+        state = getattr(sim, name)
+        if state is not None:
+            np.save(os.path.join(path, name + ".npy"), state)
+    return SimulationArchive(path)
+
+
+class LazyCube:
+    """Array-like view of an archived cube; indexing reads and decompresses only the touched chunks."""
+
+    def __init__(self, archive):
+        self._archive = archive
+        self.shape = archive.shape
+        self.dtype = archive.dtype
+        self.ndim = len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        out = self[...]
+        return out.astype(dtype) if dtype is not None else out
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            fill = (slice(None),) * (self.ndim - len(key) + 1)
+            key = key[:i] + fill + key[i + 1:]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        if len(key) != self.ndim:
+            raise IndexError(f"too many indices for archived cube of shape {self.shape}")
+
+        selections, squeeze = [], []
+        for axis, (k, n) in enumerate(zip(key, self.shape)):
+            if isinstance(k, slice):
+                selections.append(np.arange(*k.indices(n)))
+            else:
+                k = int(k)
+                if not -n <= k < n:
+                    raise IndexError(f"index {k} is out of bounds for axis {axis} with size {n}")
+                selections.append(np.array([k % n]))
+                squeeze.append(axis)
+
+        out = np.empty(tuple(len(s) for s in selections), dtype=self.dtype)
+        # Per axis: which chunks are touched, and where their elements land in `out`
+        groups = []
+        for sel, c in zip(selections, self._archive.chunks):
+            ids = sel // c
+            groups.append([(u, np.nonzero(ids == u)[0], sel[ids == u] - u * c) for u in np.unique(ids)])
+        for combo in itertools.product(*groups):
+            chunk = self._archive.read_chunk(tuple(int(u) for u, _, _ in combo))
+            out[np.ix_(*(pos for _, pos, _ in combo))] = chunk[np.ix_(*(local for _, _, local in combo))]
+        return out.squeeze(axis=tuple(squeeze)) if squeeze else out
+
+
+class SimulationArchive:
+    """
+    Read-only, lazily loaded archive produced by save_simulation or ArchiveWriter.
+
+    Args:
+        path (str): Archive directory.
+        cache_chunks (int): Number of decompressed chunks kept in an LRU cache.
+    """
+
+    def __init__(self, path, cache_chunks=32):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.metadata = json.load(f)
+        if self.metadata.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not an {FORMAT_NAME} directory")
+        self.shape = tuple(self.metadata["shape"])
+        self.dtype = np.dtype(self.metadata["dtype"])
+        self.chunks = tuple(self.metadata["chunks"])
+        self.cube = LazyCube(self)
+        self._cache = OrderedDict()
+        self._cache_size = cache_chunks
+
+    def __repr__(self):
+        return f"SimulationArchive({self.path!r}, shape={self.shape}, chunks={self.chunks})"
+
+    def read_chunk(self, index):
+        """Returns the decompressed chunk at grid position `index` (clipped at the cube edges)."""
+        index = tuple(index)
+        chunk = self._cache.get(index)
+        if chunk is not None:
+            self._cache.move_to_end(index)
+            return chunk
+        with open(os.path.join(self.path, _chunk_key(index)), "rb") as f:
+            raw = zlib.decompress(f.read())
+        shape = tuple(min(c, n - i * c) for i, c, n in zip(index, self.chunks, self.shape))
+        chunk = np.frombuffer(raw, dtype=self.dtype).reshape(shape)
+        self._cache[index] = chunk
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return chunk
+
+    @property
+    def time_steps(self):
+        return self.shape[-1]
+
+    @property
+    def pokes(self):
+        return {tuple(pos): value for pos, value in self.metadata.get("pokes", [])}
+
+    def frame(self, t):
+        """Lattice state at time step t, shape = dimensions."""
+        return self.cube[..., t]
+
+    def series(self, pos):
+        """Time series of one lattice site, shape = (time_steps,)."""
+        if not isinstance(pos, tuple):
+            pos = (pos,)
+        return self.cube[pos + (slice(None),)]
+
+    def _load_state(self, name):
+        path = os.path.join(self.path, name + ".npy")
+        return np.load(path) if os.path.exists(path) else None
+
+    @property
+    def initial_state(self):
+        return self._load_state("initial_state")
+
+    @property
+    def initial_state_with_pokes(self):
+        return self._load_state("initial_state_with_pokes")
+
+    def to_simulator(self, update_rule_func=None, load_cube=True, verbose=True):
+        """
+        Rebuilds a McikLatticeSimulator from the archive.
+
+        Args:
+            update_rule_func (callable, optional): Rule to use; defaults to importing the
+                                                   recorded update_rule identity.
+            load_cube (bool): Read the full cube into data_cube. Defaults to True. Without it the
+                              simulator still holds the last frame, so extend() can continue the run.
+            verbose (bool): Passed to the simulator.
+        """
+        from .lattice import McikLatticeSimulator
+        if update_rule_func is None:
+            identity = self.metadata.get("update_rule")
+            if identity is None:
+                raise ValueError("Archive has no importable update_rule; pass update_rule_func explicitly")
+            update_rule_func = resolve_rule(identity)
+        sim = McikLatticeSimulator(tuple(self.metadata["dimensions"]), self.shape[-1],
+                                   update_rule_func, verbose=verbose, **self.metadata["update_params"])
+        sim.initial_state = self.initial_state
+        sim.initial_state_with_pokes = self.initial_state_with_pokes
+        sim.pokes = self.pokes
+        sim.timing = dict(self.metadata.get("timing", {}))
+        sim.last_state = np.array(self.frame(-1))  # Lets sim.extend(..., writer=ArchiveWriter.reopen(path)) resume
+        if load_cube:
+            sim.data_cube = np.asarray(self.cube)
+        return sim
+
+
+def open_archive(path, cache_chunks=32):
+    """Opens an archive directory for lazy, chunk-wise reading."""
+    return SimulationArchive(path, cache_chunks=cache_chunks)
@@ -1,6 +1,9 @@
 """ASCII torus experiment utilities shared between Python notebooks and scripts."""
 
-from .controller import Params, suggest_step
+from .controller import SPSA, PairBandit, Params, SurrogateController, make_planner, suggest_step
 from .metrics import estimate_ascii_quality, char_density
+from .renderer import GBuffer, render_codes, render_frame, render_gbuffer, shade
+from .scoring import build_ramp, evaluate_score
 
-__all__ = ["Params", "suggest_step", "estimate_ascii_quality", "char_density"]
+__all__ = ["Params", "suggest_step", "SPSA", "SurrogateController", "PairBandit", "make_planner", "estimate_ascii_quality", "char_density", "render_frame", "render_codes",
+           "GBuffer", "render_gbuffer", "shade", "build_ramp", "evaluate_score"]
@@ -0,0 +1,151 @@
+"""
+Headless, repeatable benchmark of the ASCII torus controllers.
+
+Each run renders a fixed rotation schedule (A, B advanced by fixed steps per
+frame) with nothing drawn, timed with perf_counter_ns. A run starts from cold
+renderer caches and a few warm-up frames at angles outside the schedule, so no
+run reuses another run's (or the warm-up's) G-buffers. Run r of every
+controller uses controller seed `seed + r`. Repeating each configuration and
+reporting the mean with a Student-t confidence interval of the per-run
+averages makes differences between controllers (and renderer regressions)
+checkable.
+
+The result rows extend the bench.csv layout (mode, avg_fps, avg_q, avg_sim)
+with interval half-widths and frame-time statistics.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .controller import CONTROLLERS, Params, make_planner
+from .framelog import FrameLog, summarize
+from .metrics import estimate_ascii_quality, estimate_ascii_similarity
+from .renderer import clear_caches, render_codes
+from .schedule import make_scheduler
+from .scoring import build_ramp, evaluate_score, frame_score, view_size
+
+BENCH_MODES = ("off", *CONTROLLERS)
+BENCH_CI_COLUMNS = ("mode", "avg_fps", "avg_q", "avg_sim", "fps_ci", "q_ci", "sim_ci", "mean_ms", "ms_ci",
+                    "p95_ms", "p99_ms", "runs", "frames")
+
+# Two-sided 95% Student-t quantiles for 1..30 degrees of freedom (normal beyond)
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145,
+        2.131, 2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048,
+        2.045, 2.042)
+
+
+def confidence_interval(samples: Sequence[float]) -> Tuple[float, float]:
+    """Mean and 95% confidence half-width (Student t) of the samples; NaN width for fewer than 2."""
+    x = np.asarray(samples, dtype=np.float64)
+    if x.size == 0:
+        return float("nan"), float("nan")
+    mean = float(x.mean())
+    if x.size < 2:
+        return mean, float("nan")
+    df = x.size - 1
+    t = _T95[df - 1] if df <= len(_T95) else 1.96
+    return mean, t * float(x.std(ddof=1)) / math.sqrt(x.size)
+
+
+def bench_run(controller: str, start: Params, frames: int, warmup: int = 10, seed: int = 0,
+              schedule: str = "sync", ctrl_interval: int = 10, eval_budget: Optional[int] = None,
+              target_fps: int = 30, w_fps: float = 0.5, w_quality: float = 0.5, base_w: int = 80,
+              base_h: int = 24, rotation: Tuple[float, float, float, float] = (0.0, 0.0, 0.05, 0.03),
+              sim_every: int = 0) -> Dict[str, np.ndarray]:
+    """
+    One headless run of `frames` frames; returns the per-frame FrameLog columns.
+
+    `ms` is the render time of a frame and `frame_ms` the render plus the
+    controller's work in that frame; quality is measured outside both.
+    Similarity against the same view rendered with 4 samples per pixel, ramp 16,
+    gamma 1 costs a second render that also takes renderer cache space, so it is
+    only measured every `sim_every` frames (0 = never); other frames log NaN.
+    """
+    A0, B0, dA, dB = rotation
+    ref_ramp = build_ramp(16)
+    clear_caches()
+    for i in range(warmup):
+        # Angles before the schedule's start, so the measured views are never cached
+        render_codes(base_w, base_h, A0 - dA * (i + 1), B0 - dB * (i + 1), start.gamma, build_ramp(start.ramp_size),
+                     start.samples_per_pixel, start.normal_smooth)
+
+    p = start
+    ctrl = observe = None
+    if controller != "off":
+        planner = make_planner(controller, seed, eval_budget)
+        observe = getattr(planner, "observe", None)
+        ctrl = make_scheduler(schedule, planner, max_wait=max(1, ctrl_interval))
+    target_ns = 1e9 / max(1, target_fps)
+    log = FrameLog(block=max(1, frames))
+    prev_frame_ms = None
+    try:
+        for i in range(frames):
+            A, B = A0 + dA * i, B0 + dB * i
+            w, h = view_size(p, base_w, base_h)
+            ramp = build_ramp(p.ramp_size)
+            t0 = time.perf_counter_ns()
+            codes = render_codes(w, h, A, B, p.gamma, ramp, p.samples_per_pixel, p.normal_smooth)
+            t1 = time.perf_counter_ns()
+            shown = p
+            if ctrl is not None:
+                if i % max(1, ctrl_interval) == 0 and not ctrl.busy:
+                    def ev(pp: Params, A=A, B=B) -> float:
+                        return evaluate_score(pp, A, B, base_w, base_h, target_fps, w_fps, w_quality)
+                    ctrl.start(p, ev)
+                ctrl.tick((target_ns - (time.perf_counter_ns() - t0)) / 1e9)
+                nxt = ctrl.poll()
+                if nxt is not None:
+                    p = nxt
+            t2 = time.perf_counter_ns()
+
+            ms = (t1 - t0) / 1e6
+            frame_ms = (t2 - t0) / 1e6
+            fps = 1000.0 / ms if ms > 0 else 0.0
+            q = estimate_ascii_quality(codes, w, h)
+            sim = float("nan")
+            if sim_every and i % sim_every == 0:
+                sim = estimate_ascii_similarity(codes, render_codes(w, h, A, B, 1.0, ref_ramp, 4), w, h)
+            if observe is not None:
+                observe(shown, frame_score(fps, q, target_fps, w_fps, w_quality))
+            jitter_ms = 0.0 if prev_frame_ms is None else abs(frame_ms - prev_frame_ms)
+            prev_frame_ms = frame_ms
+            log.append(i, ms, fps, q, shown.resolution_scale, shown.samples_per_pixel, shown.gamma,
+                       shown.ramp_size, controller, frame_ms, jitter_ms, schedule, 0, sim, shown.normal_smooth)
+    finally:
+        if ctrl is not None:
+            ctrl.close()
+    log.close()
+    return log.columns()
+
+
+def bench(modes: Sequence[str], start: Params, frames: int, runs: int = 5, warmup: int = 10, seed: int = 0,
+          **run_kwargs) -> List[dict]:
+    """
+    `runs` repetitions of bench_run per mode; one row per mode with the mean over
+    runs of each run's averages and their 95% confidence half-widths (*_ci).
+    """
+    if frames < 1 or runs < 1:
+        raise ValueError(f"frames and runs must be at least 1, got frames={frames}, runs={runs}")
+    rows = []
+    for mode in modes:
+        per_run = [summarize(bench_run(mode, start, frames, warmup, seed + r, **run_kwargs))[0]
+                   for r in range(runs)]
+        row = {"mode": mode, "runs": runs, "frames": frames}
+        for key, ci in (("avg_fps", "fps_ci"), ("avg_q", "q_ci"), ("avg_sim", "sim_ci"), ("mean_ms", "ms_ci")):
+            row[key], row[ci] = confidence_interval([r[key] for r in per_run])
+        for key in ("p95_ms", "p99_ms"):
+            row[key] = float(np.mean([r[key] for r in per_run]))
+        rows.append(row)
+    return rows
+
+
+def format_bench(rows: Sequence[dict]) -> str:
+    lines = ["mode        avg_fps (95% CI)      avg_q (95% CI)     avg_sim (95% CI)   frame ms (95% CI)   p95_ms  p99_ms"]
+    for r in rows:
+        lines.append(f"{r['mode']:<10s}  {r['avg_fps']:>7.1f} ±{r['fps_ci']:>7.1f}    {r['avg_q']:.4f} ±{r['q_ci']:.4f}    "
+                     f"{r['avg_sim']:.4f} ±{r['sim_ci']:.4f}   {r['mean_ms']:>6.2f} ±{r['ms_ci']:>5.2f}      "
+                     f"{r['p95_ms']:>6.2f}  {r['p99_ms']:>6.2f}")
+    return "\n".join(lines)
@@ -1,5 +1,15 @@
-from dataclasses import dataclass
-from typing import Callable, Tuple
+import math
+import random
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import astuple, dataclass
+from itertools import combinations
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .timing import isolated_timing
 
 
 @dataclass
@@ -21,83 +31,526 @@ def _clamp(p: Params) -> Params:
     )
 
 
-def suggest_step_K(current: Params, evaluate: Callable[[Params], float]) -> Tuple[Params, str]:
+class EvalMemo:
+    """
+    Per-step memo around an evaluate() callable.
+
+    Candidates are clamped before evaluation and keyed on their field tuple, so
+    probes that collapse onto the same Params at a bound, and repeated looks at
+    the current point, cost one render and see one (noise-free) score.
+    """
+
+    def __init__(self, evaluate: Callable[[Params], float]):
+        self.evaluate = evaluate
+        self.scores: Dict[tuple, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, p: Params) -> float:
+        p = _clamp(p)
+        key = astuple(p)
+        if key in self.scores:
+            self.hits += 1
+            return self.scores[key]
+        self.misses += 1
+        s = self.scores[key] = self.evaluate(p)
+        return s
+
+    def __contains__(self, p: Params) -> bool:
+        """Whether `p` (after clamping) has already been evaluated this step."""
+        return astuple(_clamp(p)) in self.scores
+
+    def prefetch(self, candidates: Iterable[Params], executor: Optional[Executor] = None,
+                 isolate_timing: bool = False):
+        """
+        Evaluates the candidates not seen yet, concurrently when an executor is given.
+
+        Results are gathered in submission order and stored by key, so the step logic
+        reading them back afterwards decides exactly as it would serially.
+        """
+        todo: Dict[tuple, Params] = {}
+        for p in candidates:
+            p = _clamp(p)
+            key = astuple(p)
+            if key not in self.scores and key not in todo:
+                todo[key] = p
+        if executor is None:
+            results = [_evaluate(self.evaluate, p, isolate_timing) for p in todo.values()]
+        else:
+            futures = [executor.submit(_evaluate, self.evaluate, p, isolate_timing) for p in todo.values()]
+            results = [f.result() for f in futures]
+        self.misses += len(todo)
+        self.scores.update(zip(todo, results))
+
+
+def _evaluate(evaluate: Callable[[Params], float], p: Params, isolate_timing: bool) -> float:
+    with isolated_timing(isolate_timing):
+        return evaluate(p)
+
+
+def _memo(evaluate: Callable[[Params], float]) -> EvalMemo:
+    return evaluate if isinstance(evaluate, EvalMemo) else EvalMemo(evaluate)
+
+
+_DELTAS = {
+    "resolution_scale": 0.05,
+    "samples_per_pixel": 1,
+    "gamma": 0.1,
+    "normal_smooth": 0.1,
+    "ramp_size": 2,
+}
+
+
+_SYNERGY_EPS = 1e-12
+
+# Renders of a K step from a fresh memo: the current point and two probes per lever
+_K_RENDERS = 1 + 2 * len(_DELTAS)
+
+
+def _check_budget(eval_budget: Optional[int]):
+    if eval_budget is not None and eval_budget < _K_RENDERS:
+        raise ValueError(f"eval_budget must be at least the K step's {_K_RENDERS} renders, got {eval_budget}")
+
+
+def _nudge(p: Params, field: str, sign: int) -> Params:
+    return Params(**{**p.__dict__, field: getattr(p, field) + sign * _DELTAS[field]})
+
+
+def _k_probes(current: Params) -> List[Params]:
+    """One step up and one step down along each lever, in _DELTAS order."""
+    return [_nudge(current, field, sign) for field in _DELTAS for sign in (1, -1)]
+
+
+class PairBandit:
+    """
+    UCB1 over parameter pairs for the K+H step.
+
+    A probed pair earns reward 1 when it shows positive synergy. Each step probes the
+    `n` pairs with the highest upper confidence bound; pairs never probed come first,
+    ordered by a prior (the product of the two levers' |K|), so the full C(n, 2) scan
+    is spread over steps instead of being paid every step.
+    """
+
+    def __init__(self, fields: Iterable[str] = tuple(_DELTAS), exploration: float = 1.0):
+        self.pairs = list(combinations(fields, 2))
+        self.exploration = exploration
+        self.counts = {pair: 0 for pair in self.pairs}
+        self.rewards = {pair: 0.0 for pair in self.pairs}
+        self.total = 0
+
+    def ucb(self, pair: Tuple[str, str]) -> float:
+        n = self.counts[pair]
+        if n == 0:
+            return math.inf
+        return self.rewards[pair] / n + self.exploration * math.sqrt(2.0 * math.log(self.total) / n)
+
+    def select(self, n: int, prior: Optional[Dict[Tuple[str, str], float]] = None) -> List[Tuple[str, str]]:
+        prior = prior or {}
+        ranked = sorted(self.pairs, key=lambda pair: (-self.ucb(pair), -prior.get(pair, 0.0)))
+        return ranked[:max(0, n)]
+
+    def update(self, pair: Tuple[str, str], reward: float):
+        self.counts[pair] += 1
+        self.rewards[pair] += reward
+        self.total += 1
+
+
+# A step is a plan: a generator that yields the batches of candidates it is about to
+# read, then makes its decision through the memo and returns (params, tag). Drivers
+# decide when and where the batch gets evaluated (inline, on an executor, one probe
+# per frame, ...); the decision is the same either way.
+Plan = Generator[List[Params], None, Tuple[Params, str]]
+
+
+def _plan_K(current: Params, evaluate: EvalMemo) -> Plan:
+    probes = _k_probes(current)
+    yield [current] + probes
     base = evaluate(current)
     best_p = current
     best_s = base
 
-    def try_update(p: Params):
-        nonlocal best_p, best_s
+    for p in probes:
         p = _clamp(p)
         s = evaluate(p)
         if s > best_s:
             best_s = s
             best_p = p
 
-    # deltas
-    d_scale = 0.05
-    d_spp = 1
-    d_gamma = 0.1
-    d_ns = 0.1
-    d_ramp = 2
-
-    p = Params(**{**current.__dict__, "resolution_scale": current.resolution_scale + d_scale}); try_update(p)
-    p = Params(**{**current.__dict__, "resolution_scale": current.resolution_scale - d_scale}); try_update(p)
-    p = Params(**{**current.__dict__, "samples_per_pixel": current.samples_per_pixel + d_spp}); try_update(p)
-    p = Params(**{**current.__dict__, "samples_per_pixel": current.samples_per_pixel - d_spp}); try_update(p)
-    p = Params(**{**current.__dict__, "gamma": current.gamma + d_gamma}); try_update(p)
-    p = Params(**{**current.__dict__, "gamma": current.gamma - d_gamma}); try_update(p)
-    p = Params(**{**current.__dict__, "normal_smooth": current.normal_smooth + d_ns}); try_update(p)
-    p = Params(**{**current.__dict__, "normal_smooth": current.normal_smooth - d_ns}); try_update(p)
-    p = Params(**{**current.__dict__, "ramp_size": current.ramp_size + d_ramp}); try_update(p)
-    p = Params(**{**current.__dict__, "ramp_size": current.ramp_size - d_ramp}); try_update(p)
-
     return best_p, "K"
 
 
-def suggest_step_KH(current: Params, evaluate: Callable[[Params], float]) -> Tuple[Params, str]:
-    best_p, _ = suggest_step_K(current, evaluate)
+def _plan_KH(current: Params, evaluate: EvalMemo, bandit: Optional[PairBandit] = None,
+             max_pairs: int = 3, eval_budget: Optional[int] = None) -> Plan:
+    best_p, _ = yield from _plan_K(current, evaluate)
+    bandit = bandit if bandit is not None else PairBandit()
+
+    # Each lever's direction (and |K| for the pair prior) from its two K probes, which are memo hits
+    probes = _k_probes(current)
+    direction, magnitude = {}, {}
+    for i, field in enumerate(_DELTAS):
+        s_plus, s_minus = evaluate(probes[2 * i]), evaluate(probes[2 * i + 1])
+        direction[field] = 1 if s_plus >= s_minus else -1
+        magnitude[field] = abs(s_plus - s_minus)
+
+    # pa and pb are K probes, so a pair costs one render (pab); keep within the step budget
+    n_pairs = max_pairs
+    if eval_budget is not None:
+        n_pairs = min(n_pairs, eval_budget - evaluate.misses)
+    prior = {pair: magnitude[pair[0]] * magnitude[pair[1]] for pair in bandit.pairs}
+    pairs = bandit.select(n_pairs, prior)
+    trios = []
+    for fa, fb in pairs:
+        pa = _clamp(_nudge(current, fa, direction[fa]))
+        pb = _clamp(_nudge(current, fb, direction[fb]))
+        trios.append((pa, pb, _clamp(_nudge(pa, fb, direction[fb]))))
+    yield [best_p, current] + [p for trio in trios for p in trio]
     best_s = evaluate(best_p)
+    s0 = evaluate(current)  # one baseline for every pair, so synergy isn't measured against noise
 
-    def try_pair(apply_a, apply_b):
-        nonlocal best_p, best_s
-        pa = _clamp(apply_a(current))
-        pb = _clamp(apply_b(current))
-        pab = _clamp(apply_b(pa))
-        s0 = evaluate(current)
+    for pair, (pa, pb, pab) in zip(pairs, trios):
         sa = evaluate(pa)
         sb = evaluate(pb)
         sab = evaluate(pab)
         synergy = (sab - s0) - ((sa - s0) + (sb - s0))
-        if synergy > 0.0 and sab > best_s:
+        positive = synergy > _SYNERGY_EPS * max(1.0, abs(s0))  # not just round-off of four scores
+        bandit.update(pair, 1.0 if positive else 0.0)
+        if positive and sab > best_s:
             best_s = sab
             best_p = pab
 
-    d_scale = 0.05
-    d_spp = 1
-    d_gamma = 0.1
-    d_ns = 0.1
+    return best_p, "K+H"
 
-    # Pair 1: scale × spp
-    try_pair(
-        lambda p: Params(**{**p.__dict__, "resolution_scale": p.resolution_scale + d_scale}),
-        lambda p: Params(**{**p.__dict__, "samples_per_pixel": p.samples_per_pixel + d_spp}),
-    )
 
-    # Pair 2: gamma × normal_smooth
-    try_pair(
-        lambda p: Params(**{**p.__dict__, "gamma": p.gamma + d_gamma}),
-        lambda p: Params(**{**p.__dict__, "normal_smooth": p.normal_smooth + d_ns}),
-    )
+Planner = Callable[[Params, EvalMemo], Plan]
 
-    # Pair 3: scale × gamma
-    try_pair(
-        lambda p: Params(**{**p.__dict__, "resolution_scale": p.resolution_scale - d_scale}),
-        lambda p: Params(**{**p.__dict__, "gamma": p.gamma + d_gamma}),
-    )
 
-    return best_p, "K+H"
+def run_plan(plan: Plan, evaluate: EvalMemo, executor: Optional[Executor] = None,
+             isolate_timing: bool = False) -> Tuple[Params, str]:
+    """Drives a plan to completion; with an executor each batch is prefetched concurrently."""
+    try:
+        batch = next(plan)
+        while True:
+            if executor is not None:
+                evaluate.prefetch(batch, executor, isolate_timing)
+            batch = plan.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+
+def suggest_step_K(current: Params, evaluate: Callable[[Params], float],
+                   executor: Optional[Executor] = None, isolate_timing: bool = False) -> Tuple[Params, str]:
+    evaluate = _memo(evaluate)
+    return run_plan(_plan_K(current, evaluate), evaluate, executor, isolate_timing)
+
+
+def suggest_step_KH(current: Params, evaluate: Callable[[Params], float],
+                    executor: Optional[Executor] = None, isolate_timing: bool = False,
+                    bandit: Optional[PairBandit] = None, max_pairs: int = 3,
+                    eval_budget: Optional[int] = None) -> Tuple[Params, str]:
+    """
+    K step followed by paired probes on up to `max_pairs` of all parameter pairs.
+
+    Pass the same PairBandit across steps so pair selection learns which pairs pay off;
+    eval_budget caps the renders of the whole step (K probes included), so it must be
+    at least the 11 renders of the K step (ValueError otherwise).
+    """
+    _check_budget(eval_budget)
+    evaluate = _memo(evaluate)
+    return run_plan(_plan_KH(current, evaluate, bandit, max_pairs, eval_budget), evaluate, executor, isolate_timing)
+
+
+def suggest_step(current: Params, evaluate: Callable[[Params], float], use_h: bool,
+                 executor: Optional[Executor] = None, isolate_timing: bool = False):
+    """
+    One controller step from `current`.
+
+    Args:
+        evaluate: Scores a Params (higher is better); wrapped in an EvalMemo unless it already is one.
+        use_h: Also try the paired (K+H) probes.
+        executor: concurrent.futures executor to evaluate each batch of candidates concurrently
+                  (a process pool needs a picklable evaluate). The chosen step is the same as serially.
+        isolate_timing: Time each candidate with its thread's CPU clock (see timing.isolated_timing),
+                        so concurrent candidates don't inflate each other's frame time.
+    """
+    step = suggest_step_KH if use_h else suggest_step_K
+    with isolated_timing(isolate_timing):
+        return step(current, evaluate, executor, isolate_timing)
+
+
+# --- SPSA -------------------------------------------------------------------------
+
+_BOUNDS = {
+    "resolution_scale": (0.25, 1.0),
+    "samples_per_pixel": (1, 4),
+    "gamma": (0.5, 3.0),
+    "normal_smooth": (0.0, 1.0),
+    "ramp_size": (8, 16),
+}
+_INT_FIELDS = ("samples_per_pixel", "ramp_size")
+
+
+def _to_unit(p: Params) -> List[float]:
+    return [(getattr(p, f) - lo) / (hi - lo) for f, (lo, hi) in _BOUNDS.items()]
+
+
+def _from_unit(u: List[float]) -> Params:
+    values = {}
+    for x, (f, (lo, hi)) in zip(u, _BOUNDS.items()):
+        v = lo + min(1.0, max(0.0, x)) * (hi - lo)
+        values[f] = int(round(v)) if f in _INT_FIELDS else v
+    return _clamp(Params(**values))
+
+
+class SPSA:
+    """
+    Simultaneous-perturbation controller: two evaluations per step, whatever the number of levers.
+
+    Params are mapped to the unit box. Each step draws a random ±1 direction Δ, scores
+    θ + cₖΔ and θ - cₖΔ, and moves θ along the gradient estimate (y⁺ - y⁻) / (2cₖΔᵢ)
+    with gains aₖ = a / (k + 1 + A)^alpha and cₖ = c / (k + 1)^gamma. θ is kept
+    continuous between steps (integer fields are rounded only when evaluated) as long
+    as the caller keeps applying the returned Params.
+
+    With second_order=True (2SPSA) each step costs two more evaluations, at θ ± cₖΔ + c̃ₖΔ̃,
+    giving a diagonal Hessian estimate; its running mean scales the step per lever
+    (a Newton-like step). Pair synergy shows up as off-diagonal terms, which are not used.
+
+    Instances are planners: plan(current, evaluate) is a step plan like the K/KH ones,
+    so the schedulers can drive them; step() runs one inline.
+    """
+
+    def __init__(self, a: float = 0.2, c: float = 0.2, A: float = 2.0, alpha: float = 0.602,
+                 gamma: float = 0.101, second_order: bool = False, h_floor: float = 0.05, seed: int = 0):
+        self.a, self.c, self.A = a, c, A
+        self.alpha, self.gamma = alpha, gamma
+        self.second_order = second_order
+        self.h_floor = h_floor
+        self.rng = random.Random(seed)
+        self.k = 0
+        self.theta: Optional[List[float]] = None
+        self.h_diag: Optional[List[float]] = None
+        self._last: Optional[Params] = None
+
+    def plan(self, current: Params, evaluate: EvalMemo) -> Plan:
+        if self.theta is None or current != self._last:
+            self.theta = _to_unit(_clamp(current))
+        theta = self.theta
+        ak = self.a / (self.k + 1 + self.A) ** self.alpha
+        ck = self.c / (self.k + 1) ** self.gamma
+        delta = [self.rng.choice((-1, 1)) for _ in theta]
+        plus = [t + ck * d for t, d in zip(theta, delta)]
+        minus = [t - ck * d for t, d in zip(theta, delta)]
+        batch = [_from_unit(plus), _from_unit(minus)]
+        if self.second_order:
+            delta2 = [self.rng.choice((-1, 1)) for _ in theta]
+            plus2 = [t + ck * d for t, d in zip(plus, delta2)]
+            minus2 = [t + ck * d for t, d in zip(minus, delta2)]
+            batch += [_from_unit(plus2), _from_unit(minus2)]
+        yield batch
+
+        y_plus, y_minus = evaluate(batch[0]), evaluate(batch[1])
+        grad = [(y_plus - y_minus) / (2.0 * ck * d) for d in delta]
+        step = grad
+        if self.second_order:
+            g_plus = [(evaluate(batch[2]) - y_plus) / (ck * d) for d in delta2]
+            g_minus = [(evaluate(batch[3]) - y_minus) / (ck * d) for d in delta2]
+            h = [(gp - gm) / (2.0 * ck * d) for gp, gm, d in zip(g_plus, g_minus, delta)]
+            if self.h_diag is None:
+                self.h_diag = h
+            else:
+                self.h_diag = [(self.k * hb + hi) / (self.k + 1) for hb, hi in zip(self.h_diag, h)]
+            step = [g / max(abs(hb), self.h_floor) for g, hb in zip(grad, self.h_diag)]
+
+        self.theta = [min(1.0, max(0.0, t + ak * s)) for t, s in zip(theta, step)]
+        self.k += 1
+        self._last = _from_unit(self.theta)
+        return self._last, "SPSA2" if self.second_order else "SPSA"
+
+    __call__ = plan
+
+    def step(self, current: Params, evaluate: Callable[[Params], float],
+             executor: Optional[Executor] = None, isolate_timing: bool = False) -> Tuple[Params, str]:
+        evaluate = _memo(evaluate)
+        with isolated_timing(isolate_timing):
+            return run_plan(self.plan(current, evaluate), evaluate, executor, isolate_timing)
+
+
+
+# --- Online surrogate -------------------------------------------------------------
+
+class _RLS:
+    """Recursive least squares with exponential forgetting over a fixed feature map."""
+
+    def __init__(self, n_features: int, forgetting: float, residual_window: int):
+        self.n_features = n_features
+        self.forgetting = forgetting
+        self.residuals = deque(maxlen=residual_window)
+        self.reset()
+
+    def reset(self):
+        self.w = np.zeros(self.n_features)
+        self.P = np.eye(self.n_features) * 1e3
+        self.residuals.clear()
+        self.observations = 0
+
+    def update(self, phi: np.ndarray, y: float):
+        err = y - phi @ self.w
+        P_phi = self.P @ phi
+        gain = P_phi / (self.forgetting + phi @ P_phi)
+        self.w = self.w + gain * err
+        self.P = (self.P - np.outer(gain, P_phi)) / self.forgetting
+        if np.trace(self.P) > 1e8:  # covariance wind-up without excitation
+            self.P = np.eye(self.n_features) * 1e3
+        self.residuals.append(float(err))
+        self.observations += 1
+
+    @property
+    def residual_rms(self) -> float:
+        r = list(self.residuals)
+        return float(np.sqrt(np.mean(np.square(r)))) if r else float("inf")
+
+
+class SurrogateController:
+    """
+    Learns K and H from history instead of re-probing every step.
+
+    A quadratic f(u) = w0 + b·u + Σ_{i<=j} c_ij u_i u_j over the unit-normalised Params is
+    fitted by recursive least squares with exponential forgetting (an effective window
+    of about 1 / (1 - forgetting) observations) to the planner's probe scores.
+
+    The frame loop's own scores (observe(), e.g. frame_score from measured fps) are on a
+    different scale from the probes' evaluate() scores, so they are fitted by a second,
+    separate model that never feeds K or H: its one-step-ahead prediction errors only
+    tell the planner that the scene has drifted and the probe model needs new probes.
+
+    A step reads K = ∇f and H = ∇²f at the current point and moves by a Newton step when
+    H is negative definite, otherwise along K, limited to `radius` per lever. It only
+    probes (the current point, the ±delta K probes and `n_random` random corners) while
+    the probe model has too few observations or the RMS of either model's last
+    `residual_window` one-step-ahead prediction errors exceeds `tolerance`; otherwise
+    the step costs no renders at all.
+    """
+
+    def __init__(self, forgetting: float = 0.98, tolerance: float = 0.03, residual_window: int = 10,
+                 radius: float = 0.1, lr: float = 0.5, n_random: int = 4, seed: int = 0):
+        n = len(_BOUNDS)
+        self.n_features = 1 + n + n * (n + 1) // 2
+        self.forgetting = forgetting
+        self.tolerance = tolerance
+        self.radius = radius
+        self.lr = lr
+        self.n_random = n_random
+        self.rng = random.Random(seed)
+        self.model = _RLS(self.n_features, forgetting, residual_window)        # probe scores
+        self.frame_model = _RLS(self.n_features, forgetting, residual_window)  # observe() scores
+        self.probe_steps = 0
+        self._iu = np.triu_indices(n)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.model.reset()
+            self.frame_model.reset()
+
+    @property
+    def observations(self) -> int:
+        """Probe observations the surrogate is fitted on."""
+        return self.model.observations
+
+    def _features(self, u: np.ndarray) -> np.ndarray:
+        return np.concatenate(([1.0], u, np.outer(u, u)[self._iu]))
+
+    def _phi(self, p: Params) -> np.ndarray:
+        return self._features(np.array(_to_unit(_clamp(p))))
+
+    def predict(self, p: Params) -> float:
+        """Surrogate (probe-scale) score of p."""
+        return float(self._phi(p) @ self.model.w)
+
+    def _fit_probe(self, p: Params, score: float):
+        phi = self._phi(p)
+        with self._lock:
+            self.model.update(phi, score)
+
+    def observe(self, p: Params, score: float):
+        """Adds one frame-loop (params, score) observation to the drift-detection model."""
+        phi = self._phi(p)
+        with self._lock:
+            self.frame_model.update(phi, score)
+
+    @property
+    def residual_rms(self) -> float:
+        """RMS one-step-ahead error of the probe model."""
+        return self.model.residual_rms
+
+    @property
+    def needs_probe(self) -> bool:
+        model, frames = self.model, self.frame_model
+        if (self.observations < self.n_features or len(model.residuals) < model.residuals.maxlen
+                or model.residual_rms > self.tolerance):
+            return True
+        # Drift: the live scores stopped following a fitted model of their own
+        return (frames.observations >= self.n_features and len(frames.residuals) == frames.residuals.maxlen
+                and frames.residual_rms > self.tolerance)
+
+    def kernels(self, p: Params) -> Tuple[np.ndarray, np.ndarray]:
+        """(K, H): gradient and Hessian (synergy matrix) of the surrogate at p, in unit coordinates."""
+        n = len(_BOUNDS)
+        u = np.array(_to_unit(_clamp(p)))
+        with self._lock:
+            w = self.model.w.copy()
+        b = w[1:1 + n]
+        C = np.zeros((n, n))
+        C[self._iu] = w[1 + n:]
+        H = C + C.T  # diagonal terms doubled: d²(c_ii u_i²) = 2 c_ii
+        return b + H @ u, H
+
+    def plan(self, current: Params, evaluate: EvalMemo) -> Plan:
+        if self.needs_probe:
+            probes = [current] + _k_probes(current)
+            u = _to_unit(_clamp(current))
+            for _ in range(self.n_random):
+                probes.append(_from_unit([x + self.radius * self.rng.choice((-1, 1)) for x in u]))
+            yield probes
+            self.probe_steps += 1
+            seen = set()
+            for p in probes:
+                p = _clamp(p)
+                if astuple(p) not in seen:
+                    seen.add(astuple(p))
+                    self._fit_probe(p, evaluate(p))
+        else:
+            yield []
+
+        K, H = self.kernels(current)
+        if np.all(np.linalg.eigvalsh(H) < -1e-6):
+            delta = -np.linalg.solve(H, K)
+        else:
+            delta = self.lr * K
+        delta = np.clip(delta, -self.radius, self.radius)
+        u = np.array(_to_unit(_clamp(current)))
+        return _from_unit((u + delta).tolist()), "model"
+
+    __call__ = plan
+
+CONTROLLERS = ("K", "KH", "SPSA", "SPSA2", "model")
+
 
+def make_planner(controller: str, seed: int = 0, eval_budget: Optional[int] = None) -> Planner:
+    """
+    Step planner for a --controller name: K, KH, SPSA, SPSA2 (second-order SPSA) or model (online surrogate).
 
-def suggest_step(current: Params, evaluate: Callable[[Params], float], use_h: bool):
-    return suggest_step_KH(current, evaluate) if use_h else suggest_step_K(current, evaluate)
+    KH planners keep one PairBandit across their steps; eval_budget caps a KH step's renders
+    (at least the K step's 11, see suggest_step_KH).
+    """
+    _check_budget(eval_budget)
+    if controller == "K":
+        return lambda current, evaluate: _plan_K(current, evaluate)
+    if controller == "KH":
+        bandit = PairBandit()
+        return lambda current, evaluate: _plan_KH(current, evaluate, bandit, eval_budget=eval_budget)
+    if controller in ("SPSA", "SPSA2"):
+        return SPSA(second_order=controller == "SPSA2", seed=seed)
+    if controller == "model":
+        return SurrogateController(seed=seed)
+    raise ValueError(f"controller must be one of {CONTROLLERS}")
@@ -0,0 +1,217 @@
+"""
+Buffered per-frame metrics log for the ASCII torus loop.
+
+Writing a CSV row per frame puts formatting and file I/O inside the loop being
+timed. FrameLog instead stores each frame's metrics into preallocated column
+arrays and writes them out a block at a time, either as CSV rows or, for a
+path ending in .npz, as one compressed columnar file when the log is closed.
+The same columns feed the per-mode summary (frame-time and quality percentiles)
+and the bench.csv aggregate (mode, avg_fps, avg_q, avg_sim).
+
+Aggregate existing logs from the command line:
+
+    python -m mcik.experiments.ascii_torus.framelog LOG [LOG ...] [--bench bench.csv] [--summary out.csv]
+"""
+
+import argparse
+import csv
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FRAME_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("frame", "i8"),
+    ("ms", "f8"),
+    ("fps", "f8"),
+    ("quality", "f8"),
+    ("scale", "f8"),
+    ("spp", "i8"),
+    ("gamma", "f8"),
+    ("ramp", "i8"),
+    ("controller", "U16"),
+    ("frame_ms", "f8"),
+    ("jitter_ms", "f8"),
+    ("schedule", "U16"),
+    ("bytes", "i8"),
+    ("sim", "f8"),
+    ("ns", "f8"),
+)
+PERCENTILES = (50, 95, 99)
+SUMMARY_COLUMNS = ("mode", "frames", "avg_fps", "avg_q", "avg_sim", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                   "p50_q", "p95_q", "p99_q")
+BENCH_COLUMNS = ("mode", "avg_fps", "avg_q", "avg_sim")
+
+
+class FrameLog:
+    """
+    Per-frame metrics in preallocated column blocks.
+
+    Args:
+        path: Output file; ".npz" writes a compressed columnar file on close(), anything
+              else CSV rows as each block fills. None keeps the log in memory only.
+        columns: (name, numpy dtype) pairs, in row order.
+        block: Rows per block; a block is written out when it fills (and on flush/close).
+    """
+
+    def __init__(self, path: Optional[str] = None, columns: Sequence[Tuple[str, str]] = FRAME_COLUMNS,
+                 block: int = 1024):
+        if block < 1:
+            raise ValueError(f"block must be at least 1, got {block}")
+        self.path = path
+        self.names = tuple(name for name, _ in columns)
+        self.columnar = path is not None and path.endswith(".npz")
+        self.rows = 0
+        self._block = [np.empty(block, dtype=dtype) for _, dtype in columns]
+        self._n = 0
+        self._chunks: List[List[np.ndarray]] = []
+        self._file = None
+        self._writer = None
+        if path is not None and not self.columnar:
+            self._file = open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.names)
+            self._file.flush()
+
+    def append(self, *values):
+        """Stores one frame's values, in column order."""
+        if len(values) != len(self.names):
+            raise ValueError(f"expected {len(self.names)} values ({', '.join(self.names)}), got {len(values)}")
+        n = self._n
+        for col, v in zip(self._block, values):
+            col[n] = v
+        self._n = n + 1
+        self.rows += 1
+        if self._n == len(self._block[0]):
+            self.flush()
+
+    def flush(self):
+        """Moves the filled part of the current block out (and to the CSV, if any)."""
+        if self._n == 0:
+            return
+        chunk = [col[:self._n].copy() for col in self._block]
+        self._chunks.append(chunk)
+        self._n = 0
+        if self._writer is not None:
+            self._writer.writerows(zip(*(c.tolist() for c in chunk)))
+            self._file.flush()
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Everything logged so far, one array per column."""
+        parts = self._chunks + ([[col[:self._n] for col in self._block]] if self._n else [])
+        if not parts:
+            return {name: col[:0].copy() for name, col in zip(self.names, self._block)}
+        return {name: np.concatenate([p[i] for p in parts]) for i, name in enumerate(self.names)}
+
+    def summary(self, by: str = "controller") -> List[dict]:
+        return summarize(self.columns(), by)
+
+    def close(self):
+        self.flush()
+        if self.columnar:
+            np.savez_compressed(self.path, **self.columns())
+            self.columnar = False  # written; a second close() is a no-op
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_frames(path: str) -> Dict[str, np.ndarray]:
+    """Reads a FrameLog file (CSV or .npz) back into columns."""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    dtypes = dict(FRAME_COLUMNS)
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        names = next(reader)
+        values = list(zip(*reader)) or [()] * len(names)
+    return {name: np.array(v, dtype=dtypes.get(name, "f8")) for name, v in zip(names, values)}
+
+
+def concat_frames(logs: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Stacks several runs' columns (only the columns all of them have)."""
+    names = [n for n in logs[0] if all(n in log for log in logs[1:])]
+    return {n: np.concatenate([log[n] for log in logs]) for n in names}
+
+
+def _mean(a: np.ndarray) -> float:
+    return float(a.mean()) if a.size else float("nan")
+
+
+def _nanmean(a: np.ndarray) -> float:
+    a = a[~np.isnan(a)]
+    return _mean(a)
+
+
+def summarize(cols: Dict[str, np.ndarray], by: str = "controller") -> List[dict]:
+    """
+    One row per value of `by` (in order of first appearance): frame count, mean fps,
+    quality and similarity, and mean/percentiles of frame time and quality.
+
+    Frame time is the whole-frame `frame_ms` when logged, else the render `ms`;
+    avg_sim averages the frames where similarity was measured (non-NaN `sim`) and
+    is NaN when there are none or the log has no `sim` column.
+    """
+    keys = cols[by]
+    ms = cols["frame_ms"] if "frame_ms" in cols else cols["ms"]
+    _, first = np.unique(keys, return_index=True)
+    rows = []
+    for key in keys[np.sort(first)].tolist():
+        sel = keys == key
+        q = cols["quality"][sel]
+        m = ms[sel]
+        row = {
+            "mode": key,
+            "frames": int(sel.sum()),
+            "avg_fps": _mean(cols["fps"][sel]),
+            "avg_q": _mean(q),
+            "avg_sim": _nanmean(cols["sim"][sel]) if "sim" in cols else float("nan"),
+            "mean_ms": _mean(m),
+        }
+        row.update({f"p{p}_ms": float(v) for p, v in zip(PERCENTILES, np.percentile(m, PERCENTILES))})
+        row.update({f"p{p}_q": float(v) for p, v in zip(PERCENTILES, np.percentile(q, PERCENTILES))})
+        rows.append(row)
+    return rows
+
+
+def write_summary(rows: Sequence[dict], path: str, columns: Sequence[str] = SUMMARY_COLUMNS):
+    """Writes summary rows as CSV; columns=BENCH_COLUMNS gives the bench.csv layout."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows([row[c] for c in columns] for row in rows)
+
+
+def format_summary(rows: Sequence[dict]) -> str:
+    header = "mode        frames  avg_fps  avg_q  avg_sim  mean_ms  p50_ms  p95_ms  p99_ms  p50_q  p95_q  p99_q"
+    lines = [header]
+    for r in rows:
+        lines.append(f"{r['mode']:<10s}  {r['frames']:>6d}  {r['avg_fps']:>7.1f}  {r['avg_q']:>5.3f}  "
+                     f"{r['avg_sim']:>7.3f}  {r['mean_ms']:>7.2f}  {r['p50_ms']:>6.2f}  {r['p95_ms']:>6.2f}  "
+                     f"{r['p99_ms']:>6.2f}  {r['p50_q']:>5.3f}  {r['p95_q']:>5.3f}  {r['p99_q']:>5.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarize ASCII torus frame logs per controller mode")
+    ap.add_argument("logs", nargs="+", help="FrameLog CSV or .npz files")
+    ap.add_argument("--by", default="controller")
+    ap.add_argument("--summary", default="", help="write the full summary table as CSV")
+    ap.add_argument("--bench", default="", help="write mode,avg_fps,avg_q,avg_sim (bench.csv layout)")
+    args = ap.parse_args(argv)
+    rows = summarize(concat_frames([load_frames(p) for p in args.logs]), args.by)
+    print(format_summary(rows))
+    if args.summary:
+        write_summary(rows, args.summary)
+    if args.bench:
+        write_summary(rows, args.bench, BENCH_COLUMNS)
+
+
+if __name__ == "__main__":
+    main()
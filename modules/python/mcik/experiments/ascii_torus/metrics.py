@@ -1,5 +1,10 @@
+import numpy as np
+
+RAMP = " .:-=+*#%@"
+
+
 def char_density(c: str) -> float:
-    ramp = " .:-=+*#%@"
+    ramp = RAMP
     if c in ramp:
         return ramp.index(c) / (len(ramp) - 1)
     o = ord(c)
@@ -7,24 +12,42 @@ def char_density(c: str) -> float:
     return (o - 32) / (126 - 32)
 
 
+# char_density for every code point 0..255; anything above 255 clamps to the same
+# density as 255 (ord > 126 -> 1.0).
+DENSITY_LUT = np.array([char_density(chr(i)) for i in range(256)], dtype=np.float64)
+
+
+def char_codes(buf) -> np.ndarray:
+    """Converts a frame buffer (list of chars, str, bytes or code array) to a uint8 code array."""
+    if isinstance(buf, np.ndarray):
+        if buf.dtype.kind == "U":
+            return char_codes("".join(buf.ravel().tolist()))
+        return np.minimum(buf.ravel(), 255).astype(np.uint8)
+    if isinstance(buf, (bytes, bytearray, memoryview)):
+        return np.frombuffer(buf, dtype=np.uint8)
+    codes = np.frombuffer("".join(buf).encode("utf-32-le"), dtype=np.uint32)
+    return np.minimum(codes, 255).astype(np.uint8)
+
+
 def estimate_ascii_quality(buf, w: int, h: int) -> float:
     if w < 3 or h < 3:
         return 0.0
-    acc = 0.0
-    cnt = 0
-    for y in range(1, h - 1):
-        for x in range(1, w - 1):
-            off = y * w + x
-            c = char_density(buf[off])
-            cx1 = char_density(buf[off - 1])
-            cx2 = char_density(buf[off + 1])
-            cy1 = char_density(buf[off - w])
-            cy2 = char_density(buf[off + w])
-            gx = 0.5 * (cx2 - cx1)
-            gy = 0.5 * (cy2 - cy1)
-            acc += (gx * gx + gy * gy) ** 0.5
-            cnt += 1
-    if cnt == 0:
-        return 0.0
-    avg = acc / cnt
+    d = DENSITY_LUT[char_codes(buf)[: w * h]].reshape(h, w)
+    gx = 0.5 * (d[1:-1, 2:] - d[1:-1, :-2])
+    gy = 0.5 * (d[2:, 1:-1] - d[:-2, 1:-1])
+    mag = np.sqrt(gx * gx + gy * gy)
+    # Sequential (row-major) accumulation, matching the original per-pixel loop bit for bit
+    acc = float(np.cumsum(mag.ravel())[-1])
+    avg = acc / mag.size
     return max(0.0, min(1.0, avg))
+
+
+def estimate_ascii_similarity(buf, ref, w: int, h: int) -> float:
+    """1 - mean squared density difference against a reference frame, in [0, 1] (0 if the sizes differ)."""
+    d = DENSITY_LUT[char_codes(buf)]
+    d_ref = DENSITY_LUT[char_codes(ref)]
+    if d.size != d_ref.size or d.size != w * h or d.size == 0:
+        return 0.0
+    e = d - d_ref
+    mse = float(np.cumsum(e * e)[-1]) / d.size
+    return max(0.0, min(1.0, 1.0 - mse))
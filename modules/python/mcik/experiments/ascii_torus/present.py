@@ -0,0 +1,98 @@
+"""
+Diff-based terminal output for the ASCII torus loop.
+
+Clearing the screen and rewriting every row each frame makes terminal I/O a
+large part of frame time (more so over SSH). FramePresenter keeps the last
+frame it drew and emits only the runs of cells that changed, each prefixed by a
+cursor-positioning escape, plus the HUD line when it changed. Everything for a
+frame goes out in a single write.
+"""
+
+import sys
+
+import numpy as np
+
+from .metrics import char_codes
+
+CLEAR = "\x1b[2J\x1b[H"
+ERASE_LINE_END = "\x1b[K"
+
+
+def _goto(row: int, col: int) -> str:
+    return f"\x1b[{row + 1};{col + 1}H"
+
+
+def _codes(buf) -> np.ndarray:
+    if isinstance(buf, np.ndarray) and buf.dtype.kind in "ui":
+        return buf.ravel().astype(np.uint32, copy=False)
+    if isinstance(buf, (list, tuple, str)):
+        return np.frombuffer("".join(buf).encode("utf-32-le"), dtype=np.uint32)
+    return char_codes(buf).astype(np.uint32)
+
+
+def _text(codes: np.ndarray) -> str:
+    return codes.astype(np.uint32, copy=False).tobytes().decode("utf-32-le")
+
+
+class FramePresenter:
+    """
+    Draws frames (HUD line on row 0, the w x h frame below it) by sending only what changed.
+
+    Args:
+        stream: Text stream with write()/flush(); defaults to sys.stdout.
+        max_gap: Unchanged cells between two changed runs that are rewritten anyway
+                 rather than paying for another cursor escape.
+    """
+
+    def __init__(self, stream=None, max_gap: int = 6):
+        self.stream = stream if stream is not None else sys.stdout
+        self.max_gap = max_gap
+        self.last_bytes = 0
+        self.total_bytes = 0
+        self.frames = 0
+        self._prev = None
+        self._shape = None
+        self._hud = None
+
+    def _full(self, codes, w, h, hud):
+        rows = [_text(codes[y * w:(y + 1) * w]) for y in range(h)]
+        return CLEAR + hud + ERASE_LINE_END + "\n" + "\n".join(rows)
+
+    def _diff(self, codes, w, h):
+        changed = (codes != self._prev).reshape(h, w)
+        parts = []
+        for y in np.flatnonzero(changed.any(axis=1)).tolist():
+            cols = np.flatnonzero(changed[y])
+            # Split where the gap between changed cells is too long to just rewrite
+            breaks = np.flatnonzero(np.diff(cols) > self.max_gap + 1)
+            starts = np.concatenate(([cols[0]], cols[breaks + 1]))
+            ends = np.concatenate((cols[breaks], [cols[-1]])) + 1
+            row = codes[y * w:(y + 1) * w]
+            for x0, x1 in zip(starts.tolist(), ends.tolist()):
+                parts.append(_goto(y + 1, x0) + _text(row[x0:x1]))
+        return "".join(parts)
+
+    def present(self, buf, w: int, h: int, hud: str = "") -> int:
+        """Draws one frame (list of chars, str or code array) and returns the bytes written."""
+        codes = _codes(buf)[:w * h]
+        if self._prev is None or self._shape != (w, h):
+            out = self._full(codes, w, h, hud)
+        else:
+            out = self._diff(codes, w, h)
+            if hud != self._hud:
+                out = _goto(0, 0) + hud + ERASE_LINE_END + out
+        # Park the cursor below the frame so other output doesn't land inside it
+        out += _goto(h + 1, 0)
+        self.stream.write(out)
+        self.stream.flush()
+        self._prev = codes.copy()
+        self._shape = (w, h)
+        self._hud = hud
+        self.last_bytes = len(out.encode("utf-8"))
+        self.total_bytes += self.last_bytes
+        self.frames += 1
+        return self.last_bytes
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame (e.g. after other output or a terminal resize)."""
+        self._prev = None
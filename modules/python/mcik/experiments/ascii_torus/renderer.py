@@ -0,0 +1,272 @@
+"""
+Vectorized ASCII torus renderer.
+
+The (theta, phi) sample grid and everything that does not depend on the
+rotation angles (sin/cos tables, surface points, normals) is built once per
+sampling resolution and kept in a small LRU. A frame is then a handful of
+array operations: rotate, project, resolve the z-buffer with max/min scatters,
+and light only the winning samples, once per jittered sub-pixel sample set
+(samples_per_pixel), then optionally smooth the luminance with a separable
+blur (normal_smooth). The result is a G-buffer (luminance and coverage per
+pixel) cached per view and those two settings, so re-rendering the same view
+with another gamma or ramp only remaps shading.
+With one sample and no smoothing, arithmetic is done in the same order as the
+original scalar loop (tests/ascii_torus/test_renderer.py keeps it as the
+oracle), so the output buffer is identical.
+"""
+
+import math
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from .timing import timing_clock
+
+R, r = 1.0, 0.5
+K1, K2 = 20.0, 5.0
+LIGHT = (0.0, 1.0, -1.0)
+TH_STEP, PH_STEP = 0.07, 0.02
+
+
+class TorusGrid(NamedTuple):
+    """Rotation-independent per-sample tables, flattened theta-major (loop order)."""
+    cx: np.ndarray
+    cy: np.ndarray
+    cz: np.ndarray
+    nx: np.ndarray
+    ny: np.ndarray
+    nz: np.ndarray
+
+
+def _angles(step: float) -> List[float]:
+    # Accumulated exactly like the `while a < 2*pi: ...; a += step` loops
+    out = []
+    a = 0.0
+    while a < 2 * math.pi:
+        out.append(a)
+        a += step
+    return out
+
+
+@lru_cache(maxsize=4)
+def torus_grid(th_step: float = TH_STEP, ph_step: float = PH_STEP) -> TorusGrid:
+    th = _angles(th_step)
+    ph = _angles(ph_step)
+    costh = np.array([math.cos(t) for t in th])[:, None]
+    sinth = np.array([math.sin(t) for t in th])[:, None]
+    cosph = np.array([math.cos(p) for p in ph])[None, :]
+    sinph = np.array([math.sin(p) for p in ph])[None, :]
+    shape = (len(th), len(ph))
+    ring = R + r * costh
+    tables = (
+        ring * cosph,
+        ring * sinph,
+        np.broadcast_to(r * sinth, shape),
+        costh * cosph,
+        costh * sinph,
+        np.broadcast_to(sinth, shape),
+    )
+    grid = TorusGrid(*(np.ascontiguousarray(t).ravel() for t in tables))
+    for a in grid:
+        a.flags.writeable = False
+    return grid
+
+
+@lru_cache(maxsize=256)
+def rotation(A: float, B: float) -> Tuple[float, float, float, float]:
+    """Memoized (cosA, sinA, cosB, sinB) for a pair of rotation angles."""
+    return math.cos(A), math.sin(A), math.cos(B), math.sin(B)
+
+
+class GBuffer(NamedTuple):
+    """
+    Per-pixel intermediate of one view, before gamma and the character ramp are applied.
+
+    luminance: (h, w) Lambert term max(0, n.l) of the visible sample (0 where uncovered);
+               with several samples per pixel, the mean over samples (uncovered ones count 0).
+    coverage:  (h, w) bool, True where the torus covers the pixel (in any sample).
+    cost_s:    Seconds it took to build (rotation, projection, z-buffer, lighting, smoothing).
+    stages:    (stage, seconds) pairs that make up cost_s.
+    """
+    luminance: np.ndarray
+    coverage: np.ndarray
+    cost_s: float
+    stages: Tuple[Tuple[str, float], ...] = ()
+
+
+@lru_cache(maxsize=8)
+def jitter_offsets(spp: int) -> Tuple[Tuple[float, float], ...]:
+    """
+    Sub-pixel sample offsets (in pixels, within [-0.5, 0.5)) for `spp` samples per pixel.
+
+    One sample is the pixel's own projection (offset 0, the reference loop). More are
+    stratified: one jittered point in each of `spp` cells of a ceil(sqrt(spp))^2 grid,
+    from a fixed seed so frames (and cached G-buffers) are deterministic.
+    """
+    if spp <= 1:
+        return ((0.0, 0.0),)
+    n = math.ceil(math.sqrt(spp))
+    rng = np.random.default_rng(spp)
+    cells = rng.permutation(n * n)[:spp]
+    u = rng.random((spp, 2))
+    return tuple(((c % n + ux) / n - 0.5, (c // n + uy) / n - 0.5) for c, (ux, uy) in zip(cells.tolist(), u.tolist()))
+
+
+def _raster_pass(g: TorusGrid, w: int, h: int, rot: Tuple[float, float, float, float],
+                 jx: float = 0.0, jy: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Projects, z-buffers and lights one sample set; returns the covered pixels and their luminance."""
+    cosA, sinA, cosB, sinB = rot
+    x = g.cx * cosB - g.cy * sinB
+    y = g.cx * sinB + g.cy * cosB
+    y2 = y * cosA - g.cz * sinA
+    z2 = y * sinA + g.cz * cosA
+    ooz = 1.0 / (z2 + K2)
+    k = K1 * ooz
+    fx = w / 2 + k * x
+    fy = h / 2 + k * y2 * 0.5
+    if jx or jy:
+        fx += jx
+        fy += jy
+    xp = fx.astype(np.int64)  # truncation toward zero, like int()
+    yp = fy.astype(np.int64)
+    inside = np.flatnonzero((xp >= 0) & (xp < w) & (yp >= 0) & (yp < h))
+    off = yp[inside] * w + xp[inside]
+
+    # Z-buffer: per pixel, the largest ooz wins and ties go to the earliest sample
+    # (the loop only overwrites on a strictly greater ooz).
+    ooz_in = ooz[inside]
+    zbuf = np.zeros(w * h)
+    np.maximum.at(zbuf, off, ooz_in)
+    cand = np.flatnonzero(ooz_in == zbuf[off])
+    first = np.full(w * h, inside.size, dtype=np.int64)
+    np.minimum.at(first, off[cand], cand)
+    pixels = np.flatnonzero(first < inside.size)
+    win = inside[first[pixels]]
+
+    # Light the winners only
+    nx_rz = g.nx[win] * cosB - g.ny[win] * sinB
+    ny_rz = g.nx[win] * sinB + g.ny[win] * cosB
+    nz_rz = g.nz[win]
+    nny = ny_rz * cosA - nz_rz * sinA
+    nnz = ny_rz * sinA + nz_rz * cosA
+    lx, ly, lz = LIGHT
+    return pixels, np.maximum(0.0, nx_rz * lx + nny * ly + nnz * lz)
+
+
+@lru_cache(maxsize=32)
+def rasterize(w: int, h: int, A: float, B: float, spp: int = 1) -> GBuffer:
+    """
+    Rotates, projects, z-buffers and lights the torus for a w x h view, with `spp`
+    jittered samples per pixel (see jitter_offsets) averaged into the luminance.
+    Cached (LRU) per (w, h, A, B, spp); spp=1 is exactly the reference loop's geometry.
+    """
+    clock = timing_clock()
+    t0 = clock()
+    g = torus_grid()
+    rot = rotation(A, B)
+    offsets = jitter_offsets(spp)
+    luminance = np.zeros(w * h)
+    coverage = np.zeros(w * h, dtype=bool)
+    for jx, jy in offsets:
+        pixels, L = _raster_pass(g, w, h, rot, jx, jy)
+        luminance[pixels] += L
+        coverage[pixels] = True
+    if len(offsets) > 1:
+        luminance /= len(offsets)
+    luminance, coverage = luminance.reshape(h, w), coverage.reshape(h, w)
+    luminance.flags.writeable = False
+    coverage.flags.writeable = False
+    cost = clock() - t0
+    return GBuffer(luminance, coverage, cost, (("raster", cost),))
+
+
+def _tent_x(a: np.ndarray) -> np.ndarray:
+    p = np.pad(a, ((0, 0), (1, 1)), mode="edge")
+    return (p[:, :-2] + 2.0 * p[:, 1:-1] + p[:, 2:]) * 0.25
+
+
+def _tent_y(a: np.ndarray) -> np.ndarray:
+    p = np.pad(a, ((1, 1), (0, 0)), mode="edge")
+    return (p[:-2] + 2.0 * p[1:-1] + p[2:]) * 0.25
+
+
+def smooth_luminance(luminance: np.ndarray, coverage: np.ndarray, amount: float) -> np.ndarray:
+    """
+    Blends covered pixels toward a separable 3x3 [1, 2, 1] blur of their covered
+    neighbours (normalized by coverage, so the background does not bleed in);
+    amount 0 leaves the buffer as is, 1 replaces it with the blur.
+    """
+    amount = min(1.0, max(0.0, amount))
+    c = coverage.astype(np.float64)
+    num = _tent_y(_tent_x(luminance * c))
+    den = _tent_y(_tent_x(c))
+    blurred = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+    return np.where(coverage, luminance + amount * (blurred - luminance), 0.0)
+
+
+@lru_cache(maxsize=32)
+def render_gbuffer(w: int, h: int, A: float, B: float, spp: int = 1, normal_smooth: float = 0.0) -> GBuffer:
+    """
+    The w x h view's G-buffer with `spp` samples per pixel and `normal_smooth` smoothing.
+
+    Results are cached (LRU) per argument set, with the rasterized geometry cached
+    separately, so candidates that only change the shading (gamma, ramp) reuse
+    everything and candidates that only change the smoothing reuse the geometry.
+    `cost_s` records what building it cost (all stages, including reused ones), for
+    callers that score frame time.
+    """
+    base = rasterize(w, h, A, B, spp)
+    if normal_smooth <= 0.0:
+        return base
+    clock = timing_clock()
+    t0 = clock()
+    luminance = smooth_luminance(base.luminance, base.coverage, normal_smooth)
+    luminance.flags.writeable = False
+    cost = clock() - t0
+    return GBuffer(luminance, base.coverage, base.cost_s + cost, base.stages + (("smooth", cost),))
+
+
+def ramp_indices(luminance: np.ndarray, gamma: float, levels: int) -> np.ndarray:
+    """int(L ** (1/gamma) * (levels-1)) clamped to [0, levels-1], exactly as the scalar loop computes it."""
+    e = 1.0 / gamma if gamma > 0 else 1.0
+    n = levels - 1
+    scaled = np.power(luminance, e) * n
+    # np.power may come from a vector math library whose last-ulp rounding differs
+    # from the C pow() the loop uses. That only changes int() when L ** e * n lands
+    # on (or within an ulp or two of) an integer, e.g. L = 1 or gamma = 1 with L*n
+    # integral: one side computes k, the other k - 1e-16 and truncates to k - 1.
+    # scaled <= levels - 1, so an ulp is ~1e-15 and 1e-9 is a wide, still very
+    # sparse window; the values inside it are redone with scalar pow.
+    frac = scaled - np.floor(scaled)
+    near = np.flatnonzero(((frac < 1e-9) | (frac > 1.0 - 1e-9)) & (luminance > 0.0))
+    if near.size:
+        scaled[near] = [v ** e * n for v in luminance[near].tolist()]
+    return np.clip(scaled.astype(np.int64), 0, n)
+
+
+def shade(gbuf: GBuffer, gamma: float, ramp: str, background: str = " ") -> np.ndarray:
+    """Maps a G-buffer through gamma and the ramp to a (w*h,) uint32 array of code points."""
+    pixels = np.flatnonzero(gbuf.coverage)
+    idx = ramp_indices(gbuf.luminance.ravel()[pixels], gamma, len(ramp))
+    codes = np.full(gbuf.coverage.size, ord(background), dtype=np.uint32)
+    codes[pixels] = np.array([ord(c) for c in ramp], dtype=np.uint32)[idx]
+    return codes
+
+
+def render_codes(w: int, h: int, A: float, B: float, gamma: float, ramp: str, spp: int = 1,
+                 normal_smooth: float = 0.0, background: str = " ") -> np.ndarray:
+    """Renders one frame and returns its (w*h,) uint32 array of character code points."""
+    return shade(render_gbuffer(w, h, A, B, spp, normal_smooth), gamma, ramp, background)
+
+
+def clear_caches():
+    """Drops cached grids, rotations and G-buffers."""
+    for cached in (torus_grid, rotation, rasterize, render_gbuffer):
+        cached.cache_clear()
+
+
+def render_frame(w: int, h: int, A: float, B: float, gamma: float, ramp: str, spp: int = 1,
+                 normal_smooth: float = 0.0) -> List[str]:
+    """Renders one frame as a list of w*h characters (row-major)."""
+    return list(render_codes(w, h, A, B, gamma, ramp, spp, normal_smooth).tobytes().decode("utf-32-le"))
@@ -0,0 +1,195 @@
+"""
+Frame-loop scheduling of controller steps.
+
+A synchronous suggest_step renders every candidate inside one frame, which shows
+up as a hitch and pollutes the fps being controlled. The schedulers share one
+interface (start / tick / poll / close) so the frame loop does not care which
+one it drives:
+
+- SyncController runs the whole step in start() (the original behaviour);
+- AmortizedController evaluates one probe per frame, only when the frame's
+  remaining slack covers a probe (or the step has waited `max_wait` frames);
+- BackgroundController runs whole steps on a worker thread.
+
+New Params are only handed out by poll(), as a single object, once a step has
+completed, so the loop applies them atomically between frames.
+"""
+
+import abc
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .controller import EvalMemo, Params, Planner, run_plan
+from .timing import isolated_timing
+
+SCHEDULES = ("sync", "amortized", "background")
+
+
+class StepScheduler(abc.ABC):
+    """Base interface; subclasses implement start() and optionally override tick()."""
+
+    def __init__(self, planner: Planner):
+        self.planner = planner
+        self.steps = 0
+        self._result: Optional[Params] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a started step has not been handed out by poll()."""
+        return self._result is not None
+
+    @abc.abstractmethod
+    def start(self, current: Params, evaluate: Callable[[Params], float]) -> bool:
+        """Begins a step from `current`; returns False (and does nothing) while one is in progress."""
+
+    def tick(self, slack_s: float):
+        """Called once per frame with the time left in the frame budget."""
+
+    def poll(self) -> Optional[Params]:
+        """The next Params once a step has completed, else None."""
+        result, self._result = self._result, None
+        if result is not None:
+            self.steps += 1
+        return result
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _run_step(planner: Planner, current: Params, evaluate: Callable[[Params], float],
+              executor: Optional[Executor], isolate_timing: bool) -> Params:
+    memo = EvalMemo(evaluate)
+    with isolated_timing(isolate_timing):
+        return run_plan(planner(current, memo), memo, executor, isolate_timing)[0]
+
+
+class SyncController(StepScheduler):
+    def __init__(self, planner: Planner, executor: Optional[Executor] = None, isolate_timing: bool = False):
+        super().__init__(planner)
+        self.executor = executor
+        self.isolate_timing = isolate_timing
+
+    def start(self, current, evaluate):
+        if self.busy:
+            return False
+        self._result = _run_step(self.planner, current, evaluate, self.executor, self.isolate_timing)
+        return True
+
+
+class AmortizedController(StepScheduler):
+    """
+    Spreads a step's candidate evaluations over later frames.
+
+    Args:
+        planner: Step planner (see controller.make_planner).
+        max_wait: Frames a pending probe may be deferred for lack of slack before it
+                  runs anyway (so steps still finish when the budget is never met).
+        isolate_timing: Time probes with thread CPU time.
+    """
+
+    def __init__(self, planner: Planner, max_wait: int = 10, isolate_timing: bool = False):
+        super().__init__(planner)
+        self.max_wait = max_wait
+        self.isolate_timing = isolate_timing
+        self.probes = 0
+        self.probe_s = 0.0  # moving average of one probe's cost
+        self._plan = None
+        self._memo: Optional[EvalMemo] = None
+        self._pending = deque()
+        self._waited = 0
+
+    @property
+    def busy(self):
+        return self._plan is not None or self._result is not None
+
+    def start(self, current, evaluate):
+        if self.busy:
+            return False
+        self._memo = EvalMemo(evaluate)
+        self._plan = self.planner(current, self._memo)
+        self._pending = deque(next(self._plan))
+        self._waited = 0
+        return True
+
+    def tick(self, slack_s):
+        if self._plan is None:
+            return
+        if slack_s < self.probe_s and self._waited < self.max_wait:
+            self._waited += 1
+            return
+        self._waited = 0
+        while True:
+            while self._pending:
+                p = self._pending.popleft()
+                if p in self._memo:
+                    continue
+                t0 = time.perf_counter()
+                with isolated_timing(self.isolate_timing):
+                    self._memo(p)
+                cost = time.perf_counter() - t0
+                self.probe_s = cost if self.probes == 0 else 0.8 * self.probe_s + 0.2 * cost
+                self.probes += 1
+                return
+            try:
+                self._pending.extend(self._plan.send(None))
+            except StopIteration as stop:
+                self._result = stop.value[0]
+                self._plan = None
+                return
+
+
+class BackgroundController(StepScheduler):
+    """
+    Runs steps on a single worker thread; the frame loop only polls for the result.
+
+    Candidates render while the frame loop keeps running, so their wall-clock frame
+    times include that contention; pass isolate_timing=True (--isolate-timing) to
+    time them with thread CPU time instead. The default matches the other schedulers.
+    """
+
+    def __init__(self, planner: Planner, executor: Optional[Executor] = None, isolate_timing: bool = False):
+        super().__init__(planner)
+        self.executor = executor
+        self.isolate_timing = isolate_timing
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ascii-torus-ctrl")
+        self._future: Optional[Future] = None
+
+    @property
+    def busy(self):
+        return self._future is not None
+
+    def start(self, current, evaluate):
+        if self.busy:
+            return False
+        self._future = self._worker.submit(_run_step, self.planner, current, evaluate,
+                                           self.executor, self.isolate_timing)
+        return True
+
+    def poll(self):
+        if self._future is None or not self._future.done():
+            return None
+        future, self._future = self._future, None
+        self._result = future.result()
+        return super().poll()
+
+    def close(self):
+        self._worker.shutdown(wait=True)
+
+
+def make_scheduler(schedule: str, planner: Planner, executor: Optional[Executor] = None,
+                   isolate_timing: bool = False, max_wait: int = 10) -> StepScheduler:
+    if schedule == "sync":
+        return SyncController(planner, executor, isolate_timing)
+    if schedule == "amortized":
+        return AmortizedController(planner, max_wait, isolate_timing)
+    if schedule == "background":
+        return BackgroundController(planner, executor, isolate_timing)
+    raise ValueError(f"schedule must be one of {SCHEDULES}")
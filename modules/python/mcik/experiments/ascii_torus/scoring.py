@@ -0,0 +1,58 @@
+"""
+Candidate scoring for the ASCII torus controller.
+
+A candidate's frame is its G-buffer (geometry, cached per view size, rotation,
+samples per pixel and smoothing) shaded with the candidate's gamma and ramp.
+Candidates that only change shading parameters therefore cost a remap of the
+cached buffer, and are charged the G-buffer's recorded cost (every stage:
+supersampled rasterization and smoothing) plus their own shading time, so their
+fps stays comparable with candidates that needed a fresh render.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from .controller import Params
+from .metrics import RAMP, estimate_ascii_quality
+from .renderer import render_gbuffer, shade
+from .timing import timing_clock
+
+
+@lru_cache(maxsize=32)
+def build_ramp(size: int) -> str:
+    if size <= 1:
+        return RAMP[0]
+    if size == len(RAMP):
+        return RAMP
+    out = []
+    for i in range(size):
+        t = i / (size - 1)
+        idx = t * (len(RAMP) - 1)
+        i0 = int(idx)
+        i1 = min(len(RAMP) - 1, i0 + 1)
+        c = RAMP[i0] if (idx - i0) < 0.5 else RAMP[i1]
+        out.append(c)
+    return "".join(out)
+
+
+def view_size(p: Params, base_w: int, base_h: int) -> Tuple[int, int]:
+    return max(10, int(base_w * p.resolution_scale)), max(10, int(base_h * p.resolution_scale))
+
+
+def frame_score(fps: float, quality: float, target_fps: int, w_fps: float, w_quality: float) -> float:
+    fps_norm = min(fps / max(1, target_fps), 1.0)
+    return w_fps * fps_norm + w_quality * quality
+
+
+def evaluate_score(p: Params, A: float, B: float, base_w: int, base_h: int, target_fps: int,
+                   w_fps: float, w_quality: float) -> float:
+    """Weighted fps/quality score of rendering the (A, B) view with parameters p."""
+    w, h = view_size(p, base_w, base_h)
+    gbuf = render_gbuffer(w, h, A, B, p.samples_per_pixel, p.normal_smooth)
+    clock = timing_clock()
+    t0 = clock()
+    codes = shade(gbuf, p.gamma, build_ramp(p.ramp_size))
+    elapsed_ms = (gbuf.cost_s + clock() - t0) * 1000.0
+    fps = 1000.0 / elapsed_ms if elapsed_ms > 0 else 0.0
+    q = estimate_ascii_quality(codes, w, h)
+    return frame_score(fps, q, target_fps, w_fps, w_quality)
@@ -0,0 +1,29 @@
+"""
+Clock selection for frame timing.
+
+Frame costs are normally wall-clock (perf_counter). When controller candidates
+are evaluated concurrently, wall time also counts the other candidates
+competing for the cores, so evaluations can opt into isolated timing: inside
+isolated_timing(), timing_clock() is the calling thread's CPU time instead.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+_isolated: ContextVar[bool] = ContextVar("ascii_torus_isolated_timing", default=False)
+
+
+def timing_clock() -> Callable[[], float]:
+    """Clock (seconds) to time a frame with in the current context."""
+    return time.thread_time if _isolated.get() else time.perf_counter
+
+
+@contextmanager
+def isolated_timing(enabled: bool = True):
+    token = _isolated.set(enabled)
+    try:
+        yield
+    finally:
+        _isolated.reset(token)
@@ -0,0 +1,134 @@
+"""
+Direct frame encoding for lattice heatmaps, bypassing matplotlib figures.
+
+The cube is normalised once, quantised to 8-bit colormap indices and mapped
+through a 256-entry RGB lookup table. GIFs are written as palette images using
+that same table, so no per-frame quantisation or figure redraw is needed.
+"""
+
+import os
+
+import numpy as np
+import matplotlib.pyplot as plt
+from PIL import Image
+
+
+def colormap_lut(cmap="viridis", levels=256):
+    """Returns a (levels, 3) uint8 RGB lookup table sampled from a matplotlib colormap."""
+    cmap = plt.get_cmap(cmap) if isinstance(cmap, str) else cmap
+    rgba = cmap(np.linspace(0.0, 1.0, levels))
+    return np.round(rgba[:, :3] * 255).astype(np.uint8)
+
+
+def quantize(frames, vmin, vmax, levels=256):
+    """Maps values to integer colormap indices in [0, levels-1]; non-finite values go to the ends."""
+    span = vmax - vmin if vmax > vmin else 1.0
+    scaled = (np.asarray(frames, dtype=np.float64) - vmin) * ((levels - 1) / span)
+    scaled = np.nan_to_num(scaled, nan=0.0, posinf=levels - 1, neginf=0.0)
+    return np.clip(scaled + 0.5, 0, levels - 1).astype(np.uint8)
+
+
+def colorize(frames, vmin, vmax, cmap="viridis"):
+    """Vectorised colormap application: values (...,) -> uint8 RGB (..., 3)."""
+    return colormap_lut(cmap)[quantize(frames, vmin, vmax)]
+
+
+def heatmap_image(frame_2d):
+    """Orients a (dim0, dim1) frame like imshow(frame.T, origin='lower') in the animate_* plots."""
+    return frame_2d.T[::-1]
+
+
+def _upscale(img, scale):
+    if scale > 1:
+        img = np.repeat(np.repeat(img, scale, axis=0), scale, axis=1)
+    return img
+
+
+def auto_scale(shape, min_side=256):
+    """Integer nearest-neighbour upscale so small lattices still produce a viewable image."""
+    return max(1, min_side // max(1, min(shape)))
+
+
+def value_range(cube, block=64):
+    """Finite min/max of a cube, read `block` time steps at a time."""
+    lo, hi = np.inf, -np.inf
+    for t0 in range(0, cube.shape[-1], block):
+        chunk = np.asarray(cube[..., t0:t0 + block])
+        finite = chunk[np.isfinite(chunk)]
+        if finite.size:
+            lo, hi = min(lo, float(finite.min())), max(hi, float(finite.max()))
+    return (lo, hi) if lo <= hi else (0.0, 1.0)
+
+
+def _index_frames(cube, vmin, vmax, scale, block):
+    """Yields oriented, upscaled uint8 index frames, converting `block` time steps at a time."""
+    n = cube.shape[-1]
+    for t0 in range(0, n, block):
+        chunk = quantize(np.asarray(cube[..., t0:t0 + block]), vmin, vmax)
+        for t in range(chunk.shape[-1]):
+            yield _upscale(heatmap_image(chunk[..., t]), scale)
+
+
+def write_gif(cube, filename, fps=15, vmin=None, vmax=None, cmap="viridis", scale=None, block=64):
+    """
+    Encodes a (dim0, dim1, time) cube as an animated GIF of palette frames.
+
+    Args:
+        cube (array-like): Data cube; anything supporting cube[..., t0:t1] (ndarray, memmap,
+                           mcik.archive.LazyCube) is read block by block.
+        filename (str): Output path.
+        fps (int): Frames per second.
+        vmin, vmax (float, optional): Colour limits. Default to the cube's min/max.
+        cmap (str or Colormap): Colormap for the palette.
+        scale (int, optional): Integer upscale factor. Defaults to auto_scale().
+        block (int): Time steps quantised per batch (bounds temporary memory).
+    """
+    if vmin is None or vmax is None:
+        lo, hi = value_range(cube, block)
+        vmin = lo if vmin is None else vmin
+        vmax = hi if vmax is None else vmax
+    scale = scale or auto_scale(cube.shape[:2])
+    palette = colormap_lut(cmap).ravel().tolist()
+
+    def images():
+        for idx in _index_frames(cube, vmin, vmax, scale, block):
+            img = Image.fromarray(idx)
+            img.putpalette(palette)  # L -> P with the colormap as palette
+            yield img
+
+    frames = images()
+    first = next(frames)
+    first.save(filename, save_all=True, append_images=frames, duration=int(round(1000 / fps)),
+               loop=0, optimize=False)
+
+
+def write_png_sequence(cube, pattern, vmin=None, vmax=None, cmap="viridis", scale=None, block=64):
+    """
+    Writes one RGB PNG per time step. `pattern` is a format string such as 'frames/f_{:05d}.png'.
+
+    Returns:
+        int: Number of frames written.
+    """
+    if vmin is None or vmax is None:
+        lo, hi = value_range(cube, block)
+        vmin = lo if vmin is None else vmin
+        vmax = hi if vmax is None else vmax
+    scale = scale or auto_scale(cube.shape[:2])
+    lut = colormap_lut(cmap)
+    directory = os.path.dirname(pattern.format(0))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    for idx in _index_frames(cube, vmin, vmax, scale, block):
+        Image.fromarray(lut[idx]).save(pattern.format(count))
+        count += 1
+    return count
+
+
+def write_image(values_2d, filename, vmin=None, vmax=None, cmap="viridis", scale=1):
+    """Writes a single 2D array as an RGB image (row 0 at the top of the file)."""
+    values_2d = np.asarray(values_2d)
+    vmin = float(np.nanmin(values_2d)) if vmin is None else vmin
+    vmax = float(np.nanmax(values_2d)) if vmax is None else vmax
+    rgb = _upscale(colorize(values_2d, vmin, vmax, cmap), scale)
+    Image.fromarray(rgb).save(filename)
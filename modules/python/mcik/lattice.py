@@ -1,9 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.colors as mcolors
 import copy # Needed for estimating kernels
+import time
 
 class McikLatticeSimulator:
     """
@@ -14,7 +13,7 @@ class McikLatticeSimulator:
     first (K) and second (H) order kernel estimation via finite differences,
     and various visualizations including animations.
     """
-    def __init__(self, dimensions, time_steps, update_rule_func, **update_params):
+    def __init__(self, dimensions, time_steps, update_rule_func, *, verbose=True, **update_params):
         """
         Initializes the simulator.
 
@@ -24,14 +23,18 @@ class McikLatticeSimulator:
             update_rule_func (callable): A function defining the lattice dynamics.
                 Signature: update_rule_func(current_state, **update_params) -> next_state
                 'current_state' and 'next_state' are numpy arrays of shape 'dimensions'.
+            verbose (bool): Keyword-only. Print progress messages for every call. Disable for
+                            batch workloads (sweeps, services). Defaults to True.
             **update_params: Keyword arguments passed directly to the update_rule_func
-                             (e.g., alpha=1.0, beta=0.5).
+                             (e.g., alpha=1.0, beta=0.5). 'verbose' is reserved for the
+                             simulator and never reaches the update rule.
         """
         if not isinstance(dimensions, tuple) or not (1 <= len(dimensions) <= 2):
             raise ValueError("dimensions must be a tuple of length 1 (1D) or 2 (2D)")
         if not callable(update_rule_func):
             raise TypeError("update_rule_func must be a callable function")
 
+        self.verbose = verbose
         self.dimensions = dimensions
         self.is_1d = len(dimensions) == 1
         self.time_steps = time_steps
@@ -43,12 +46,21 @@ class McikLatticeSimulator:
         self.initial_state = None # User-provided base state (before pokes)
         self.initial_state_with_pokes = None # Actual state at t=0 after pokes
         self.pokes = {} # Store pokes applied at t=0
-
-        print(f"\n--- Initializing McikLatticeSimulator ---")
-        print(f"  Dimensions: {self.dimensions} ({'1D' if self.is_1d else '2D'})")
-        print(f"  Time Steps: {self.time_steps}")
-        print(f"  Update Rule: {update_rule_func.__name__}")
-        print(f"  Update Params: {self.update_params}")
+        self.timing = {} # Wall-clock info for the last run_simulation call
+        self.last_state = None # Most recent lattice state, the starting point for extend()
+        self.reducers = {} # Streaming reducers fed with every new block of frames
+        self._cube_buffer = None # Backing storage for data_cube; may hold spare capacity for extend()
+
+        self._log(f"\n--- Initializing McikLatticeSimulator ---")
+        self._log(f"  Dimensions: {self.dimensions} ({'1D' if self.is_1d else '2D'})")
+        self._log(f"  Time Steps: {self.time_steps}")
+        self._log(f"  Update Rule: {update_rule_func.__name__}")
+        self._log(f"  Update Params: {self.update_params}")
+
+    def _log(self, *args, **kwargs):
+        """Prints progress messages unless the simulator was created with verbose=False."""
+        if self.verbose:
+            print(*args, **kwargs)
 
     def set_initial_state(self, initial_state=None, pokes=None):
         """
@@ -61,18 +73,18 @@ class McikLatticeSimulator:
                                     Keys are position tuples (e.g., (index,) for 1D, (row, col) for 2D).
                                     Values are the poke magnitudes.
         """
-        print("\n--- Calling set_initial_state ---")
+        self._log("\n--- Calling set_initial_state ---")
         if initial_state is None:
             self.initial_state = np.zeros(self.dimensions)
-            print("  - initial_state not provided, defaulting to zeros.")
+            self._log("  - initial_state not provided, defaulting to zeros.")
         else:
             if initial_state.shape != self.dimensions:
                 raise ValueError(f"initial_state shape {initial_state.shape} must match dimensions {self.dimensions}")
             self.initial_state = initial_state.copy()
-            print(f"  - initial_state provided (shape: {self.initial_state.shape}).")
+            self._log(f"  - initial_state provided (shape: {self.initial_state.shape}).")
 
         self.pokes = pokes if pokes else {}
-        print(f"  - Pokes to apply: {self.pokes}")
+        self._log(f"  - Pokes to apply: {self.pokes}")
 
         # Apply pokes to the initial state
         # [cite: MicroCause_Kernels_Paper_Package.md]
@@ -84,15 +96,16 @@ class McikLatticeSimulator:
                  raise ValueError(f"Poke position {pos} dimensionality doesn't match lattice dimensions {self.dimensions}")
             try:
                 temp_state[pos] += value
-                print(f"    - Applied poke {value} at {pos}")
+                self._log(f"    - Applied poke {value} at {pos}")
             except IndexError:
                 raise IndexError(f"Poke position {pos} is out of bounds for lattice dimensions {self.dimensions}")
 
         # Store the potentially poked state as the actual t=0 state
         self.initial_state_with_pokes = temp_state
-        print(f"  - Final state at t=0 (with pokes): shape {self.initial_state_with_pokes.shape}, min={self.initial_state_with_pokes.min():.2f}, max={self.initial_state_with_pokes.max():.2f}")
+        self._log(f"  - Final state at t=0 (with pokes): shape {self.initial_state_with_pokes.shape}, min={self.initial_state_with_pokes.min():.2f}, max={self.initial_state_with_pokes.max():.2f}")
 
         self.data_cube = None # Reset data cube if initial state changes
+        self.last_state = None
 
 
     def run_simulation(self):
@@ -100,20 +113,22 @@ class McikLatticeSimulator:
         Runs the temporal propagation simulation.
         Requires set_initial_state to be called first.
         """
-        print("\n--- Calling run_simulation ---")
+        self._log("\n--- Calling run_simulation ---")
         if self.initial_state_with_pokes is None:
             raise RuntimeError("Initial state not set. Call set_initial_state() before running.")
 
         # Allocate data cube
         cube_shape = self.dimensions + (self.time_steps,)
         self.data_cube = np.zeros(cube_shape)
-        print(f"  - Allocated data_cube with shape: {self.data_cube.shape}")
+        self._log(f"  - Allocated data_cube with shape: {self.data_cube.shape}")
 
         # Set t=0 state
         self.data_cube[..., 0] = self.initial_state_with_pokes
         g_current = self.initial_state_with_pokes.copy()
 
-        print("  - Running temporal propagation...")
+        self._log("  - Running temporal propagation...")
+        started = time.time()
+        t0 = time.perf_counter()
         # Run temporal propagation [cite: MicroCause_Kernels_Paper_Package.md]
         for t in range(self.time_steps - 1):
             g_next = self.update_rule_func(g_current, **self.update_params)
@@ -122,19 +137,26 @@ class McikLatticeSimulator:
             # Print progress less frequently for faster runs
             # if (t+1) % max(1, (self.time_steps // 5)) == 0:
             #      print(f"    ...step {t+1}/{self.time_steps-1}")
-
-        print("  - Simulation complete.")
-        print(f"  - Final data_cube stats: min={self.data_cube.min():.3f}, max={self.data_cube.max():.3f}, mean={self.data_cube.mean():.3f}")
+        self.timing = {"started": started, "elapsed_s": time.perf_counter() - t0, "steps": self.time_steps - 1}
+        self._cube_buffer = self.data_cube
+        self.last_state = g_current
+        for reducer in self.reducers.values():
+            reducer.reset()
+            reducer.update(self.data_cube)
+
+        self._log("  - Simulation complete.")
+        if self.verbose: # Stats are full passes over the cube; skip them when quiet
+            self._log(f"  - Final data_cube stats: min={self.data_cube.min():.3f}, max={self.data_cube.max():.3f}, mean={self.data_cube.mean():.3f}")
         return self.data_cube
 
     def get_data_cube(self):
         """Returns the full simulation history (data cube)."""
-        print("\n--- Calling get_data_cube ---")
+        self._log("\n--- Calling get_data_cube ---")
         if self.data_cube is None:
-            print("  - Warning: Simulation has not been run yet. Returning None.")
+            self._log("  - Warning: Simulation has not been run yet. Returning None.")
             return None
         else:
-            print(f"  - Returning data_cube with shape: {self.data_cube.shape}")
+            self._log(f"  - Returning data_cube with shape: {self.data_cube.shape}")
             return self.data_cube
 
     def calculate_temporal_integral(self):
@@ -145,28 +167,149 @@ class McikLatticeSimulator:
         Returns:
             np.ndarray: Array matching self.dimensions, containing the sum over time.
         """
-        print("\n--- Calling calculate_temporal_integral ---")
+        self._log("\n--- Calling calculate_temporal_integral ---")
         if self.data_cube is None:
+            from .reducers import TemporalIntegral
+            streamed = [r for r in self.reducers.values() if isinstance(r, TemporalIntegral)]
+            if streamed and streamed[0].result() is not None:
+                self._log("  - Cube not in memory; returning the streamed temporal integral.")
+                return streamed[0].result()
             raise RuntimeError("Simulation data not available. Run run_simulation() first.")
         # Sum along the last axis (time)
         integral = np.sum(self.data_cube, axis=-1)
-        print(f"  - Calculated temporal integral. Shape: {integral.shape}, min={integral.min():.3f}, max={integral.max():.3f}")
+        self._log(f"  - Calculated temporal integral. Shape: {integral.shape}, min={integral.min():.3f}, max={integral.max():.3f}")
         return integral
 
+    def add_reducer(self, name, reducer):
+        """
+        Registers a streaming reducer (see mcik.reducers) under `name`.
+        It is fed the cube after run_simulation() and every block added by extend();
+        the internal runs of the kernel estimators leave it untouched.
+        """
+        self.reducers[name] = reducer
+        if self.data_cube is not None:
+            reducer.reset()
+            reducer.update(self.data_cube)
+        return reducer
+
+    def extend(self, n_steps, writer=None, keep_in_memory=True, block_steps=256):
+        """
+        Continues the current run for n_steps more steps, starting from the last state.
+        Only the new steps are computed.
+
+        Args:
+            n_steps (int): Number of additional steps.
+            writer (mcik.archive.ArchiveWriter, optional): On-disk store the new frames are appended to.
+            keep_in_memory (bool): Grow data_cube with the new frames. Set to False for horizons that
+                                   only live on disk/in reducers; data_cube is then dropped.
+            block_steps (int): Steps per block handed to the writer and reducers when not kept in memory.
+
+        Returns:
+            np.ndarray or None: The (grown) data cube, or None when keep_in_memory is False.
+        """
+        self._log(f"\n--- Calling extend (n_steps={n_steps}) ---")
+        if self.last_state is None:
+            raise RuntimeError("Nothing to extend. Call run_simulation() or resume() first.")
+        if n_steps < 1:
+            return self.data_cube
+
+        in_memory = keep_in_memory and self.data_cube is not None
+        if in_memory:
+            done = self.data_cube.shape[-1]
+            capacity = self._cube_buffer.shape[-1]
+            if done + n_steps > capacity:
+                # Amortized growth: at least 1.5x, so repeated small extends stay linear overall
+                new_capacity = max(done + n_steps, int(capacity * 1.5))
+                buffer = np.empty(self.dimensions + (new_capacity,), dtype=self.data_cube.dtype)
+                buffer[..., :done] = self.data_cube
+                self._cube_buffer = buffer
+                self._log(f"  - Grew cube capacity to {new_capacity} steps")
+        else:
+            self.data_cube = None
+            self._cube_buffer = None
+
+        t0 = time.perf_counter()
+        g_current = self.last_state
+        remaining = n_steps
+        while remaining > 0:
+            n = remaining if in_memory else min(block_steps, remaining)
+            if in_memory:
+                block = self._cube_buffer[..., done:done + n]
+            else:
+                block = np.empty(self.dimensions + (n,), dtype=g_current.dtype)
+            for t in range(n):
+                g_current = self.update_rule_func(g_current, **self.update_params)
+                block[..., t] = g_current
+            if writer is not None:
+                writer.append(block)
+            for reducer in self.reducers.values():
+                reducer.update(block)
+            remaining -= n
+
+        self.last_state = g_current
+        self.time_steps += n_steps
+        if in_memory:
+            self.data_cube = self._cube_buffer[..., :done + n_steps]
+        if writer is not None:
+            writer.flush()
+        elapsed = time.perf_counter() - t0
+        self.timing["elapsed_s"] = self.timing.get("elapsed_s", 0.0) + elapsed
+        self.timing["steps"] = self.timing.get("steps", 0) + n_steps
+        self._log(f"  - Extended by {n_steps} steps in {elapsed:.3f}s (time_steps is now {self.time_steps})")
+        return self.data_cube
+
+    def snapshot(self):
+        """Captures what extend() needs to continue this run later (state, step count, params, reducers)."""
+        if self.last_state is None:
+            raise RuntimeError("No state to snapshot. Run run_simulation() first.")
+        return {
+            "state": self.last_state.copy(),
+            "time_steps": self.time_steps,
+            "update_params": dict(self.update_params),
+            "reducers": copy.deepcopy(self.reducers),
+        }
+
+    def resume(self, snapshot):
+        """
+        Restores a snapshot() so extend() continues from it. The earlier frames are not
+        restored (data_cube stays None); reducers carry the accumulated summaries.
+        """
+        self._log("\n--- Calling resume ---")
+        self.last_state = np.array(snapshot["state"], copy=True)
+        self.time_steps = snapshot["time_steps"]
+        self.update_params = dict(snapshot.get("update_params", self.update_params))
+        self.reducers = copy.deepcopy(snapshot.get("reducers", {}))
+        self.data_cube = None
+        self._cube_buffer = None
+        self._log(f"  - Resumed at time_steps={self.time_steps}")
+
+    def save(self, path, chunks=None, compression_level=4):
+        """
+        Saves the data cube and run metadata as a chunked, compressed archive directory.
+        See mcik.archive for the format; reopen it lazily with mcik.archive.open_archive(path).
+        """
+        self._log("\n--- Calling save ---")
+        if self.data_cube is None:
+            raise RuntimeError("Simulation data not available. Run run_simulation() first.")
+        from .archive import save_simulation
+        archive = save_simulation(self, path, chunks=chunks, compression_level=compression_level)
+        self._log(f"  - Saved data_cube {self.data_cube.shape} to {path} in chunks of {archive.chunks}")
+        return archive
+
     # --- Kernel Estimation Methods ---
 
     def _run_for_kernel(self, pokes):
         """Helper function to run simulation for kernel estimation."""
         # Intentionally verbose for example output
-        print(f"\n  -- Running helper _run_for_kernel with pokes: {pokes} --")
+        self._log(f"\n  -- Running helper _run_for_kernel with pokes: {pokes} --")
         # Ensure we always start from the *original* base initial state for fair comparison
         if self.initial_state is None:
              # If user never provided one, it's zeros
              base_initial_state_for_kernel = np.zeros(self.dimensions)
-             print("     - Using default zero initial state for kernel run.")
+             self._log("     - Using default zero initial state for kernel run.")
         else:
              base_initial_state_for_kernel = self.initial_state.copy()
-             print("     - Using provided initial state for kernel run.")
+             self._log("     - Using provided initial state for kernel run.")
 
         # Apply *only* the pokes for this specific run
         temp_state = base_initial_state_for_kernel.copy()
@@ -180,18 +323,25 @@ class McikLatticeSimulator:
 
         # Set this specific initial state for the simulation
         self.initial_state_with_pokes = temp_state
-        print(f"     - Set initial state for this run (pokes: {current_pokes}).")
+        self._log(f"     - Set initial state for this run (pokes: {current_pokes}).")
 
-        # Run the simulation
-        self.run_simulation() # Will print its own messages
+        # Run the simulation. Registered reducers summarize the user's runs, so they are
+        # detached while the poke runs overwrite the cube
+        reducers, self.reducers = self.reducers, {}
+        try:
+            self.run_simulation() # Will print its own messages
 
-        # Calculate the result (temporal integral)
-        result = self.calculate_temporal_integral() # Will print its own messages
-        print(f"  -- Helper _run_for_kernel finished --")
+            # Calculate the result (temporal integral)
+            result = self.calculate_temporal_integral() # Will print its own messages
+        finally:
+            self.reducers = reducers
+        self._log(f"  -- Helper _run_for_kernel finished --")
 
         # Important: Reset internal state for next kernel run or subsequent user calls
         self.initial_state_with_pokes = None # Ensure next set_initial_state is clean
         self.data_cube = None
+        self._cube_buffer = None
+        self.last_state = None
         return result
 
 
@@ -209,28 +359,28 @@ class McikLatticeSimulator:
             np.ndarray: The estimated K kernel (K_a = Y_a - Y_base) as a temporal integral.
                         Shape matches self.dimensions.
         """
-        print("\n--- Calling estimate_k_kernel ---")
+        self._log("\n--- Calling estimate_k_kernel ---")
         # Ensure position is a tuple
         if not isinstance(poke_pos, tuple):
             poke_pos = (poke_pos,)
-        print(f"  - Estimating K for poke at {poke_pos} with value {poke_value}")
+        self._log(f"  - Estimating K for poke at {poke_pos} with value {poke_value}")
 
         # Run Baseline (Y_base)
-        print("  - Running Baseline simulation (no pokes)")
+        self._log("  - Running Baseline simulation (no pokes)")
         Y_base = self._run_for_kernel(pokes={})
-        print(f"    - Baseline result (integral) stats: min={Y_base.min():.3f}, max={Y_base.max():.3f}")
+        self._log(f"    - Baseline result (integral) stats: min={Y_base.min():.3f}, max={Y_base.max():.3f}")
 
         # Run Poke A (Y_a)
-        print(f"  - Running Poke A simulation at {poke_pos}")
+        self._log(f"  - Running Poke A simulation at {poke_pos}")
         pokes_a = {poke_pos: poke_value}
         Y_a = self._run_for_kernel(pokes=pokes_a)
-        print(f"    - Poke A result (integral) stats: min={Y_a.min():.3f}, max={Y_a.max():.3f}")
+        self._log(f"    - Poke A result (integral) stats: min={Y_a.min():.3f}, max={Y_a.max():.3f}")
 
         # Calculate K_a [cite: MicroCause_Kernels_Paper_Package.md]
         K_a = Y_a - Y_base
-        print(f"  - K Kernel (K_a = Y_a - Y_base) calculated.")
-        print(f"    - K_a stats: min={K_a.min():.3f}, max={K_a.max():.3f}")
-        print("--- K Kernel estimation complete ---")
+        self._log(f"  - K Kernel (K_a = Y_a - Y_base) calculated.")
+        self._log(f"    - K_a stats: min={K_a.min():.3f}, max={K_a.max():.3f}")
+        self._log("--- K Kernel estimation complete ---")
         return K_a
 
 
@@ -252,37 +402,37 @@ class McikLatticeSimulator:
                 H_ab (np.ndarray): Second-order synergy kernel H(i; a, b).
                 All arrays match self.dimensions and are temporal integrals.
         """
-        print("\n--- Calling estimate_h_kernel ---")
+        self._log("\n--- Calling estimate_h_kernel ---")
          # Ensure positions are tuples
         if not isinstance(poke_a_pos, tuple): poke_a_pos = (poke_a_pos,)
         if not isinstance(poke_b_pos, tuple): poke_b_pos = (poke_b_pos,)
-        print(f"  - Estimating H for pokes at A={poke_a_pos}, B={poke_b_pos} with value {poke_value}")
+        self._log(f"  - Estimating H for pokes at A={poke_a_pos}, B={poke_b_pos} with value {poke_value}")
 
         if poke_a_pos == poke_b_pos:
-            print("  - Warning: poke_a_pos and poke_b_pos are the same. H kernel measures interaction between *distinct* pokes.")
+            self._log("  - Warning: poke_a_pos and poke_b_pos are the same. H kernel measures interaction between *distinct* pokes.")
 
         # Run Baseline (Y_base)
-        print("  - Running Baseline simulation")
+        self._log("  - Running Baseline simulation")
         Y_base = self._run_for_kernel(pokes={})
-        print(f"    - Baseline result (integral) stats: min={Y_base.min():.3f}, max={Y_base.max():.3f}")
+        self._log(f"    - Baseline result (integral) stats: min={Y_base.min():.3f}, max={Y_base.max():.3f}")
 
         # Run Poke A (Y_a)
-        print(f"  - Running Poke A simulation")
+        self._log(f"  - Running Poke A simulation")
         pokes_a = {poke_a_pos: poke_value}
         Y_a = self._run_for_kernel(pokes=pokes_a)
-        print(f"    - Poke A result (integral) stats: min={Y_a.min():.3f}, max={Y_a.max():.3f}")
+        self._log(f"    - Poke A result (integral) stats: min={Y_a.min():.3f}, max={Y_a.max():.3f}")
 
         # Run Poke B (Y_b)
-        print(f"  - Running Poke B simulation")
+        self._log(f"  - Running Poke B simulation")
         pokes_b = {poke_b_pos: poke_value}
         Y_b = self._run_for_kernel(pokes=pokes_b)
-        print(f"    - Poke B result (integral) stats: min={Y_b.min():.3f}, max={Y_b.max():.3f}")
+        self._log(f"    - Poke B result (integral) stats: min={Y_b.min():.3f}, max={Y_b.max():.3f}")
 
         # Run Poke A + B (Y_ab)
-        print(f"  - Running Poke A+B simulation")
+        self._log(f"  - Running Poke A+B simulation")
         pokes_ab = {poke_a_pos: poke_value, poke_b_pos: poke_value}
         Y_ab = self._run_for_kernel(pokes=pokes_ab)
-        print(f"    - Poke A+B result (integral) stats: min={Y_ab.min():.3f}, max={Y_ab.max():.3f}")
+        self._log(f"    - Poke A+B result (integral) stats: min={Y_ab.min():.3f}, max={Y_ab.max():.3f}")
 
         # Calculate Kernels [cite: MicroCause_Kernels_Paper_Package.md]
         K_a = Y_a - Y_base
@@ -291,22 +441,28 @@ class McikLatticeSimulator:
         Y_linear_sum = K_a + K_b
         H_ab = Y_actual - Y_linear_sum # Synergy term
 
-        print(f"  - Kernels calculated:")
-        print(f"    - K_a stats: min={K_a.min():.3f}, max={K_a.max():.3f}")
-        print(f"    - K_b stats: min={K_b.min():.3f}, max={K_b.max():.3f}")
-        print(f"    - H_ab (Synergy) stats: min={H_ab.min():.3f}, max={H_ab.max():.3f}")
-        print("--- H Kernel estimation complete ---")
+        self._log(f"  - Kernels calculated:")
+        self._log(f"    - K_a stats: min={K_a.min():.3f}, max={K_a.max():.3f}")
+        self._log(f"    - K_b stats: min={K_b.min():.3f}, max={K_b.max():.3f}")
+        self._log(f"    - H_ab (Synergy) stats: min={H_ab.min():.3f}, max={H_ab.max():.3f}")
+        self._log("--- H Kernel estimation complete ---")
         return K_a, K_b, H_ab
 
 
     # --- Basic Plotting Methods ---
     # These remain largely unchanged, but add print statements
 
-    def plot_spacetime_heatmap(self, ax=None, show=True, filename=None):
-        """Plots the 2D space-time heatmap (only for 1D lattices)."""
-        print("\n--- Calling plot_spacetime_heatmap ---")
+    def plot_spacetime_heatmap(self, ax=None, show=True, filename=None, max_size=(2048, 2048), lod_reduce='mean'):
+        """
+        Plots the 2D space-time heatmap (only for 1D lattices).
+
+        Runs larger than max_size = (sites, steps) are block-pooled with lod_reduce
+        ('mean', 'min' or 'max') before plotting; see mcik.lod. Pass max_size=(None, None)
+        to plot every value.
+        """
+        self._log("\n--- Calling plot_spacetime_heatmap ---")
         if not self.is_1d:
-            print("  - Error: Spacetime heatmap is only available for 1D lattices.")
+            self._log("  - Error: Spacetime heatmap is only available for 1D lattices.")
             return
         if self.data_cube is None:
             raise RuntimeError("Simulation data not available. Run run_simulation() first.")
@@ -316,8 +472,13 @@ class McikLatticeSimulator:
         else:
             fig = ax.figure
 
+        from .lod import spacetime_lod
+        data, factors = spacetime_lod(self.data_cube, max_size, how=lod_reduce) # (index, time), pooled if huge
+        if factors != (1, 1):
+            self._log(f"  - Level of detail: pooled {self.data_cube.shape} by {factors} ({lod_reduce}) -> {data.shape}")
+
         im = ax.imshow(
-            self.data_cube[..., 0, :], # Access 1D data correctly (index, 0, time) -> (index, time)
+            data,
             aspect='auto',
             cmap='viridis',
             origin='lower',
@@ -327,48 +488,66 @@ class McikLatticeSimulator:
         ax.set_xlabel("Time Step ($t$)")
         ax.set_ylabel("Lattice Position ($i$)")
         fig.colorbar(im, ax=ax, label="State Value")
-        print("  - Heatmap configured.")
+        self._log("  - Heatmap configured.")
         if filename:
-            print(f"  - Saving heatmap to {filename}")
+            self._log(f"  - Saving heatmap to {filename}")
             fig.savefig(filename)
         if show:
-            print("  - Displaying heatmap plot.")
+            self._log("  - Displaying heatmap plot.")
             plt.show()
         else:
              plt.close(fig) # Close if not showing
         return ax
 
-    def plot_temporal_integral(self, temporal_integral_data=None, ax=None, show=True, label="Temporal Integral", filename=None):
-        """Plots the 1D or 2D temporal integral."""
-        print("\n--- Calling plot_temporal_integral ---")
+    def plot_temporal_integral(self, temporal_integral_data=None, ax=None, show=True, label="Temporal Integral", filename=None,
+                               max_size=(4096, 2048)):
+        """
+        Plots the 1D or 2D temporal integral.
+
+        Lattices larger than max_size are pooled first (see mcik.lod): 1D plots show the
+        block mean with a min/max band, 2D heatmaps show block means.
+        """
+        self._log("\n--- Calling plot_temporal_integral ---")
         if temporal_integral_data is None:
              if self.data_cube is None:
                   raise RuntimeError("Simulation data not available. Run run_simulation() first.")
-             print("  - Calculating integral data...")
+             self._log("  - Calculating integral data...")
              temporal_integral_data = self.calculate_temporal_integral()
         else:
-            print("  - Using provided integral data.")
+            self._log("  - Using provided integral data.")
 
 
         if ax is None:
              fig, ax = plt.subplots(figsize=(10, 6))
-             print("  - Created new figure for plot.")
+             self._log("  - Created new figure for plot.")
         else:
              fig = ax.figure
-             print("  - Using provided axes for plot.")
+             self._log("  - Using provided axes for plot.")
+
 
+        from .lod import block_reduce, lod_factors
+        factors = lod_factors(temporal_integral_data.shape, max_size)
+        if factors != (1,) * temporal_integral_data.ndim:
+             self._log(f"  - Level of detail: pooling integral {temporal_integral_data.shape} by {factors}")
 
         if self.is_1d:
-             ax.plot(temporal_integral_data, label=label)
+             if factors == (1,):
+                  ax.plot(temporal_integral_data, label=label)
+             else:
+                  f = factors[0]
+                  x = np.arange(0, self.dimensions[0], f) + (f - 1) / 2.0
+                  ax.fill_between(x, block_reduce(temporal_integral_data, factors, 'min'),
+                                  block_reduce(temporal_integral_data, factors, 'max'), alpha=0.3)
+                  ax.plot(x, block_reduce(temporal_integral_data, factors, 'mean'), label=label)
              ax.set_title("Temporal Integral (Total Accumulated Influence)")
              ax.set_xlabel("Lattice Position ($i$)")
              ax.set_ylabel("Total Influence ($\sum g_i^{(t)}$)")
              ax.set_xlim(0, self.dimensions[0])
              ax.legend()
-             print("  - Configured 1D integral plot.")
+             self._log("  - Configured 1D integral plot.")
         else: # 2D Plot
              im = ax.imshow(
-                 temporal_integral_data.T, # Transpose for better axis alignment
+                 block_reduce(temporal_integral_data, factors, 'mean').T, # Transpose for better axis alignment
                  aspect='auto',
                  cmap='viridis',
                  origin='lower',
@@ -378,13 +557,13 @@ class McikLatticeSimulator:
              ax.set_xlabel("Dimension 1 (e.g., Zip Code)")
              ax.set_ylabel("Dimension 2 (e.g., Home Type)")
              fig.colorbar(im, ax=ax, label="Total Influence")
-             print("  - Configured 2D integral plot (heatmap).")
+             self._log("  - Configured 2D integral plot (heatmap).")
 
         if filename:
-             print(f"  - Saving integral plot to {filename}")
+             self._log(f"  - Saving integral plot to {filename}")
              fig.savefig(filename)
         if show:
-            print("  - Displaying integral plot.")
+            self._log("  - Displaying integral plot.")
             plt.show()
         else:
             plt.close(fig) # Close if not showing
@@ -395,9 +574,9 @@ class McikLatticeSimulator:
          Plots the estimated 1st and 2nd order kernels (temporal integrals).
          Currently only supports 1D lattices for clear visualization.
          """
-         print("\n--- Calling plot_kernels ---")
+         self._log("\n--- Calling plot_kernels ---")
          if not self.is_1d:
-              print("  - Warning: Kernel plotting currently only implemented for 1D lattices.")
+              self._log("  - Warning: Kernel plotting currently only implemented for 1D lattices.")
               # Could add 2D imshow here later
               return
 
@@ -409,7 +588,7 @@ class McikLatticeSimulator:
              figsize=(12, 8),
              sharex=True
          )
-         print("  - Created figure for kernel plots.")
+         self._log("  - Created figure for kernel plots.")
 
          # Plot 1: The First-Order Kernels (Linear Ripples)
          ax1.plot(K_a, label=f'K(i, a) - 1st Order from Poke A (i={poke_a_pos[0]})', linestyle=':')
@@ -418,7 +597,7 @@ class McikLatticeSimulator:
          ax1.set_title("First-Order Influence (Temporal Integral)")
          ax1.set_ylabel("Total Accumulated Influence")
          ax1.legend()
-         print("  - Configured 1st order kernel plot.")
+         self._log("  - Configured 1st order kernel plot.")
 
          # Plot 2: The Second-Order Kernel (Synergy)
          ax2.plot(H_ab, label=f'H(i; a, b) - Synergy Term', color='red')
@@ -427,14 +606,14 @@ class McikLatticeSimulator:
          ax2.set_xlabel("Lattice Position ($i$)")
          ax2.set_ylabel("Synergistic Influence")
          ax2.legend()
-         print("  - Configured 2nd order kernel plot.")
+         self._log("  - Configured 2nd order kernel plot.")
 
          plt.tight_layout()
          if filename:
-              print(f"  - Saving kernel plot to {filename}")
+              self._log(f"  - Saving kernel plot to {filename}")
               fig.savefig(filename)
          if show:
-             print("  - Displaying kernel plot.")
+             self._log("  - Displaying kernel plot.")
              plt.show()
          else:
              plt.close(fig)
@@ -444,11 +623,11 @@ class McikLatticeSimulator:
     # --- Animation Methods ---
     # Keep these less verbose as they print per frame
 
-    def animate_1d_lattice(self, filename='lattice_1d_animation.gif', interval=100, y_min=None, y_max=None):
-        """Animates the evolution of a 1D lattice."""
-        print("\n--- Calling animate_1d_lattice ---")
+    def animate_1d_lattice(self, filename='lattice_1d_animation.gif', interval=100, y_min=None, y_max=None, max_frames=None):
+        """Animates the evolution of a 1D lattice. max_frames evenly subsamples time (see mcik.lod.frame_indices)."""
+        self._log("\n--- Calling animate_1d_lattice ---")
         if not self.is_1d:
-            print("  - Error: 1D animation is only available for 1D lattices.")
+            self._log("  - Error: 1D animation is only available for 1D lattices.")
             return
         if self.data_cube is None:
             raise RuntimeError("Simulation data not available. Run run_simulation() first.")
@@ -485,156 +664,158 @@ class McikLatticeSimulator:
             #     print(f"    Rendering 1D frame {frame+1}/{self.time_steps}")
             return line, time_text
 
-        ani = animation.FuncAnimation(fig, update, frames=self.time_steps,
+        from .lod import frame_indices
+        frames = frame_indices(self.data_cube.shape[-1], max_frames)
+        ani = animation.FuncAnimation(fig, update, frames=frames,
                                     init_func=init, blit=True, interval=interval)
-        print(f"  - Saving 1D animation to {filename} (may take a while)...")
+        self._log(f"  - Saving 1D animation ({len(frames)} frames) to {filename} (may take a while)...")
         ani.save(filename, writer='pillow', fps=15)
-        print("  - Save complete.")
+        self._log("  - Save complete.")
         plt.close(fig) # Close plot window automatically after saving
         return ani
 
 
-    def animate_2d_heatmap(self, filename='lattice_2d_heatmap_animation.gif', interval=100, vmin=None, vmax=None, cmap='viridis', type_labels=None):
-        """Animates the evolution of a 2D lattice as a heatmap."""
-        print("\n--- Calling animate_2d_heatmap ---")
+    def animate_2d_heatmap(self, filename='lattice_2d_heatmap_animation.gif', interval=100, vmin=None, vmax=None, cmap='viridis', type_labels=None,
+                           processes=None, chunk_size=8, max_frames=None):
+        """
+        Animates the evolution of a 2D lattice as a heatmap.
+        max_frames evenly subsamples time (see mcik.lod.frame_indices).
+
+        Set processes (e.g. os.cpu_count()) to render frame chunks on a process pool via
+        mcik.parallel_render; the GIF is written directly and None is returned instead of
+        the FuncAnimation.
+        """
+        self._log("\n--- Calling animate_2d_heatmap ---")
         if self.is_1d:
-            print("  - Error: 2D heatmap animation is only for 2D lattices.")
+            self._log("  - Error: 2D heatmap animation is only for 2D lattices.")
             return
         if self.data_cube is None:
             raise RuntimeError("Simulation data not available. Run run_simulation() first.")
 
-        fig, ax = plt.subplots(figsize=(10, 7))
-
-        # Determine color limits
-        if vmin is None: vmin = self.data_cube.min()
-        if vmax is None: vmax = self.data_cube.max()
-
-        # Get initial data and create image object
-        initial_data = self.data_cube[:, :, 0]
-        im = ax.imshow(initial_data.T, aspect='auto', cmap=cmap, origin='lower',
-                       vmin=vmin, vmax=vmax,
-                       extent=[-0.5, self.dimensions[0]-0.5, -0.5, self.dimensions[1]-0.5])
-
-        cbar = fig.colorbar(im, ax=ax)
-        cbar.set_label('State Value')
-
-        ax.set_xlabel("Dimension 1 (e.g., Zip Code)")
-        ax.set_ylabel("Dimension 2 (e.g., Home Type)")
-        if type_labels and len(type_labels) == self.dimensions[1]:
-             ax.set_yticks(ticks=np.arange(self.dimensions[1]), labels=type_labels)
-
-        ax.set_title("2D Lattice Evolution (Heatmap)")
-
-        time_text = ax.text(0.85, 0.95, '', transform=ax.transAxes, fontsize=12,
-                            bbox=dict(boxstyle='round', facecolor='white', alpha=0.7))
-
-        def init():
-            im.set_data(self.data_cube[:, :, 0].T)
-            time_text.set_text('')
-            return [im, time_text]
+        from .lod import frame_indices
+        if processes:
+            from .parallel_render import save_gif
+            self._log(f"  - Rendering 2D heatmap frames on {processes} processes to {filename}...")
+            save_gif('heatmap', self.data_cube, filename, fps=15, processes=processes, chunk_size=chunk_size,
+                     frames=frame_indices(self.data_cube.shape[-1], max_frames),
+                     vmin=vmin, vmax=vmax, cmap=cmap, type_labels=type_labels)
+            self._log("  - Save complete.")
+            return None
 
-        def update(frame):
-            current_data = self.data_cube[:, :, frame]
-            im.set_data(current_data.T)
-            time_text.set_text(f'Time: {frame}')
-            # Reduce print frequency
-            # if frame % (self.time_steps // 10) == 0:
-            #     print(f"    Rendering heatmap frame {frame+1}/{self.time_steps}")
-            return [im, time_text]
+        from .views import FIGSIZE, build_heatmap
+        fig = plt.figure(figsize=FIGSIZE['heatmap'])
+        update = build_heatmap(fig, self.data_cube, vmin=vmin, vmax=vmax, cmap=cmap, type_labels=type_labels)
 
-        ani = animation.FuncAnimation(fig, update, frames=self.time_steps,
-                                    init_func=init, blit=True, interval=interval)
-        print(f"  - Saving 2D heatmap animation to {filename} (may take a while)...")
+        frames = frame_indices(self.data_cube.shape[-1], max_frames)
+        ani = animation.FuncAnimation(fig, update, frames=frames, blit=True, interval=interval)
+        self._log(f"  - Saving 2D heatmap animation ({len(frames)} frames) to {filename} (may take a while)...")
         ani.save(filename, writer='pillow', fps=15)
-        print("  - Save complete.")
+        self._log("  - Save complete.")
         plt.close(fig)
         return ani
 
 
-    def animate_3d_bars(self, filename='lattice_3d_bars_animation.gif', interval=150, type_labels=None):
-        """Animates the evolution of a 2D lattice as 3D bars (towers)."""
-        print("\n--- Calling animate_3d_bars ---")
+    def animate_3d_bars(self, filename='lattice_3d_bars_animation.gif', interval=150, type_labels=None,
+                        processes=None, chunk_size=4, max_frames=None, max_bars=(40, 40)):
+        """
+        Animates the evolution of a 2D lattice as 3D bars (towers).
+
+        Lattices larger than max_bars = (rows, cols) are mean-pooled into that many towers,
+        and max_frames evenly subsamples time (see mcik.lod).
+
+        Set processes to render frame chunks on a process pool via mcik.parallel_render;
+        the GIF is written directly and None is returned instead of the FuncAnimation.
+        """
+        self._log("\n--- Calling animate_3d_bars ---")
         if self.is_1d:
-            print("  - Error: 3D bars animation is only for 2D lattices.")
+            self._log("  - Error: 3D bars animation is only for 2D lattices.")
             return
         if self.data_cube is None:
              raise RuntimeError("Simulation data not available. Run run_simulation() first.")
 
-        fig = plt.figure(figsize=(14, 10))
-        ax = fig.add_subplot(111, projection='3d')
-
-        # X, Y coordinates for bars (Dim1=cols(x), Dim0=rows(y))
-        x_pos, y_pos = np.meshgrid(np.arange(self.dimensions[1]), np.arange(self.dimensions[0]))
-        x_pos = x_pos.flatten()
-        y_pos = y_pos.flatten()
-        z_pos = np.zeros_like(x_pos)
-        dx = dy = 0.8 # Bar width/depth
-
-        # Setup colormap
-        vmin = self.data_cube.min()
-        vmax = self.data_cube.max()
-        # Adjust slightly to avoid pure white/black at extremes if needed
-        vmin -= abs(vmin)*0.01
-        vmax += abs(vmax)*0.01
-        norm = mcolors.Normalize(vmin=vmin, vmax=vmax)
-        cmap = plt.get_cmap('viridis')
-
-        time_text = ax.text2D(0.05, 0.95, '', transform=ax.transAxes, fontsize=14,
-                             bbox=dict(boxstyle='round', facecolor='white', alpha=0.7))
-
-        bars = None # Placeholder for bar container
-
-        def update(frame):
-            nonlocal bars
-            ax.clear()
-
-            data_slice = self.data_cube[:, :, frame].flatten()
-            colors = cmap(norm(data_slice))
-            
-            # Catch potential NaN or Inf values that break bar3d
-            if not np.all(np.isfinite(data_slice)):
-                 print(f"Warning: Non-finite values detected in data at frame {frame}. Clamping.")
-                 data_slice = np.nan_to_num(data_slice, nan=vmin, posinf=vmax, neginf=vmin)
-
-
-            bars = ax.bar3d(x_pos, y_pos, z_pos, dx, dy, data_slice, color=colors)
-
-            # --- Re-set labels and titles ---
-            ax.set_title(f"3D Lattice Evolution (Towers)", fontsize=16)
-            ax.set_xlabel("Dimension 2 (e.g., Home Type)")
-            ax.set_ylabel("Dimension 1 (e.g., Zip Code)")
-            ax.set_zlabel("State Value")
-
-            if type_labels and len(type_labels) == self.dimensions[1]:
-                 ax.set_xticks(np.arange(self.dimensions[1]))
-                 ax.set_xticklabels(type_labels, rotation=-15, ha='left', fontsize=8)
-
-            # Format Z-axis
-            ax.get_zaxis().set_major_formatter(
-                plt.FuncFormatter(lambda z, p: f'{z:.2f}') # Simple formatter
-            )
-
-            ax.view_init(elev=40, azim=-60)
-            ax.set_zlim(vmin, vmax) # Use calculated vmin/vmax
+        from .lod import frame_indices, lod_factors
+        frames = frame_indices(self.data_cube.shape[-1], max_frames)
+        factors = lod_factors(self.dimensions, max_bars)
+        if factors != (1, 1):
+            self._log(f"  - Level of detail: pooling {self.dimensions} lattice by {factors} for the towers")
+            type_labels = None # Labels no longer line up with pooled columns
+
+        if processes:
+            from .parallel_render import save_gif
+            self._log(f"  - Rendering 3D bars frames on {processes} processes to {filename}...")
+            save_gif('bars3d', self.data_cube, filename, fps=10, processes=processes, chunk_size=chunk_size,
+                     frames=frames, type_labels=type_labels, factors=factors)
+            self._log("  - Save complete.")
+            return None
 
-            time_text.set_text(f'Time: {frame}')
-            # Reduce print frequency
-            # if frame % (self.time_steps // 10) == 0:
-            #     print(f"    Rendering 3D frame {frame+1}/{self.time_steps}")
-            return fig,
+        from .views import FIGSIZE, build_bars3d
+        fig = plt.figure(figsize=FIGSIZE['bars3d'])
+        update = build_bars3d(fig, self.data_cube, type_labels=type_labels, factors=factors, log=self._log)
 
         ani = animation.FuncAnimation(
-             fig, update, frames=self.time_steps,
+             fig, update, frames=frames,
              interval=interval, blit=False
         )
 
-        print(f"  - Saving 3D bars animation to {filename} (will take several minutes)...")
+        self._log(f"  - Saving 3D bars animation to {filename} (will take several minutes)...")
         ani.save(filename, writer='pillow', fps=10) # Slower FPS for complex plots
-        print("  - Save complete.")
+        self._log("  - Save complete.")
         plt.close(fig)
         return ani
 
 
+    # --- Direct Frame Export (no matplotlib redraw) ---
+
+    def export_2d_heatmap(self, filename='lattice_2d_heatmap.gif', fps=15, vmin=None, vmax=None, cmap='viridis', scale=None, max_frames=None):
+        """
+        Fast counterpart of animate_2d_heatmap: encodes the cube straight to frames via a
+        colormap lookup table (see mcik.frames). No axes, labels or colorbar are drawn.
+
+        Args:
+            filename (str): '.gif' writes an animated GIF; a pattern containing '{' (e.g.
+                            'frames/heatmap_{:05d}.png') writes a PNG sequence.
+            fps (int): GIF frame rate.
+            vmin, vmax (float, optional): Colour limits. Default to the cube's min/max.
+            cmap (str): Matplotlib colormap name.
+            scale (int, optional): Integer pixel upscale. Defaults to roughly 256 px on the short side.
+            max_frames (int, optional): Evenly subsample time to this many frames.
+        """
+        self._log("\n--- Calling export_2d_heatmap ---")
+        if self.is_1d:
+            self._log("  - Error: 2D heatmap export is only for 2D lattices.")
+            return
+        if self.data_cube is None:
+            raise RuntimeError("Simulation data not available. Run run_simulation() first.")
+        from . import frames
+        from .lod import frame_indices
+        cube = self.data_cube
+        if max_frames is not None and max_frames < cube.shape[-1]:
+            cube = cube[..., frame_indices(cube.shape[-1], max_frames)]
+        if '{' in filename:
+            count = frames.write_png_sequence(cube, filename, vmin=vmin, vmax=vmax, cmap=cmap, scale=scale)
+            self._log(f"  - Wrote {count} PNG frames to {filename}")
+        else:
+            frames.write_gif(cube, filename, fps=fps, vmin=vmin, vmax=vmax, cmap=cmap, scale=scale)
+            self._log(f"  - Wrote {cube.shape[-1]}-frame GIF to {filename}")
+        return filename
+
+    def export_spacetime_heatmap(self, filename='spacetime_heatmap.png', vmin=None, vmax=None, cmap='viridis', scale=1):
+        """
+        Fast counterpart of plot_spacetime_heatmap (1D only): writes the (position, time) image
+        directly, position 0 at the bottom and time increasing to the right.
+        """
+        self._log("\n--- Calling export_spacetime_heatmap ---")
+        if not self.is_1d:
+            self._log("  - Error: Spacetime heatmap is only available for 1D lattices.")
+            return
+        if self.data_cube is None:
+            raise RuntimeError("Simulation data not available. Run run_simulation() first.")
+        from . import frames
+        frames.write_image(self.data_cube[::-1], filename, vmin=vmin, vmax=vmax, cmap=cmap, scale=scale)
+        self._log(f"  - Wrote spacetime image {self.data_cube.shape} to {filename}")
+        return filename
+
+
 # --- Example Update Rules ---
 
 def tanh_update_1d(g_t, alpha=1.0, beta=0.5):
@@ -0,0 +1,91 @@
+"""
+Level-of-detail helpers for plotting large lattice runs.
+
+Huge cubes are reduced before they reach matplotlib: space (and time, for the
+spacetime view) is block-pooled with min/max/mean down to the target pixel
+resolution, and animations keep only as many frames as the output fps budget
+allows. Cube inputs are read in time blocks, so memmapped arrays and
+mcik.archive.LazyCube work without loading everything.
+"""
+
+import math
+
+import numpy as np
+
+_POOLS = {"mean": np.nanmean, "min": np.nanmin, "max": np.nanmax}
+
+
+def lod_factors(shape, max_shape):
+    """Integer pooling factor per axis so that ceil(n / factor) <= max along every axis."""
+    return tuple(1 if m is None else max(1, math.ceil(n / m)) for n, m in zip(shape, max_shape))
+
+
+def block_reduce(a, factors, how="mean"):
+    """
+    Pools non-overlapping blocks of `a` with the given per-axis factors.
+
+    Edge blocks that are only partially filled are pooled over the elements they
+    contain. Missing trailing factors default to 1.
+    """
+    if how not in _POOLS:
+        raise ValueError(f"how must be one of {tuple(_POOLS)}")
+    a = np.asarray(a)
+    factors = tuple(factors) + (1,) * (a.ndim - len(factors))
+    if all(f == 1 for f in factors):
+        return a
+    a = a.astype(np.float64, copy=False)
+    pad = [(0, (-n) % f) for n, f in zip(a.shape, factors)]
+    if any(p for _, p in pad):
+        a = np.pad(a, pad, constant_values=np.nan)
+    shape = []
+    for n, f in zip(a.shape, factors):
+        shape += [n // f, f]
+    return _POOLS[how](a.reshape(shape), axis=tuple(range(1, 2 * a.ndim, 2)))
+
+
+def spacetime_lod(cube, max_shape=(2048, 2048), how="mean", block_steps=4096):
+    """
+    Reduces a 1D-lattice cube of shape (sites, time) to at most max_shape = (sites, steps).
+
+    The cube is read `block_steps` time steps at a time (rounded to whole pooling
+    blocks), so the peak memory is one block, not the whole cube.
+
+    Returns:
+        tuple: (reduced (np.ndarray), factors (tuple)).
+    """
+    factors = lod_factors(cube.shape, max_shape)
+    ft = factors[-1]
+    step = max(1, block_steps // ft) * ft
+    parts = [block_reduce(np.asarray(cube[:, t0:t0 + step]), factors, how)
+             for t0 in range(0, cube.shape[-1], step)]
+    return np.concatenate(parts, axis=-1), factors
+
+
+def frame_indices(n_steps, max_frames=None, fps=None, duration=None):
+    """
+    Time steps to render for an animation.
+
+    Args:
+        n_steps (int): Steps in the cube.
+        max_frames (int, optional): Frame budget.
+        fps, duration (float, optional): Alternative budget of fps * duration frames.
+
+    Returns:
+        list[int]: Evenly spaced, increasing step indices (first and last included).
+    """
+    budget = max_frames
+    if budget is None and fps is not None and duration is not None:
+        budget = int(fps * duration)
+    if budget is None or budget >= n_steps:
+        return list(range(n_steps))
+    budget = max(1, budget)
+    return np.unique(np.linspace(0, n_steps - 1, budget).round().astype(int)).tolist()
+
+
+def streamed_integral(cube, block_steps=1024):
+    """Temporal integral of a (possibly memmapped/lazy) cube, summed block by block."""
+    total = None
+    for t0 in range(0, cube.shape[-1], block_steps):
+        part = np.sum(np.asarray(cube[..., t0:t0 + block_steps]), axis=-1)
+        total = part if total is None else total + part
+    return total
@@ -0,0 +1,281 @@
+"""
+Enthalpy formulation of a phase-change material (PCM) lattice.
+
+Nodes carry specific enthalpy h, which maps piecewise to temperature T and
+liquid fraction (phase) for a material with specific heat c, melting point Tm
+and latent heat L:
+
+    solid   h < c*Tm          T = h / c          phase = 0
+    mushy   h < c*Tm + L      T = Tm             phase = (h - c*Tm) / L
+    liquid  otherwise         T = (h - L) / c    phase = 1
+
+The mapping is applied to whole arrays: np.select for NumPy arrays, tf.where
+for TensorFlow tensors and variables, so a lattice on a device is updated
+without copying it to the host. PCMEngine time-steps a lattice (diffusion
+stencil plus phase update), as one graph-compiled loop with TensorFlow or as
+the NumPy reference. TensorFlow is optional; without it only the NumPy backend
+is available. The step's Jacobian is tridiagonal and state-independent, so it
+is available analytically in banded (3, n) form, and multi-step influence
+columns come from batched forward-mode products instead of dense Jacobians.
+"""
+
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+try:
+    import tensorflow as tf
+except ImportError:  # optional backend
+    tf = None
+
+
+class PCMProperties:
+    def __init__(self, name: str, melting_point: float, latent_heat: float, specific_heat: float,
+                 thermal_conductivity: float, density: float):
+        self.name = name
+        self.melting_point = melting_point
+        self.latent_heat = latent_heat
+        self.specific_heat = specific_heat
+        self.thermal_conductivity = thermal_conductivity
+        self.density = density
+
+
+def enthalpy_to_state_np(h, melting_point: float, latent_heat: float,
+                         specific_heat: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(temperature, phase) arrays for an array of enthalpies (NumPy backend, keeps h's float dtype)."""
+    h = np.asarray(h)
+    if h.dtype.kind != "f":
+        h = h.astype(np.float64)
+    onset = specific_heat * melting_point
+    cond = [h < onset, h < onset + latent_heat]
+    temperature = np.select(cond, [h / specific_heat, np.full_like(h, melting_point)], (h - latent_heat) / specific_heat)
+    phase = np.select(cond, [np.zeros_like(h), (h - onset) / latent_heat], np.ones_like(h))
+    return temperature.astype(h.dtype, copy=False), phase.astype(h.dtype, copy=False)
+
+
+def enthalpy_to_state_tf(h, melting_point: float, latent_heat: float, specific_heat: float):
+    """(temperature, phase) tensors for a tensor or variable of enthalpies (TensorFlow backend, traceable)."""
+    if tf is None:
+        raise ImportError("enthalpy_to_state_tf requires TensorFlow")
+    h = tf.convert_to_tensor(h)
+    onset = specific_heat * melting_point
+    solid = h < onset
+    mushy = h < onset + latent_heat
+    temperature = tf.where(solid, h / specific_heat,
+                           tf.where(mushy, tf.fill(tf.shape(h), tf.cast(melting_point, h.dtype)),
+                                    (h - latent_heat) / specific_heat))
+    phase = tf.where(solid, tf.zeros_like(h), tf.where(mushy, (h - onset) / latent_heat, tf.ones_like(h)))
+    return temperature, phase
+
+
+def is_tf_tensor(x) -> bool:
+    return tf is not None and (isinstance(x, tf.Variable) or tf.is_tensor(x))
+
+
+def enthalpy_to_state(h, pcm: PCMProperties):
+    """
+    Temperature and phase of every node; dispatches on the type of `h`.
+
+    TensorFlow tensors/variables stay on their device (tf.where), anything else
+    goes through the NumPy backend (np.select).
+    """
+    backend = enthalpy_to_state_tf if is_tf_tensor(h) else enthalpy_to_state_np
+    return backend(h, pcm.melting_point, pcm.latent_heat, pcm.specific_heat)
+
+
+def heat_flow_step_np(h: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+    """One step of the 3-point enthalpy stencil alpha*h[i] + beta*(h[i-1] + h[i+1]), edges replicated."""
+    padded = np.concatenate((h[:1], h, h[-1:]))
+    return (alpha * h + beta * (padded[:-2] + padded[2:])).astype(h.dtype, copy=False)
+
+
+def heat_flow_step_tf(h, alpha: float, beta: float):
+    """TensorFlow version of heat_flow_step_np."""
+    padded = tf.concat([h[:1], h, h[-1:]], axis=0)
+    return alpha * h + beta * (padded[:-2] + padded[2:])
+
+
+class PCMRun(NamedTuple):
+    """
+    Result of PCMEngine.run (NumPy arrays, or tensors from the TensorFlow backend).
+
+    enthalpy, temperature, phase: (n,) state after the last step.
+    integral: (n,) sum over steps of the temperature after each step (temporal integral).
+    history:  (steps // stride, n) enthalpy after every `stride`-th step; (0, n) without a stride.
+    """
+    enthalpy: object
+    temperature: object
+    phase: object
+    integral: object
+    history: object
+
+
+class PCMEngine:
+    """
+    Runs T steps of enthalpy diffusion plus the phase update.
+
+    The stencil is the experiment's MCIK kernel: alpha = conductivity,
+    beta = conductivity / 2. With the TensorFlow backend the whole run is one
+    tf.function (tf.while_loop, history in a TensorArray), optionally compiled
+    with XLA. steps and stride are passed as tensors, so it is traced once per
+    (number of history states, shape, dtype): runs with stride=0 share one trace
+    whatever their length. The NumPy backend is the reference: same operations
+    in the same order.
+
+    Args:
+        pcm: Material properties.
+        backend: "tf", "numpy" or "auto" (TensorFlow when installed).
+        jit_compile: Compile the TensorFlow run() loop with XLA.
+    """
+
+    def __init__(self, pcm: PCMProperties, backend: str = "auto", jit_compile: bool = False):
+        if backend == "auto":
+            backend = "tf" if tf is not None else "numpy"
+        if backend not in ("tf", "numpy"):
+            raise ValueError("backend must be 'tf', 'numpy' or 'auto'")
+        if backend == "tf" and tf is None:
+            raise ImportError("the 'tf' backend requires TensorFlow")
+        self.pcm = pcm
+        self.backend = backend
+        self.alpha = pcm.thermal_conductivity
+        self.beta = 0.5 * pcm.thermal_conductivity
+        self._run_tf = tf.function(self._loop_tf, jit_compile=jit_compile) if backend == "tf" else None
+        # Not XLA-compiled: forward mode through tf.while_loop accumulates into tensor lists XLA cannot size
+        self._jvp_run_tf = tf.function(self._jvp_tf) if backend == "tf" else None
+
+    def _state(self, h):
+        fn = enthalpy_to_state_tf if self.backend == "tf" else enthalpy_to_state_np
+        return fn(h, self.pcm.melting_point, self.pcm.latent_heat, self.pcm.specific_heat)
+
+    def run(self, enthalpy, steps: int, stride: int = 0) -> PCMRun:
+        """Advances `enthalpy` (n,) by `steps` steps, keeping every `stride`-th state (0 keeps none)."""
+        if steps < 0 or stride < 0:
+            raise ValueError("steps and stride must be non-negative")
+        if self.backend == "tf":
+            # Only the history length has to be static (TensorArray size under XLA)
+            n_hist = steps // stride if stride > 0 else 0
+            return PCMRun(*self._run_tf(tf.convert_to_tensor(enthalpy), tf.constant(steps, tf.int32),
+                                        tf.constant(stride, tf.int32), int(n_hist)))
+        return self._loop_np(np.asarray(enthalpy), steps, stride)
+
+    def jacobian_banded(self, n: int, dtype=np.float64) -> np.ndarray:
+        """
+        (3, n) banded Jacobian of one step (see step_jacobian_banded). The step is linear
+        in enthalpy and the phase update does not feed back into it, so this holds at
+        every state.
+        """
+        return step_jacobian_banded(n, self.alpha, self.beta, dtype)
+
+    def jvp(self, enthalpy, tangents, steps: int):
+        """
+        Forward-mode derivative of `steps` steps: (enthalpy after the steps, J^steps @ tangents).
+
+        `tangents` is (n,) or a batch (n, b) of perturbation directions. The NumPy
+        backend pushes them through the banded step Jacobian; the TensorFlow backend
+        runs the steps under tf.autodiff.ForwardAccumulator with the batch as columns,
+        as one tf.function (steps passed as a tensor, so it is traced once per tangent
+        shape and dtype; never XLA-compiled). Each step costs O(n * b) either way.
+        """
+        if steps < 0:
+            raise ValueError("steps must be non-negative")
+        if self.backend == "tf":
+            return self._jvp_run_tf(tf.convert_to_tensor(enthalpy), tf.convert_to_tensor(tangents),
+                                    tf.constant(steps, tf.int32))
+        h = np.asarray(enthalpy)
+        if h.dtype.kind != "f":
+            h = h.astype(np.float64)
+        v = np.asarray(tangents, dtype=h.dtype)
+        ab = self.jacobian_banded(h.shape[0], h.dtype)
+        for _ in range(steps):
+            h = heat_flow_step_np(h, self.alpha, self.beta)
+            v = banded_matmul(ab, v)
+        return h, v
+
+    def _jvp_tf(self, h, v, steps):
+        v = tf.cast(v, h.dtype)
+        alpha, beta = self.alpha, self.beta
+        # One primal column per tangent column (the stencil acts on axis 0 only). The
+        # unbatched state is advanced alongside, so an empty batch still returns it.
+        primal = tf.broadcast_to(tf.reshape(h, (-1,) + (1,) * (len(v.shape) - 1)), tf.shape(v))
+        with tf.autodiff.ForwardAccumulator(primal, v) as acc:
+            def body(t, h, out):
+                return t + 1, heat_flow_step_tf(h, alpha, beta), heat_flow_step_tf(out, alpha, beta)
+            _, h, out = tf.while_loop(lambda t, *_: t < steps, body, (tf.constant(0), h, primal))
+        return h, acc.jvp(out, unconnected_gradients=tf.UnconnectedGradients.ZERO)
+
+    def influence_columns(self, n: int, nodes, steps: int):
+        """
+        Columns K^(steps)[:, nodes] of the multi-step influence kernel (the Jacobian of
+        `steps` steps), from one batched JVP with a unit tangent per node: (n, len(nodes)).
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        basis = np.zeros((n, nodes.size))
+        basis[nodes, np.arange(nodes.size)] = 1.0
+        return self.jvp(np.zeros(n), basis, steps)[1]
+
+    def _loop_np(self, h: np.ndarray, steps: int, stride: int) -> PCMRun:
+        if h.dtype.kind != "f":
+            h = h.astype(np.float64)
+        n_hist = steps // stride if stride > 0 else 0
+        history = np.empty((n_hist,) + h.shape, dtype=h.dtype)
+        integral = np.zeros_like(h)
+        for t in range(steps):
+            h = heat_flow_step_np(h, self.alpha, self.beta)
+            integral = integral + self._state(h)[0]
+            if stride > 0 and (t + 1) % stride == 0:
+                history[(t + 1) // stride - 1] = h
+        temperature, phase = self._state(h)
+        return PCMRun(h, temperature, phase, integral, history)
+
+    def _loop_tf(self, h, steps, stride, n_hist: int):
+        alpha, beta = self.alpha, self.beta
+
+        def advance(h, integral, n):
+            def body(t, h, integral):
+                h = heat_flow_step_tf(h, alpha, beta)
+                return t + 1, h, integral + self._state(h)[0]
+            _, h, integral = tf.while_loop(lambda t, *_: t < n, body, (tf.constant(0), h, integral))
+            return h, integral
+
+        integral = tf.zeros_like(h)
+        history = tf.TensorArray(h.dtype, size=n_hist, element_shape=h.shape)
+        if n_hist:
+            def chunk(i, h, integral, history):
+                h, integral = advance(h, integral, stride)
+                return i + 1, h, integral, history.write(i, h)
+            _, h, integral, history = tf.while_loop(lambda i, *_: i < n_hist, chunk,
+                                                    (tf.constant(0), h, integral, history))
+        h, integral = advance(h, integral, steps - n_hist * stride)
+        temperature, phase = self._state(h)
+        return h, temperature, phase, integral, history.stack()
+
+
+def step_jacobian_banded(n: int, alpha: float, beta: float, dtype=np.float64) -> np.ndarray:
+    """
+    Jacobian of heat_flow_step in (3, n) diagonal-ordered form (as scipy.linalg.solve_banded):
+    row 0 the superdiagonal (ab[0, j] = J[j-1, j]), row 1 the diagonal, row 2 the subdiagonal
+    (ab[2, j] = J[j+1, j]); the unused corners are 0. Edge replication adds beta to the end
+    diagonals (2*beta when n == 1).
+    """
+    ab = np.zeros((3, n), dtype=dtype)
+    ab[0, 1:] = beta
+    ab[1] = alpha
+    ab[2, :-1] = beta
+    if n:
+        ab[1, 0] += beta
+        ab[1, -1] += beta
+    return ab
+
+
+def banded_to_dense(ab: np.ndarray) -> np.ndarray:
+    """The (n, n) matrix of a (3, n) tridiagonal band from step_jacobian_banded."""
+    return np.diag(ab[1]) + np.diag(ab[0, 1:], 1) + np.diag(ab[2, :-1], -1)
+
+
+def banded_matmul(ab: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """J @ v for a (3, n) tridiagonal band and v of shape (n,) or (n, batch), in O(n * batch)."""
+    d = ab.reshape((3, -1) + (1,) * (v.ndim - 1))
+    out = d[1] * v
+    out[:-1] += d[0, 1:] * v[1:]
+    out[1:] += d[2, :-1] * v[:-1]
+    return out
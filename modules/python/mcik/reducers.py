@@ -0,0 +1,45 @@
+"""
+Streaming reducers over the time axis of a simulation.
+
+Reducers registered on McikLatticeSimulator.add_reducer are fed blocks of frames
+(shape (*dimensions, n)) as the run progresses, so summaries stay current across
+extend() calls and remain available when the full cube is not kept in memory.
+"""
+
+import numpy as np
+
+
+class TemporalIntegral:
+    """Running sum over time for each lattice point (the MCIK temporal integral)."""
+
+    def __init__(self):
+        self.value = None
+
+    def reset(self):
+        self.value = None
+
+    def update(self, frames):
+        block = np.sum(frames, axis=-1)
+        self.value = block if self.value is None else self.value + block
+
+    def result(self):
+        return self.value
+
+
+class Extrema:
+    """Running global min/max, e.g. for fixed colour limits across an extended run."""
+
+    def __init__(self):
+        self.min = None
+        self.max = None
+
+    def reset(self):
+        self.min = self.max = None
+
+    def update(self, frames):
+        lo, hi = float(np.min(frames)), float(np.max(frames))
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def result(self):
+        return self.min, self.max
@@ -0,0 +1,151 @@
+"""
+Process-pool sweeps of McikLatticeSimulator over parameter and poke grids.
+
+Each worker process builds one quiet simulator in its initializer and reuses it
+for every scenario it is handed. The shared base initial state and the per-scenario
+results live in `multiprocessing.shared_memory` blocks, so only small scenario
+descriptions and result indices cross the process boundary.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ._shm import attach, release, shared_array
+from .lattice import McikLatticeSimulator
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One sweep point: update-rule parameter overrides plus the pokes applied at t=0."""
+    update_params: dict = field(default_factory=dict)
+    pokes: dict = field(default_factory=dict)
+
+
+def grid_scenarios(poke_sites=(), poke_values=(1.0,), **param_grid):
+    """
+    Builds the cartesian product of update-rule parameters and single pokes.
+
+    Args:
+        poke_sites (iterable): Poke positions, (index,) for 1D or (row, col) for 2D.
+                               Empty means one unpoked scenario per parameter combination.
+        poke_values (iterable): Poke magnitudes tried at every site.
+        **param_grid: Update-rule parameter name -> iterable of values (e.g., alpha=[0.8, 1.0]).
+
+    Returns:
+        list[Scenario]: Scenarios ordered parameters-major, then site, then value.
+    """
+    names = list(param_grid)
+    pokes = [{}]
+    if poke_sites:
+        pokes = [
+            {site if isinstance(site, tuple) else (site,): value}
+            for site, value in itertools.product(poke_sites, poke_values)
+        ]
+    scenarios = []
+    for values in itertools.product(*(param_grid[n] for n in names)):
+        for poke in pokes:
+            scenarios.append(Scenario(update_params=dict(zip(names, values)), pokes=poke))
+    return scenarios
+
+
+# --- Worker side ---
+
+_worker = {}
+
+
+def _init_worker(dimensions, time_steps, update_rule_func, update_params, reduce,
+                 state_name, result_name, result_shape, dtype):
+    init_shm = attach(state_name)
+    result_shm = attach(result_name)
+    _worker["sim"] = McikLatticeSimulator(
+        dimensions, time_steps, update_rule_func, verbose=False, **update_params
+    )
+    _worker["base_params"] = dict(update_params)
+    _worker["reduce"] = reduce
+    _worker["shms"] = (init_shm, result_shm)  # Keep the blocks mapped for the worker's lifetime
+    _worker["initial_state"] = np.ndarray(dimensions, dtype=dtype, buffer=init_shm.buf)
+    _worker["results"] = np.ndarray(result_shape, dtype=dtype, buffer=result_shm.buf)
+
+
+def _run_chunk(chunk):
+    """Runs (index, scenario) pairs and writes each reduced result into shared memory."""
+    sim = _worker["sim"]
+    results = _worker["results"]
+    for index, scenario in chunk:
+        sim.update_params = {**_worker["base_params"], **scenario.update_params}
+        sim.set_initial_state(_worker["initial_state"], pokes=scenario.pokes)
+        cube = sim.run_simulation()
+        if _worker["reduce"] == "integral":
+            results[index] = np.sum(cube, axis=-1)
+        else:
+            results[index] = cube[..., -1]
+        sim.data_cube = None
+    return [index for index, _ in chunk]
+
+
+# --- Public API ---
+
+def sweep(dimensions, time_steps, update_rule_func, scenarios, initial_state=None,
+          update_params=None, reduce="integral", max_workers=None, chunksize=1,
+          ordered=True):
+    """
+    Runs every scenario on a process pool and yields the reduced results.
+
+    update_rule_func must be picklable (a module-level function), since each worker
+    constructs its own McikLatticeSimulator from it.
+
+    Args:
+        dimensions (tuple): Lattice shape, as for McikLatticeSimulator.
+        time_steps (int): Steps per run.
+        update_rule_func (callable): Update rule shared by all scenarios.
+        scenarios (iterable[Scenario]): Sweep points, e.g. from grid_scenarios().
+        initial_state (np.ndarray, optional): Base state before pokes. Defaults to zeros.
+        update_params (dict, optional): Base update-rule parameters that scenarios override.
+        reduce (str): 'integral' (temporal integral, as used for kernels) or 'final' (last frame).
+        max_workers (int, optional): Pool size. Defaults to the executor's default.
+        chunksize (int): Scenarios handed to a worker per task.
+        ordered (bool): Yield in scenario order (True) or in completion order (False).
+
+    Yields:
+        tuple: (index, scenario, result) where result is an array of shape `dimensions`.
+    """
+    if reduce not in ("integral", "final"):
+        raise ValueError("reduce must be 'integral' or 'final'")
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    scenarios = list(scenarios)
+    if initial_state is None:
+        initial_state = np.zeros(dimensions)
+    elif initial_state.shape != dimensions:
+        raise ValueError(f"initial_state shape {initial_state.shape} must match dimensions {dimensions}")
+
+    dtype = np.float64
+    result_shape = (len(scenarios),) + tuple(dimensions)
+    state_shm = shared_array(dimensions, dtype, fill=initial_state)[0]
+    result_shm, results = shared_array(result_shape, dtype)
+    indexed = list(enumerate(scenarios))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(dimensions, time_steps, update_rule_func, update_params or {}, reduce,
+                      state_shm.name, result_shm.name, result_shape, dtype),
+        ) as pool:
+            futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+            done = futures if ordered else as_completed(futures)
+            for future in done:
+                for index in future.result():
+                    yield index, scenarios[index], results[index].copy()
+    finally:
+        del results
+        release(state_shm, result_shm)
+
+
+def sweep_array(*args, **kwargs):
+    """Runs sweep() to completion and stacks the results into one (n_scenarios, *dimensions) array."""
+    kwargs["ordered"] = True
+    return np.stack([result for _, _, result in sweep(*args, **kwargs)])
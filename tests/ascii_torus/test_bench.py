@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+from mcik.experiments.ascii_torus import Params
+from mcik.experiments.ascii_torus.bench import bench, bench_run, confidence_interval
+
+START = Params(1.0, 1, 1.0, 0.0, 10)
+
+
+def test_confidence_interval():
+    mean, half = confidence_interval([1.0, 2.0, 3.0, 4.0])
+    assert mean == 2.5
+    assert half == pytest.approx(3.182 * np.std([1, 2, 3, 4], ddof=1) / 2)
+    assert confidence_interval([5.0])[0] == 5.0 and math.isnan(confidence_interval([5.0])[1])
+
+
+def test_runs_follow_fixed_schedule():
+    a = bench_run("off", START, 8, warmup=2)
+    b = bench_run("off", START, 8, warmup=2)
+    assert a["frame"].tolist() == list(range(8))
+    # Rendering is deterministic: only the timings differ between runs
+    for key in ("quality", "sim", "scale", "spp", "gamma", "ramp", "ns"):
+        np.testing.assert_array_equal(a[key], b[key])
+    assert np.all(a["ms"] > 0) and np.all(a["frame_ms"] >= a["ms"])
+
+
+def test_bench_rows_extend_bench_csv_schema():
+    rows = bench(["off", "K"], START, 11, runs=2, warmup=1, ctrl_interval=5, sim_every=1)
+    assert [r["mode"] for r in rows] == ["off", "K"]
+    for r in rows:
+        assert r["runs"] == 2 and r["frames"] == 11
+        assert r["avg_fps"] > 0 and 0.0 <= r["avg_sim"] <= 1.0
+        assert r["fps_ci"] >= 0 and r["q_ci"] >= 0
+    # Without a controller the frames (and so quality) are identical across runs
+    assert rows[0]["q_ci"] == 0.0
+
+
+def test_similarity_is_opt_in_and_sampled():
+    from mcik.experiments.ascii_torus.framelog import summarize
+
+    assert np.isnan(bench_run("off", START, 4, warmup=1)["sim"]).all()
+    cols = bench_run("off", START, 7, warmup=1, sim_every=3)
+    measured = ~np.isnan(cols["sim"])
+    assert measured.tolist() == [i % 3 == 0 for i in range(7)]
+    assert summarize(cols)[0]["avg_sim"] == pytest.approx(cols["sim"][measured].mean())
+
+
+def test_bench_rejects_empty_runs():
+    with pytest.raises(ValueError, match="frames and runs"):
+        bench(["off"], START, 0)
+    with pytest.raises(ValueError, match="frames and runs"):
+        bench(["off"], START, 5, runs=0)
@@ -0,0 +1,152 @@
+from dataclasses import astuple
+
+import numpy as np
+import pytest
+
+from mcik.experiments.ascii_torus.controller import EvalMemo, Params, make_planner, suggest_step
+
+
+def _score(p):
+    # Smooth, distinct-valued objective with an optimum inside the bounds
+    return -((p.resolution_scale - 0.7) ** 2 + 0.01 * (p.samples_per_pixel - 2) ** 2
+             + (p.gamma - 1.4) ** 2 + (p.normal_smooth - 0.3) ** 2 + 0.001 * (p.ramp_size - 12) ** 2)
+
+
+def test_kh_step_evaluates_each_unique_candidate_once():
+    calls = []
+    memo = EvalMemo(lambda p: calls.append(astuple(p)) or _score(p))
+    p, tag = suggest_step(Params(0.6, 2, 1.2, 0.2, 10), memo, True)
+    assert tag == "K+H"
+    assert len(calls) == len(set(calls)) == memo.misses == 14
+    # The ten K-probe direction reads, best_p, the shared s0 and the six single-parameter
+    # pair probes come from the memo
+    assert memo.hits == 18
+
+
+def test_memo_collapses_clamped_candidates():
+    memo = EvalMemo(_score)
+    suggest_step(Params(0.25, 1, 0.5, 0.0, 8), memo, False)
+    # Every "minus" probe clamps back onto the current point
+    assert memo.misses == 6
+    assert memo.hits == 5
+
+
+def test_executor_step_matches_serial():
+    from concurrent.futures import ThreadPoolExecutor
+
+    start = Params(0.6, 2, 1.2, 0.2, 10)
+    for use_h in (False, True):
+        serial = EvalMemo(_score)
+        expected = suggest_step(start, serial, use_h)
+        with ThreadPoolExecutor(4) as pool:
+            parallel = EvalMemo(_score)
+            assert suggest_step(start, parallel, use_h, executor=pool, isolate_timing=True) == expected
+        assert parallel.misses == serial.misses
+        assert parallel.scores == serial.scores
+
+
+def test_isolated_timing_clock():
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mcik.experiments.ascii_torus.timing import timing_clock
+
+    clocks = []
+    with ThreadPoolExecutor(2) as pool:
+        memo = EvalMemo(lambda p: clocks.append(timing_clock()) or _score(p))
+        suggest_step(Params(0.6, 2, 1.2, 0.2, 10), memo, False, executor=pool, isolate_timing=True)
+    assert clocks and all(c is time.thread_time for c in clocks)
+    assert timing_clock() is time.perf_counter
+
+
+def test_spsa_two_evaluations_per_step_and_converges():
+    from mcik.experiments.ascii_torus.controller import SPSA
+
+    for second_order, per_step in ((False, 2), (True, 4)):
+        spsa = SPSA(second_order=second_order, seed=1)
+        p = Params(0.3, 1, 2.5, 0.9, 8)
+        start = _score(p)
+        for _ in range(30):
+            memo = EvalMemo(_score)
+            p, tag = spsa.step(p, memo)
+            assert memo.misses <= per_step
+        assert tag == ("SPSA2" if second_order else "SPSA")
+        assert _score(p) > start + 0.3
+        # Same seed, same trajectory
+        again = SPSA(second_order=second_order, seed=1)
+        q = Params(0.3, 1, 2.5, 0.9, 8)
+        for _ in range(30):
+            q, _ = again.step(q, _score)
+        assert q == p
+
+
+def test_surrogate_stops_probing_once_fitted():
+    from mcik.experiments.ascii_torus.controller import SurrogateController, run_plan
+
+    model = SurrogateController(seed=0)
+    p = Params(0.3, 1, 2.5, 0.9, 8)
+    renders = []
+    for _ in range(30):
+        memo = EvalMemo(_score)
+        p, tag = run_plan(model(p, memo), memo)
+        renders.append(memo.misses)
+        for _ in range(5):
+            model.observe(p, _score(p))
+    assert tag == "model"
+    assert sum(renders[:3]) > 0
+    assert sum(renders[-10:]) == 0
+    assert _score(p) > _score(Params(0.3, 1, 2.5, 0.9, 8)) + 0.3
+    K, H = model.kernels(p)
+    assert K.shape == (5,) and H.shape == (5, 5)
+    assert (H == H.T).all()
+
+
+def test_kh_pair_bandit_spreads_and_focuses_probes():
+    from mcik.experiments.ascii_torus.controller import PairBandit, suggest_step_KH
+
+    def synergistic(p):
+        # gamma and ramp_size only pay off together
+        return _score(p) + 0.05 * (p.gamma - 1.2) * (p.ramp_size - 10)
+
+    bandit = PairBandit()
+    p = Params(0.6, 2, 1.2, 0.2, 10)
+    for _ in range(12):
+        suggest_step_KH(p, synergistic, bandit=bandit)
+    assert all(n > 0 for n in bandit.counts.values())  # every C(5, 2) pair was tried
+    top = max(bandit.pairs, key=lambda pair: bandit.counts[pair])
+    assert top == ("gamma", "ramp_size")
+
+
+def test_kh_eval_budget():
+    memo = EvalMemo(_score)
+    from mcik.experiments.ascii_torus.controller import suggest_step_KH
+
+    suggest_step_KH(Params(0.6, 2, 1.2, 0.2, 10), memo, eval_budget=12)
+    assert memo.misses == 12
+
+    with pytest.raises(ValueError, match="eval_budget"):
+        suggest_step_KH(Params(0.6, 2, 1.2, 0.2, 10), EvalMemo(_score), eval_budget=10)
+    with pytest.raises(ValueError, match="eval_budget"):
+        make_planner("KH", eval_budget=5)
+
+
+def test_surrogate_keeps_frame_scores_out_of_the_probe_fit():
+    import random
+
+    from mcik.experiments.ascii_torus.controller import SurrogateController, run_plan
+
+    model = SurrogateController(seed=0)
+    p = Params(0.3, 1, 2.5, 0.9, 8)
+    for _ in range(10):
+        memo = EvalMemo(_score)
+        p, _ = run_plan(model(p, memo), memo)
+    assert not model.needs_probe
+    K, H = model.kernels(p)
+    rng = random.Random(1)
+    for _ in range(40):  # frame-loop scores on another scale, and noisy
+        q = Params(rng.uniform(0.25, 1.0), rng.randint(1, 4), rng.uniform(0.5, 3.0), rng.random(), rng.randint(8, 16))
+        model.observe(q, 100.0 * _score(q) + rng.gauss(0.0, 1.0))
+    K2, H2 = model.kernels(p)
+    np.testing.assert_array_equal(K2, K)
+    np.testing.assert_array_equal(H2, H)
+    assert model.needs_probe  # the live scores no longer follow their model: re-probe
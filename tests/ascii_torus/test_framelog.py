@@ -0,0 +1,70 @@
+import csv
+
+import numpy as np
+import pytest
+
+from mcik.experiments.ascii_torus.framelog import (BENCH_COLUMNS, FrameLog, load_frames, summarize,
+                                                   write_summary)
+
+
+def _rows(n):
+    rng = np.random.default_rng(3)
+    for i in range(n):
+        mode = "off" if i < n // 2 else "KH"
+        yield (i, rng.uniform(1, 5), rng.uniform(100, 400), rng.uniform(0, 0.1), 1.0, 1, 1.0, 10, mode,
+               rng.uniform(2, 8), 0.0, "sync", 200, rng.uniform(0.9, 1.0), 0.0)
+
+
+def test_csv_written_in_blocks(tmp_path):
+    path = str(tmp_path / "log.csv")
+    log = FrameLog(path, block=8)
+    rows = list(_rows(21))
+    for row in rows[:7]:
+        log.append(*row)
+    with open(path) as f:
+        assert len(f.readlines()) == 1  # header only until the block fills
+    for row in rows[7:]:
+        log.append(*row)
+    log.close()
+    with open(path, newline="") as f:
+        back = list(csv.reader(f))
+    assert len(back) == 22
+    assert back[1][8] == "off" and float(back[21][1]) == rows[20][1]
+
+
+def test_npz_matches_csv_and_summary(tmp_path):
+    cols = {}
+    for name in ("log.csv", "log.npz"):
+        with FrameLog(str(tmp_path / name), block=5) as log:
+            for row in _rows(40):
+                log.append(*row)
+        cols[name] = load_frames(str(tmp_path / name))
+    for key, a in cols["log.npz"].items():
+        np.testing.assert_array_equal(a, cols["log.csv"][key])
+
+    rows = summarize(cols["log.npz"])
+    assert [r["mode"] for r in rows] == ["off", "KH"]
+    off = cols["log.npz"]["controller"] == "off"
+    ms = cols["log.npz"]["frame_ms"][off]
+    assert rows[0]["frames"] == 20
+    assert rows[0]["mean_ms"] == pytest.approx(ms.mean())
+    assert rows[0]["p95_ms"] == pytest.approx(np.percentile(ms, 95))
+    assert rows[0]["avg_sim"] == pytest.approx(cols["log.npz"]["sim"][off].mean())
+
+    bench = str(tmp_path / "bench.csv")
+    write_summary(rows, bench, BENCH_COLUMNS)
+    with open(bench, newline="") as f:
+        back = list(csv.reader(f))
+    assert back[0] == list(BENCH_COLUMNS) and back[2][0] == "KH"
+
+
+def test_rejects_wrong_value_count_and_empty_block():
+    log = FrameLog()
+    row = next(_rows(1))
+    with pytest.raises(ValueError, match="expected 15 values"):
+        log.append(*row[:-1])
+    with pytest.raises(ValueError, match="expected 15 values"):
+        log.append(*row, 0.0)
+    assert log.rows == 0
+    with pytest.raises(ValueError, match="block"):
+        FrameLog(block=0)
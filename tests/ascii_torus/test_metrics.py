@@ -1,5 +1,7 @@
+import random
+
 import pytest
-from mcik.experiments.ascii_torus.metrics import estimate_ascii_quality
+from mcik.experiments.ascii_torus.metrics import char_density, estimate_ascii_quality, estimate_ascii_similarity
 
 def test_ascii_quality_deterministic():
     w, h = 8, 4
@@ -9,3 +11,35 @@ def test_ascii_quality_deterministic():
     q1 = estimate_ascii_quality(buf, w, h)
     q2 = estimate_ascii_quality(buf, w, h)
     assert q1 == pytest.approx(q2)
+
+
+def _reference_quality(buf, w, h):
+    # Original per-pixel loop, kept to pin the vectorized implementation
+    if w < 3 or h < 3:
+        return 0.0
+    acc = 0.0
+    cnt = 0
+    for y in range(1, h - 1):
+        for x in range(1, w - 1):
+            off = y * w + x
+            gx = 0.5 * (char_density(buf[off + 1]) - char_density(buf[off - 1]))
+            gy = 0.5 * (char_density(buf[off + w]) - char_density(buf[off - w]))
+            acc += (gx * gx + gy * gy) ** 0.5
+            cnt += 1
+    return max(0.0, min(1.0, acc / cnt))
+
+
+def test_ascii_quality_matches_reference_loop():
+    rng = random.Random(7)
+    chars = " .:-=+*#%@abcXYZ~é█"
+    for w, h in [(3, 3), (80, 24), (17, 9)]:
+        buf = [rng.choice(chars) for _ in range(w * h)]
+        assert estimate_ascii_quality(buf, w, h) == _reference_quality(buf, w, h)
+        assert estimate_ascii_quality("".join(buf), w, h) == _reference_quality(buf, w, h)
+
+
+def test_ascii_similarity():
+    buf = list(" .:-=+*#%@")
+    assert estimate_ascii_similarity(buf, buf, 5, 2) == 1.0
+    assert estimate_ascii_similarity(buf, [" "] * 10, 5, 2) == pytest.approx(1.0 - sum((i / 9) ** 2 for i in range(10)) / 10)
+    assert estimate_ascii_similarity(buf, buf[:8], 5, 2) == 0.0
@@ -0,0 +1,76 @@
+import io
+import re
+
+from mcik.experiments.ascii_torus import build_ramp, render_frame
+from mcik.experiments.ascii_torus.present import FramePresenter
+
+_TOKEN = re.compile(r"\x1b\[2J|\x1b\[(\d+);(\d+)H|\x1b\[H|\x1b\[K|\n|[^\x1b\n]")
+
+
+class _Screen:
+    """Minimal terminal: clear, cursor positioning, erase to end of line, newline and text."""
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.cells = [[" "] * cols for _ in range(rows)]
+        self.y = self.x = 0
+
+    def feed(self, data):
+        for m in _TOKEN.finditer(data):
+            tok = m.group(0)
+            if tok == "\x1b[2J":
+                self.cells = [[" "] * self.cols for _ in range(self.rows)]
+            elif tok == "\x1b[H":
+                self.y = self.x = 0
+            elif m.group(1):
+                self.y, self.x = int(m.group(1)) - 1, int(m.group(2)) - 1
+            elif tok == "\x1b[K":
+                self.cells[self.y][self.x:] = [" "] * (self.cols - self.x)
+            elif tok == "\n":
+                self.y, self.x = self.y + 1, 0
+            else:
+                self.cells[self.y][self.x] = tok
+                self.x += 1
+
+    def lines(self, start, count, width):
+        return ["".join(row[:width]) for row in self.cells[start:start + count]]
+
+
+class _Stream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+def test_presenter_reproduces_frames_with_fewer_bytes():
+    w, h = 80, 24
+    ramp = build_ramp(10)
+    stream = _Stream()
+    screen = _Screen(h + 2, w + 10)
+    presenter = FramePresenter(stream)
+    sizes = []
+    for i in range(12):
+        buf = render_frame(w, h, 0.05 * i, 0.03 * i, 1.0, ramp)
+        hud = f"frame {i}"
+        before = stream.tell()
+        sizes.append(presenter.present(buf, w, h, hud))
+        screen.feed(stream.getvalue()[before:])
+        assert screen.lines(0, 1, len(hud)) == [hud]
+        assert screen.lines(1, h, w) == ["".join(buf[y * w:(y + 1) * w]) for y in range(h)]
+    assert stream.writes == 12  # one write per frame
+    assert max(sizes[1:]) < sizes[0] // 2
+    assert presenter.total_bytes == sum(sizes)
+
+
+def test_presenter_full_redraw_on_resize():
+    stream = io.StringIO()
+    presenter = FramePresenter(stream)
+    presenter.present("ab" * 6, 4, 3)
+    presenter.present("ab" * 6, 4, 3)
+    assert "\x1b[2J" not in stream.getvalue()[-presenter.last_bytes:]
+    presenter.present("ab" * 5, 5, 2)
+    assert "\x1b[2J" in stream.getvalue()[-presenter.last_bytes:]
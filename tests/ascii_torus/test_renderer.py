@@ -0,0 +1,144 @@
+import math
+import random
+
+import numpy as np
+import pytest
+from mcik.experiments.ascii_torus import render_codes, render_frame, render_gbuffer, shade
+from mcik.experiments.ascii_torus.renderer import K1, K2, LIGHT, R, r
+
+RAMP = " .:-=+*#%@"
+
+
+def render_frame_reference(w, h, A, B, gamma, ramp):
+    """Original scalar loop; the vectorized renderer must match it character for character."""
+    buf = [" "] * (w * h)
+    zbuf = [0.0] * (w * h)
+    cosA, sinA = math.cos(A), math.sin(A)
+    cosB, sinB = math.cos(B), math.sin(B)
+    lx, ly, lz = LIGHT
+
+    th = 0.0
+    while th < 2 * math.pi:
+        costh, sinth = math.cos(th), math.sin(th)
+        ph = 0.0
+        while ph < 2 * math.pi:
+            cosph, sinph = math.cos(ph), math.sin(ph)
+            cx = (R + r * costh) * cosph
+            cy = (R + r * costh) * sinph
+            cz = r * sinth
+            x = cx * cosB - cy * sinB
+            y = cx * sinB + cy * cosB
+            z = cz
+            y2 = y * cosA - z * sinA
+            z2 = y * sinA + z * cosA
+            ooz = 1.0 / (z2 + K2)
+            xp = int(w / 2 + K1 * ooz * x)
+            yp = int(h / 2 + K1 * ooz * y2 * 0.5)
+            nx, ny, nz = costh * cosph, costh * sinph, sinth
+            nx_rz = nx * cosB - ny * sinB
+            ny_rz = nx * sinB + ny * cosB
+            nz_rz = nz
+            nny = ny_rz * cosA - nz_rz * sinA
+            nnz = ny_rz * sinA + nz_rz * cosA
+            nnx = nx_rz
+            L = max(0.0, nnx * lx + nny * ly + nnz * lz)
+            shade = L ** (1.0 / gamma if gamma > 0 else 1.0)
+            idx = min(len(ramp) - 1, max(0, int(shade * (len(ramp) - 1))))
+            if 0 <= xp < w and 0 <= yp < h:
+                off = yp * w + xp
+                if ooz > zbuf[off]:
+                    zbuf[off] = ooz
+                    buf[off] = ramp[idx]
+            ph += 0.02
+        th += 0.07
+    return buf
+
+
+def test_render_frame_matches_reference_loop():
+    rng = random.Random(3)
+    cases = [(80, 24, 0.6, 0.4, 1.0, RAMP), (10, 10, 0.0, 0.0, 0.5, RAMP), (3, 2, 1.0, 2.0, 1.0, RAMP)]
+    for _ in range(6):
+        cases.append((rng.choice([17, 40, 80]), rng.choice([9, 24]), rng.uniform(-7, 7),
+                      rng.uniform(-7, 7), rng.choice([0.5, 1.3, 2.2, 3.0, 0.0]), ".,:;ox%#@"))
+    for w, h, A, B, gamma, ramp in cases:
+        assert render_frame(w, h, A, B, gamma, ramp) == render_frame_reference(w, h, A, B, gamma, ramp)
+
+
+def test_render_codes_match_frame():
+    codes = render_codes(40, 12, 0.3, 0.2, 1.0, RAMP)
+    assert codes.shape == (40 * 12,)
+    assert "".join(map(chr, codes.tolist())) == "".join(render_frame(40, 12, 0.3, 0.2, 1.0, RAMP))
+    assert np.any(codes != ord(" "))
+
+
+def test_gbuffer_cached_and_reshaded():
+    from mcik.experiments.ascii_torus import renderer
+
+    renderer.clear_caches()
+    gbuf = render_gbuffer(80, 24, 0.6, 0.4)
+    assert render_gbuffer(80, 24, 0.6, 0.4) is gbuf
+    assert gbuf.luminance.shape == gbuf.coverage.shape == (24, 80)
+    assert np.all(gbuf.luminance[~gbuf.coverage] == 0.0)
+    for gamma, ramp in [(0.7, RAMP), (2.0, ".,:;ox%#@"), (1.0, "@")]:
+        codes = shade(gbuf, gamma, ramp)
+        ref = render_frame_reference(80, 24, 0.6, 0.4, gamma, ramp)
+        assert "".join(map(chr, codes.tolist())) == "".join(ref)
+    assert renderer.render_gbuffer.cache_info().misses == 1
+    assert renderer.torus_grid.cache_info().currsize == 1
+
+
+def test_controller_step_rasterizes_once_per_geometry():
+    from mcik.experiments.ascii_torus import Params, evaluate_score, renderer, suggest_step
+
+    renderer.clear_caches()
+    p = Params(1.0, 1, 1.0, 0.0, 10)
+    suggest_step(p, lambda q: evaluate_score(q, 0.6, 0.4, 80, 24, 30, 0.5, 0.5), False)
+    # Geometry changes with resolution_scale and samples_per_pixel only: the base view,
+    # scale - 0.05 (scale + 0.05 clamps to 1.0) and spp 2 (spp 0 clamps to 1)
+    assert renderer.rasterize.cache_info().misses == 3
+    # ... and smoothing adds one G-buffer on top of the base geometry (ns - 0.1 clamps to 0)
+    assert renderer.render_gbuffer.cache_info().misses == 4
+
+
+def test_supersampling_accumulates_jittered_samples():
+    from mcik.experiments.ascii_torus.renderer import jitter_offsets, rasterize
+
+    assert jitter_offsets(1) == ((0.0, 0.0),)
+    for spp in (2, 3, 4):
+        offsets = np.array(jitter_offsets(spp))
+        assert offsets.shape == (spp, 2) and np.all(np.abs(offsets) <= 0.5)
+        assert len({tuple(o) for o in offsets.tolist()}) == spp
+
+    one = render_gbuffer(80, 24, 0.6, 0.4)
+    four = render_gbuffer(80, 24, 0.6, 0.4, 4)
+    assert four is rasterize(80, 24, 0.6, 0.4, 4)
+    assert four.coverage.sum() >= one.coverage.sum()
+    assert np.all(four.luminance[~four.coverage] == 0.0)
+    assert np.all((four.luminance >= 0.0) & (four.luminance <= one.luminance.max()))
+    assert [name for name, _ in four.stages] == ["raster"]
+    # Partially covered edge pixels are darker than the single-sample frame there
+    edge = four.coverage & ~one.coverage
+    assert np.any(edge) and np.all(four.luminance[edge] < one.luminance.max())
+
+
+def test_normal_smooth_blurs_covered_pixels_only():
+    from mcik.experiments.ascii_torus.renderer import smooth_luminance
+
+    base = render_gbuffer(80, 24, 0.6, 0.4)
+    smooth = render_gbuffer(80, 24, 0.6, 0.4, 1, 1.0)
+    half = render_gbuffer(80, 24, 0.6, 0.4, 1, 0.5)
+    assert render_gbuffer(80, 24, 0.6, 0.4, 1, 0.0) is base
+    assert smooth.coverage is base.coverage
+    assert np.all(smooth.luminance[~base.coverage] == 0.0)
+    np.testing.assert_allclose(half.luminance, 0.5 * (base.luminance + smooth.luminance))
+    # A separable [1, 2, 1] blur reduces local contrast inside the covered region
+    diff = lambda a: np.abs(np.diff(a, axis=1))[base.coverage[:, 1:] & base.coverage[:, :-1]].mean()
+    assert diff(smooth.luminance) < diff(base.luminance)
+    assert [name for name, _ in smooth.stages] == ["raster", "smooth"]
+    assert smooth.cost_s == pytest.approx(sum(t for _, t in smooth.stages))
+
+    lum = np.zeros((3, 3))
+    lum[1, 1] = 1.0
+    cov = np.ones((3, 3), dtype=bool)
+    out = smooth_luminance(lum, cov, 1.0)
+    assert out[1, 1] == 0.25 and out[0, 0] == 1 / 16 and out.sum() == 1.0
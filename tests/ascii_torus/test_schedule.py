@@ -0,0 +1,77 @@
+import pytest
+
+from mcik.experiments.ascii_torus.controller import EvalMemo, Params, make_planner, suggest_step
+from mcik.experiments.ascii_torus.schedule import (AmortizedController, BackgroundController, StepScheduler,
+                                                  SyncController, make_scheduler)
+
+
+def _score(p):
+    return -((p.resolution_scale - 0.7) ** 2 + (p.gamma - 1.4) ** 2 + (p.normal_smooth - 0.3) ** 2
+             + 0.01 * (p.samples_per_pixel - 2) ** 2 + 0.001 * (p.ramp_size - 12) ** 2)
+
+
+def test_amortized_step_matches_sync_one_probe_per_tick():
+    start = Params(0.6, 2, 1.2, 0.2, 10)
+    for use_h in (False, True):
+        memo = EvalMemo(_score)
+        expected, _ = suggest_step(start, memo, use_h)
+        calls = []
+        ctrl = AmortizedController(make_planner("KH" if use_h else "K"))
+        assert ctrl.start(start, lambda p: calls.append(p) or _score(p))
+        assert not ctrl.start(start, _score)  # one step at a time
+        result = None
+        while result is None:
+            before = len(calls)
+            ctrl.tick(1.0)
+            assert len(calls) - before <= 1
+            result = ctrl.poll()
+        assert result == expected
+        assert len(calls) == memo.misses
+        assert not ctrl.busy
+
+
+def test_amortized_waits_for_slack():
+    ctrl = AmortizedController(make_planner("K"), max_wait=3)
+    ctrl.probe_s = 0.01
+    calls = []
+    ctrl.start(Params(0.6, 2, 1.2, 0.2, 10), lambda p: calls.append(p) or _score(p))
+    for _ in range(3):
+        ctrl.tick(0.0)
+    assert calls == []
+    ctrl.tick(0.0)  # waited max_wait frames: runs anyway
+    assert len(calls) == 1
+
+
+def test_background_and_sync_schedulers():
+    start = Params(0.6, 2, 1.2, 0.2, 10)
+    expected, _ = suggest_step(start, _score, True)
+    for schedule in ("sync", "background"):
+        with make_scheduler(schedule, make_planner("KH")) as ctrl:
+            ctrl.start(start, _score)
+            result = None
+            while result is None:
+                ctrl.tick(0.0)
+                result = ctrl.poll()
+            assert result == expected
+            assert ctrl.steps == 1
+
+
+def test_step_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        StepScheduler(make_planner("K"))
+
+
+def test_schedulers_share_timing_default():
+    planner = make_planner("K")
+    classes = {"sync": SyncController, "amortized": AmortizedController, "background": BackgroundController}
+    for schedule, cls in classes.items():
+        with make_scheduler(schedule, planner) as built, cls(planner) as direct:
+            assert type(built) is cls
+            assert built.isolate_timing is direct.isolate_timing is False
+
+
+def test_eval_memo_contains_clamps():
+    memo = EvalMemo(_score)
+    memo(Params(2.0, 9, 1.0, 0.5, 12))
+    assert Params(1.0, 4, 1.0, 0.5, 12) in memo
+    assert Params(0.5, 4, 1.0, 0.5, 12) not in memo
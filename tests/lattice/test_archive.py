@@ -0,0 +1,62 @@
+import numpy as np
+
+from mcik.archive import ArchiveWriter, open_archive
+from mcik.lattice import McikLatticeSimulator, tanh_update_2d
+
+
+def _run_2d():
+    sim = McikLatticeSimulator((9, 7), 23, tanh_update_2d, verbose=False, alpha=1.0, beta=0.8)
+    sim.set_initial_state(pokes={(3, 1): 1.0, (7, 3): -0.8})
+    sim.run_simulation()
+    return sim
+
+
+def test_archive_roundtrip_and_lazy_reads(tmp_path):
+    sim = _run_2d()
+    archive = sim.save(str(tmp_path / "run.mcik"), chunks=(4, 4, 5))
+    cube = sim.data_cube
+
+    assert archive.shape == cube.shape
+    np.testing.assert_array_equal(archive.frame(11), cube[..., 11])
+    np.testing.assert_array_equal(archive.series((3, 1)), cube[3, 1, :])
+    np.testing.assert_array_equal(archive.cube[1:8:3, -1, 20:], cube[1:8:3, -1, 20:])
+    np.testing.assert_array_equal(np.asarray(archive.cube), cube)
+
+    meta = archive.metadata
+    assert meta["update_rule"] == "mcik.lattice:tanh_update_2d"
+    assert meta["update_params"] == {"alpha": 1.0, "beta": 0.8}
+    assert archive.pokes == {(3, 1): 1.0, (7, 3): -0.8}
+    assert meta["timing"]["steps"] == 22
+
+    restored = open_archive(str(tmp_path / "run.mcik")).to_simulator(verbose=False)
+    np.testing.assert_array_equal(restored.data_cube, cube)
+    np.testing.assert_array_equal(restored.initial_state_with_pokes, sim.initial_state_with_pokes)
+
+
+def test_archive_writer_appends_across_partial_chunks(tmp_path):
+    cube = _run_2d().data_cube
+    path = str(tmp_path / "grow.mcik")
+    with ArchiveWriter(path, (9, 7), chunks=(9, 7, 4)) as writer:
+        writer.append(cube[..., :6])
+    writer = ArchiveWriter.reopen(path)
+    writer.append(cube[..., 6:])
+    writer.close()
+    np.testing.assert_array_equal(np.asarray(open_archive(path).cube), cube)
+
+
+def test_archive_writer_copies_reused_frame_buffer(tmp_path):
+    path = str(tmp_path / "stream.mcik")
+    frame = np.empty((3, 4))
+    expected = []
+    with ArchiveWriter(path, (3, 4), chunks=(3, 4, 4)) as writer:
+        for t in range(10):  # two full time chunks and a partial one
+            frame[...] = t
+            expected.append(frame.copy())
+            writer.append(frame)
+    writer = ArchiveWriter.reopen(path)
+    for t in range(10, 13):  # refills the reloaded partial chunk
+        frame[...] = t
+        expected.append(frame.copy())
+        writer.append(frame)
+    writer.close()
+    np.testing.assert_array_equal(np.asarray(open_archive(path).cube), np.stack(expected, axis=-1))
@@ -0,0 +1,55 @@
+import numpy as np
+
+from mcik.archive import ArchiveWriter, open_archive
+from mcik.lattice import McikLatticeSimulator, tanh_update_1d
+from mcik.reducers import TemporalIntegral
+
+
+def _sim(steps):
+    sim = McikLatticeSimulator((15,), steps, tanh_update_1d, verbose=False, alpha=1.0, beta=0.9)
+    sim.set_initial_state(pokes={(7,): 1.0})
+    return sim
+
+
+def test_extend_matches_single_long_run():
+    full = _sim(40)
+    full.run_simulation()
+
+    sim = _sim(10)
+    integral = sim.add_reducer("integral", TemporalIntegral())
+    sim.run_simulation()
+    sim.extend(5)
+    sim.extend(25)
+    assert sim.time_steps == 40
+    np.testing.assert_array_equal(sim.data_cube, full.data_cube)
+    np.testing.assert_allclose(integral.result(), full.calculate_temporal_integral())
+
+
+def test_snapshot_resume_streams_to_archive(tmp_path):
+    full = _sim(30)
+    full.run_simulation()
+
+    sim = _sim(12)
+    sim.add_reducer("integral", TemporalIntegral())
+    sim.run_simulation()
+    path = str(tmp_path / "run.mcik")
+    sim.save(path, chunks=(15, 8))
+    snap = sim.snapshot()
+
+    resumed = open_archive(path).to_simulator(load_cube=False, verbose=False)
+    resumed.resume({**snap, "state": resumed.last_state})
+    resumed.extend(18, writer=ArchiveWriter.reopen(path), block_steps=7)
+
+    assert resumed.data_cube is None
+    np.testing.assert_array_equal(np.asarray(open_archive(path).cube), full.data_cube)
+    np.testing.assert_allclose(resumed.calculate_temporal_integral(), full.calculate_temporal_integral())
+
+
+def test_kernel_estimates_leave_reducers_alone():
+    sim = _sim(10)
+    integral = sim.add_reducer("integral", TemporalIntegral())
+    expected = sim.run_simulation().sum(axis=-1)
+    sim.estimate_k_kernel((3,), 0.5)
+    sim.estimate_h_kernel((3,), (11,), 0.5)
+    assert sim.reducers == {"integral": integral}
+    np.testing.assert_allclose(integral.result(), expected)
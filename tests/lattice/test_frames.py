@@ -0,0 +1,31 @@
+import numpy as np
+from PIL import Image
+
+from mcik.frames import colormap_lut, quantize, write_gif
+from mcik.lattice import McikLatticeSimulator, tanh_update_2d
+
+
+def test_quantize_maps_limits_to_lut_ends():
+    idx = quantize(np.array([-1.0, 0.0, 1.0, np.nan]), -1.0, 1.0)
+    assert idx.tolist() == [0, 128, 255, 0]
+    assert colormap_lut("viridis").shape == (256, 3)
+
+
+def test_export_2d_heatmap_writes_every_frame(tmp_path):
+    sim = McikLatticeSimulator((10, 5), 12, tanh_update_2d, verbose=False, alpha=1.0, beta=0.8)
+    sim.set_initial_state(pokes={(3, 1): 1.0})
+    sim.run_simulation()
+    path = str(tmp_path / "heat.gif")
+    sim.export_2d_heatmap(path, scale=4)
+    with Image.open(path) as img:
+        assert img.n_frames == 12
+        assert img.size == (10 * 4, 5 * 4)
+
+
+def test_write_gif_matches_imshow_orientation(tmp_path):
+    cube = np.zeros((3, 2, 1))
+    cube[0, 0, 0] = 1.0  # dim0=0, dim1=0 -> bottom-left pixel
+    write_gif(cube, str(tmp_path / "one.gif"), vmin=0.0, vmax=1.0, scale=1)
+    with Image.open(tmp_path / "one.gif") as img:
+        pixels = np.asarray(img.convert("RGB"))
+    assert tuple(pixels[-1, 0]) == tuple(colormap_lut()[255])
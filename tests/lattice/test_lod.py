@@ -0,0 +1,31 @@
+import numpy as np
+
+from mcik.lattice import McikLatticeSimulator, tanh_update_1d
+from mcik.lod import block_reduce, frame_indices, spacetime_lod
+
+
+def test_block_reduce_pools_partial_edge_blocks():
+    a = np.arange(10, dtype=float).reshape(2, 5)
+    np.testing.assert_array_equal(block_reduce(a, (2, 2), "max"), [[6, 8, 9]])
+    np.testing.assert_array_equal(block_reduce(a, (1, 2), "mean"), [[0.5, 2.5, 4], [5.5, 7.5, 9]])
+
+
+def test_spacetime_lod_streams_in_aligned_blocks():
+    cube = np.random.default_rng(1).normal(size=(30, 1000))
+    reduced, factors = spacetime_lod(cube, max_shape=(10, 90), how="min", block_steps=64)
+    assert factors == (3, 12)
+    np.testing.assert_allclose(reduced, block_reduce(cube, factors, "min"))
+
+
+def test_frame_indices_budget():
+    assert frame_indices(5) == [0, 1, 2, 3, 4]
+    idx = frame_indices(10000, fps=15, duration=4)
+    assert len(idx) == 60 and idx[0] == 0 and idx[-1] == 9999
+
+
+def test_spacetime_plot_uses_lod(tmp_path):
+    sim = McikLatticeSimulator((64,), 300, tanh_update_1d, verbose=False, alpha=1.0, beta=0.9)
+    sim.set_initial_state(pokes={(10,): 1.0})
+    sim.run_simulation()
+    ax = sim.plot_spacetime_heatmap(show=False, filename=str(tmp_path / "st.png"), max_size=(16, 50))
+    assert ax.get_images()[0].get_array().shape == (16, 50)
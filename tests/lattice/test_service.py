@@ -0,0 +1,32 @@
+import asyncio
+
+import numpy as np
+
+from mcik.lattice import McikLatticeSimulator, tanh_update_1d
+from mcik.service import KernelService, LatticeSpec
+
+
+def test_service_batches_and_coalesces_kernel_requests():
+    sim = McikLatticeSimulator((16,), 10, tanh_update_1d, verbose=False, alpha=1.0, beta=0.9)
+    spec = LatticeSpec.from_simulator(sim)
+
+    async def main():
+        async with KernelService() as service:
+            results = await asyncio.gather(
+                service.estimate_k_kernel(spec, (3,), 0.5),
+                service.estimate_k_kernel(spec, (3,), 0.5),
+                service.estimate_k_kernel(spec, (11,), 0.5),
+                service.estimate_h_kernel(spec, (3,), (11,), 0.5),
+            )
+            return results, dict(service.stats)
+
+    (k3, k3_again, k11, (K_a, K_b, H_ab)), stats = asyncio.run(main())
+    # baseline, poke 3, poke 11 and poke 3+11 are the only distinct runs
+    assert stats["runs"] == 4
+    assert stats["batches"] == 1
+    np.testing.assert_array_equal(k3, k3_again)
+    np.testing.assert_allclose(k3, sim.estimate_k_kernel((3,), 0.5))
+    np.testing.assert_allclose(K_a, k3)
+    np.testing.assert_allclose(K_b, k11)
+    _, _, H_expected = sim.estimate_h_kernel((3,), (11,), 0.5)
+    np.testing.assert_allclose(H_ab, H_expected)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from mcik.lattice import McikLatticeSimulator, tanh_update_1d
+from mcik.sweep import grid_scenarios, sweep, sweep_array
+
+
+def test_grid_scenarios_product_order():
+    scenarios = grid_scenarios(poke_sites=[3, (7,)], poke_values=[0.5], alpha=[0.8, 1.0])
+    assert [s.update_params["alpha"] for s in scenarios] == [0.8, 0.8, 1.0, 1.0]
+    assert [s.pokes for s in scenarios[:2]] == [{(3,): 0.5}, {(7,): 0.5}]
+
+
+def test_sweep_matches_serial_simulator():
+    scenarios = grid_scenarios(poke_sites=[(2,), (9,)], poke_values=[1.0], beta=[0.3, 0.6])
+    results = sweep_array((12,), 15, tanh_update_1d, scenarios,
+                          update_params={"alpha": 1.0}, max_workers=2, chunksize=3)
+
+    sim = McikLatticeSimulator((12,), 15, tanh_update_1d, verbose=False, alpha=1.0)
+    for scenario, result in zip(scenarios, results):
+        sim.update_params = {"alpha": 1.0, **scenario.update_params}
+        sim.set_initial_state(pokes=scenario.pokes)
+        sim.run_simulation()
+        np.testing.assert_allclose(result, sim.calculate_temporal_integral())
+
+
+def test_sweep_unordered_yields_every_index():
+    scenarios = grid_scenarios(poke_sites=range(6), poke_values=[0.5])
+    seen = sorted(i for i, _, _ in sweep((6,), 5, tanh_update_1d, scenarios,
+                                         reduce="final", max_workers=2, ordered=False))
+    assert seen == list(range(6))
+
+
+def test_sweep_rejects_unknown_reduce():
+    with pytest.raises(ValueError):
+        next(sweep((4,), 3, tanh_update_1d, [], reduce="max"))
+
+
+def test_verbose_is_keyword_only():
+    with pytest.raises(TypeError):
+        McikLatticeSimulator((4,), 3, tanh_update_1d, False)
+    sim = McikLatticeSimulator((4,), 3, tanh_update_1d, verbose=False, alpha=1.0, beta=0.5)
+    assert sim.update_params == {"alpha": 1.0, "beta": 0.5}
@@ -0,0 +1,62 @@
+import numpy as np
+
+from mcik.lattice import McikLatticeSimulator, tanh_update_1d, tanh_update_2d
+from mcik.threaded import ThreadedUpdateRule
+
+
+def test_threaded_2d_step_matches_unsplit_rule():
+    rng = np.random.default_rng(0)
+    g = rng.normal(size=(37, 11))
+    with ThreadedUpdateRule(tanh_update_2d, n_blocks=4) as rule:
+        np.testing.assert_array_equal(rule(g, alpha=0.9, beta=0.7), tanh_update_2d(g, alpha=0.9, beta=0.7))
+
+
+def test_threaded_rule_in_simulator_1d():
+    rule = ThreadedUpdateRule(tanh_update_1d, n_blocks=3)
+    threaded = McikLatticeSimulator((20,), 12, rule, verbose=False, alpha=1.0, beta=0.9)
+    serial = McikLatticeSimulator((20,), 12, tanh_update_1d, verbose=False, alpha=1.0, beta=0.9)
+    for sim in (threaded, serial):
+        sim.set_initial_state(pokes={(4,): 1.0, (19,): -0.5})
+        sim.run_simulation()
+    rule.close()
+    np.testing.assert_array_equal(threaded.data_cube, serial.data_cube)
+
+
+def test_threaded_rule_shared_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = np.random.default_rng(1)
+    states = [rng.normal(size=(41, 9)) for _ in range(8)]
+    with ThreadedUpdateRule(tanh_update_2d, n_blocks=4) as rule:
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda g: [rule(g, alpha=0.9, beta=0.7) for _ in range(5)], states))
+    for g, outs in zip(states, results):
+        for out in outs:
+            np.testing.assert_array_equal(out, tanh_update_2d(g, alpha=0.9, beta=0.7))
+
+
+def test_threaded_rule_creates_one_pool_under_concurrent_first_calls(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import mcik.threaded
+
+    created = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(mcik.threaded, "ThreadPoolExecutor", CountingPool)
+    g = np.random.default_rng(2).normal(size=(16, 5))
+    barrier = threading.Barrier(6)
+    with ThreadedUpdateRule(tanh_update_2d, n_blocks=4) as rule:
+        def call():
+            barrier.wait()
+            return rule(g, alpha=0.9, beta=0.7)
+        with ThreadPoolExecutor(6) as pool:
+            outs = list(pool.map(lambda _: call(), range(6)))
+    assert len(created) == 1
+    for out in outs:
+        np.testing.assert_array_equal(out, tanh_update_2d(g, alpha=0.9, beta=0.7))
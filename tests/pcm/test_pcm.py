@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from mcik.pcm import (PCMEngine, PCMProperties, banded_matmul, banded_to_dense, enthalpy_to_state,
+                      enthalpy_to_state_np, heat_flow_step_np, step_jacobian_banded)
+
+PARAFFIN = PCMProperties("Paraffin Wax", melting_point=50.0, latent_heat=200000.0, specific_heat=2000.0,
+                         thermal_conductivity=0.2, density=900.0)
+
+
+def _reference_state(h, pcm):
+    # Original per-node loop from experiments/pcm
+    mp, lh, sh = pcm.melting_point, pcm.latent_heat, pcm.specific_heat
+    temp, phase = [], []
+    for v in h:
+        if v < sh * mp:
+            temp.append(v / sh)
+            phase.append(0.0)
+        elif v < sh * mp + lh:
+            temp.append(mp)
+            phase.append((v - sh * mp) / lh)
+        else:
+            temp.append((v - lh) / sh)
+            phase.append(1.0)
+    return np.array(temp), np.array(phase)
+
+
+def _enthalpies():
+    onset = PARAFFIN.specific_heat * PARAFFIN.melting_point
+    rng = np.random.default_rng(0)
+    h = rng.uniform(0.0, onset + 2 * PARAFFIN.latent_heat, 1000)
+    # Exactly on both phase boundaries
+    return np.concatenate([h, [onset, onset + PARAFFIN.latent_heat]])
+
+
+def test_numpy_mapping_matches_node_loop():
+    h = _enthalpies()
+    temperature, phase = enthalpy_to_state(h, PARAFFIN)
+    ref_t, ref_p = _reference_state(h.tolist(), PARAFFIN)
+    np.testing.assert_array_equal(temperature, ref_t)
+    np.testing.assert_array_equal(phase, ref_p)
+    assert phase[-2] == 0.0 and phase[-1] == 1.0
+    assert np.all((phase >= 0.0) & (phase <= 1.0))
+
+
+def test_numpy_mapping_keeps_float32():
+    h = _enthalpies().astype(np.float32).reshape(2, -1)
+    temperature, phase = enthalpy_to_state_np(h, 50.0, 200000.0, 2000.0)
+    assert temperature.dtype == phase.dtype == np.float32
+    assert temperature.shape == phase.shape == h.shape
+
+
+def test_tensorflow_mapping_matches_numpy():
+    tf = pytest.importorskip("tensorflow")
+    h = _enthalpies().astype(np.float32)
+    ref_t, ref_p = enthalpy_to_state(h, PARAFFIN)
+    for arg in (tf.constant(h), tf.Variable(h)):
+        temperature, phase = enthalpy_to_state(arg, PARAFFIN)
+        assert tf.is_tensor(temperature)
+        np.testing.assert_array_equal(temperature.numpy(), ref_t)
+        np.testing.assert_array_equal(phase.numpy(), ref_p)
+    # Graph mode may rewrite x / c as x * (1 / c): equal to within one float32 ulp
+    traced = tf.function(lambda x: enthalpy_to_state(x, PARAFFIN))
+    np.testing.assert_array_max_ulp(traced(tf.constant(h))[1].numpy(), ref_p, maxulp=1)
+
+
+def _lattice(n=64):
+    h = np.full(n, PARAFFIN.specific_heat * 25.0, dtype=np.float32)
+    h[n // 2] += PARAFFIN.specific_heat * 30.0 + 2 * PARAFFIN.latent_heat
+    return h
+
+
+def test_heat_flow_step_stencil():
+    h = np.array([1.0, 2.0, 4.0])
+    np.testing.assert_allclose(heat_flow_step_np(h, 0.2, 0.1), [0.2 + 0.1 * 3.0, 0.4 + 0.1 * 5.0, 0.8 + 0.1 * 6.0])
+
+
+def test_numpy_engine_matches_step_loop():
+    h0 = _lattice()
+    run = PCMEngine(PARAFFIN, backend="numpy").run(h0, steps=25, stride=10)
+    h, integral, kept = h0, np.zeros_like(h0), []
+    for t in range(25):
+        h = heat_flow_step_np(h, 0.2, 0.1)
+        integral = integral + enthalpy_to_state(h, PARAFFIN)[0]
+        if (t + 1) % 10 == 0:
+            kept.append(h)
+    np.testing.assert_array_equal(run.enthalpy, h)
+    np.testing.assert_array_equal(run.integral, integral)
+    np.testing.assert_array_equal(run.history, np.stack(kept))
+    np.testing.assert_array_equal(run.temperature, enthalpy_to_state(h, PARAFFIN)[0])
+    assert run.enthalpy.dtype == np.float32
+    assert PCMEngine(PARAFFIN, backend="numpy").run(h0, steps=5).history.shape == (0, 64)
+
+
+def test_engine_backend_selection():
+    with pytest.raises(ValueError):
+        PCMEngine(PARAFFIN, backend="jax")
+    with pytest.raises(ValueError):
+        PCMEngine(PARAFFIN, backend="numpy").run(_lattice(), steps=-1)
+
+
+@pytest.mark.parametrize("jit_compile", [False, True])
+@pytest.mark.parametrize("stride", [9, 0])
+def test_tensorflow_engine_matches_numpy(jit_compile, stride):
+    tf = pytest.importorskip("tensorflow")
+    h0 = _lattice()
+    ref = PCMEngine(PARAFFIN, backend="numpy").run(h0, steps=37, stride=stride)
+    run = PCMEngine(PARAFFIN, backend="tf", jit_compile=jit_compile).run(tf.constant(h0), steps=37, stride=stride)
+    for got, want in zip(run, ref):
+        np.testing.assert_allclose(got.numpy(), want, rtol=1e-6)
+
+
+def test_tensorflow_engine_traces_once_per_history_length():
+    tf = pytest.importorskip("tensorflow")
+    h0 = tf.constant(_lattice())
+    engine = PCMEngine(PARAFFIN, backend="tf")
+    for steps in (0, 5, 23):
+        ref = PCMEngine(PARAFFIN, backend="numpy").run(h0.numpy(), steps=steps)
+        np.testing.assert_allclose(engine.run(h0, steps=steps).enthalpy.numpy(), ref.enthalpy, rtol=1e-6)
+    engine.run(h0, steps=20, stride=5)
+    engine.run(h0, steps=23, stride=5)
+    assert engine._run_tf.experimental_get_tracing_count() == 2
+
+
+def _dense_step_jacobian(n, alpha, beta):
+    # Finite differences are exact here: the step is linear
+    base = heat_flow_step_np(np.zeros(n), alpha, beta)
+    return np.stack([heat_flow_step_np(np.eye(n)[k], alpha, beta) - base for k in range(n)], axis=1)
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 12])
+def test_banded_jacobian_matches_dense(n):
+    ab = step_jacobian_banded(n, 0.2, 0.1)
+    assert ab.shape == (3, n)
+    np.testing.assert_allclose(banded_to_dense(ab), _dense_step_jacobian(n, 0.2, 0.1))
+    v = np.random.default_rng(n).normal(size=(n, 3))
+    np.testing.assert_allclose(banded_matmul(ab, v), banded_to_dense(ab) @ v)
+    np.testing.assert_allclose(banded_matmul(ab, v[:, 0]), banded_to_dense(ab) @ v[:, 0])
+
+
+def test_influence_columns_match_jacobian_power():
+    engine = PCMEngine(PARAFFIN, backend="numpy")
+    n, steps = 20, 6
+    dense = np.linalg.matrix_power(banded_to_dense(engine.jacobian_banded(n)), steps)
+    nodes = [0, 7, 19]
+    np.testing.assert_allclose(engine.influence_columns(n, nodes, steps), dense[:, nodes])
+
+    h0 = _lattice(n).astype(np.float64)
+    h, v = engine.jvp(h0, np.eye(n)[:, :4], steps)
+    np.testing.assert_array_equal(h, engine.run(h0, steps).enthalpy)
+    np.testing.assert_allclose(v, dense[:, :4])
+
+
+def test_tensorflow_jvp_matches_banded_path():
+    tf = pytest.importorskip("tensorflow")
+    n, steps = 16, 5
+    h0 = _lattice(n).astype(np.float64)
+    tangents = np.random.default_rng(1).normal(size=(n, 4))
+    ref_h, ref_v = PCMEngine(PARAFFIN, backend="numpy").jvp(h0, tangents, steps)
+    engine = PCMEngine(PARAFFIN, backend="tf", jit_compile=True)
+    h, v = engine.jvp(tf.constant(h0), tf.constant(tangents), steps)
+    np.testing.assert_allclose(h.numpy(), ref_h)
+    np.testing.assert_allclose(v.numpy(), ref_v)
+    # Other horizons reuse the trace; an empty batch still returns the advanced state
+    for k in (0, 11):
+        h, v = engine.jvp(tf.constant(h0), tf.constant(tangents), k)
+        np.testing.assert_allclose(v.numpy(), PCMEngine(PARAFFIN, backend="numpy").jvp(h0, tangents, k)[1])
+    assert engine._jvp_run_tf.experimental_get_tracing_count() == 1
+    h, v = engine.jvp(tf.constant(h0), tf.zeros((n, 0), tf.float64), steps)
+    np.testing.assert_allclose(h.numpy(), ref_h)
+    assert v.shape == (n, 0)